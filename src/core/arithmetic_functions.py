@@ -0,0 +1,152 @@
+"""
+Пакетное вычисление арифметических функций решетом: функция Эйлера φ,
+функция Мёбиуса μ, сумма делителей σ и число делителей τ для всех чисел
+отрезка [a, b].
+
+Отрезок обходится сегментами по FUNCTION_SEGMENT_SIZE чисел. Для сегмента
+заводятся массивы значений, и каждое простое p <= sqrt(b) из таблицы
+решета обновляет сразу все свои кратные срезом с шагом p, а затем кратные
+p^2, p^3, ... (как вычёркивание в sieve):
+- φ: φ -= φ / p (в начале φ = m, деление точное);
+- μ: знак меняется на кратных p, на кратных p^2 μ = 0;
+- τ и σ: множитель p^k в ответе заменяется на p^(k+1), то есть τ умножается
+  на (k+2)/(k+1), а σ - на (1 + ... + p^(k+1)) / (1 + ... + p^k);
+- в "остатке" каждого числа делится его p-часть.
+После всех p <= sqrt(b) остаток каждого числа равен 1 или одному простому
+больше sqrt(b), который учитывается последним проходом. С NumPy каждый
+срез - одна векторная операция; без него те же шаги выполняются списками.
+Память сегмента не зависит от длины отрезка, поэтому отрезки, которые не
+помещаются в память целиком, обходятся через iter_arithmetic_functions.
+
+Результат хранится компактно, в array: φ - 'I', μ - 'b', σ - 'Q', τ - 'H'
+(для m < 2^32 значения в них помещаются).
+"""
+
+import math
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # NumPy не обязателен
+    np = None
+
+from . import sieve
+
+# Чисел в одном сегменте: пять рабочих массивов по 8 байт - около 10 МБ
+FUNCTION_SEGMENT_SIZE = 1 << 18
+# Аргументы должны помещаться в array('I')
+MAX_ARGUMENT = (1 << 32) - 1
+# Граница таблицы φ, которую euler_totient строит сам при первом обращении
+TOTIENT_TABLE_LIMIT = 1 << 16
+
+# Коды типов результата: φ, μ, σ, τ
+_TYPECODES = ('I', 'b', 'Q', 'H')
+
+_totients = array('I')
+
+def _apply(values, start, step, function):
+    """values[start::step] = function(values[start::step]) поэлементно."""
+    if np is not None:
+        values[start::step] = function(values[start::step])
+    else:
+        values[start::step] = [function(x) for x in values[start::step]]
+
+def _segment(a, count, primes):
+    """Списки (или векторы) φ, μ, σ, τ и остатков для чисел a, ..., a + count - 1 (a >= 1)."""
+    if np is not None:
+        numbers = np.arange(a, a + count, dtype=np.int64)
+        phi, rest = numbers.copy(), numbers
+        mu, sigma, tau = np.ones(count, dtype=np.int8), np.ones(count, dtype=np.int64), np.ones(count, dtype=np.int64)
+    else:
+        phi, rest = list(range(a, a + count)), list(range(a, a + count))
+        mu, sigma, tau = [1] * count, [1] * count, [1] * count
+    b = a + count - 1
+    for p in primes:
+        start = -a % p
+        if start >= count:
+            continue
+        _apply(phi, start, p, lambda x: x - x // p)
+        _apply(mu, start, p, lambda x: -x)
+        _apply(rest, start, p, lambda x: x // p)
+        _apply(tau, start, p, lambda x: 2 * x)
+        _apply(sigma, start, p, lambda x: (p + 1) * x)
+        # Кратные p^k при k >= 2: показатель p не меньше k
+        power, k, previous_sum, power_sum = p * p, 2, p + 1, p * p + p + 1
+        while power <= b:
+            start = -a % power
+            if start >= count:
+                break
+            _apply(mu, start, power, lambda x: 0 * x)
+            _apply(rest, start, power, lambda x: x // p)
+            _apply(tau, start, power, lambda x, k=k: x // k * (k + 1))
+            _apply(sigma, start, power, lambda x, old=previous_sum, new=power_sum: x // old * new)
+            power, k, previous_sum = power * p, k + 1, power_sum
+            power_sum += power
+    # Остаток > 1 - единственный простой делитель больше sqrt(b)
+    if np is not None:
+        mask = rest > 1
+        large = rest[mask]
+        phi[mask] = phi[mask] // large * (large - 1)
+        mu[mask] *= -1
+        tau[mask] *= 2
+        sigma[mask] *= large + 1
+    else:
+        for i, q in enumerate(rest):
+            if q > 1:
+                phi[i] = phi[i] // q * (q - 1)
+                mu[i], tau[i], sigma[i] = -mu[i], 2 * tau[i], sigma[i] * (q + 1)
+    return phi, mu, sigma, tau
+
+def _to_arrays(columns):
+    if np is not None:
+        return tuple(array(code, column.astype(np.dtype(code)).tobytes()) for code, column in zip(_TYPECODES, columns))
+    return tuple(array(code, column) for code, column in zip(_TYPECODES, columns))
+
+def iter_arithmetic_functions(a: int, b: int, segment_size: int = FUNCTION_SEGMENT_SIZE):
+    """
+    Значения на [a, b] сегментами: кортежи (начало сегмента, φ, μ, σ, τ),
+    где массивы индексируются числом m - начало. Для m = 0 все функции равны 0.
+    """
+    if a < 0 or b > MAX_ARGUMENT:
+        raise ValueError(f"Отрезок должен лежать в [0, {MAX_ARGUMENT}].")
+    if a == 0 and b >= 0:
+        yield 0, *(array(code, [0]) for code in _TYPECODES)
+        a = 1
+    primes = sieve.primes_up_to(math.isqrt(b)) if b > 0 else []
+    for start in range(a, b + 1, segment_size):
+        count = min(segment_size, b - start + 1)
+        yield start, *_to_arrays(_segment(start, count, primes))
+
+def arithmetic_functions_range(a: int, b: int) -> tuple[array, array, array, array]:
+    """Массивы φ, μ, σ, τ для чисел отрезка [a, b]; значение для m - элемент m - a."""
+    result = tuple(array(code) for code in _TYPECODES)
+    for _, *columns in iter_arithmetic_functions(a, b):
+        for values, column in zip(result, columns):
+            values.extend(column)
+    return result
+
+def arithmetic_functions(n: int) -> tuple[array, array, array, array]:
+    """Массивы φ, μ, σ, τ для всех m <= n; значение для m - элемент m."""
+    return arithmetic_functions_range(0, n)
+
+def totient_table(limit: int) -> array:
+    """
+    Общая таблица φ(m) по индексу m, покрывающая все m <= limit. Таблица
+    только растёт; большую таблицу строят явным вызовом, и тогда
+    small_totient берёт значения из неё.
+    """
+    if limit >= len(_totients):
+        for _, phi, *_ in iter_arithmetic_functions(len(_totients), limit):
+            _totients.extend(phi)
+    return _totients
+
+def small_totient(m: int) -> int | None:
+    """
+    φ(m) из таблицы или None. Таблица до TOTIENT_TABLE_LIMIT строится при
+    первом обращении (доли секунды); дальше используется, только если уже построена.
+    """
+    if 0 < m < len(_totients):
+        return _totients[m]
+    if 0 < m <= TOTIENT_TABLE_LIMIT:
+        return totient_table(TOTIENT_TABLE_LIMIT)[m]
+    return None
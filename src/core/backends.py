@@ -0,0 +1,361 @@
+"""
+Реестр вычислительных бэкендов длинной арифметики.
+
+Публичные функции long_arithmetic (add, subtract, multiply, square, divide,
+divide_exact, power_integer, isqrt, iroot, gcd, extended_gcd), а также
+modular_arithmetic.mod_power и modular_arithmetic.modulus_context (контекст
+редукции по модулю для многократных умножений) передают вычисления
+текущему бэкенду. Значения на входе и выходе всегда LargeNumber,
+так что сигнатуры и результаты не зависят от выбора:
+
+- "reference" - эталонная реализация на лимбах (по умолчанию, для обучения
+  и проверки);
+- "int" - встроенные целые Python;
+- "gmpy2" - библиотека GMP через gmpy2, если она установлена.
+
+Бэкенд выбирается переменной окружения CALC_ARITHMETIC_BACKEND (значение
+"auto" выбирает самый быстрый доступный) или вызовом set_backend().
+"""
+
+import inspect
+import math
+import os
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+
+try:
+    import gmpy2
+except ImportError:  # gmpy2 не обязателен
+    gmpy2 = None
+
+from . import long_arithmetic as la
+from .modulus_context import get_modulus_context
+
+BACKEND_ENV_VAR = "CALC_ARITHMETIC_BACKEND"
+DEFAULT_BACKEND = "reference"
+
+class ArithmeticBackend(ABC):
+    """
+    Интерфейс бэкенда. Деление округляет частное к нулю, остаток имеет знак
+    делимого; mod_power возвращает вычет в [0, m) и требует m > 0;
+    НОД неотрицателен. Все методы абстрактные: бэкенд, в котором
+    не хватает метода, нельзя ни создать, ни зарегистрировать.
+    """
+
+    name = None
+
+    @abstractmethod
+    def add(self, a, b):
+        """a + b."""
+
+    @abstractmethod
+    def subtract(self, a, b):
+        """a - b."""
+
+    @abstractmethod
+    def multiply(self, a, b):
+        """a · b."""
+
+    @abstractmethod
+    def square(self, a):
+        """a²."""
+
+    @abstractmethod
+    def divide(self, a, b):
+        """Пара (частное, остаток)."""
+
+    @abstractmethod
+    def divide_exact(self, a, b):
+        """a / b, если b делит a нацело."""
+
+    @abstractmethod
+    def power_integer(self, base, exponent):
+        """base ^ exponent."""
+
+    @abstractmethod
+    def iroot(self, a, k):
+        """⌊a^(1/k)⌋."""
+
+    @abstractmethod
+    def gcd(self, a, b):
+        """НОД(a, b)."""
+
+    @abstractmethod
+    def extended_gcd(self, a, b):
+        """Тройка (g, x, y), где a·x + b·y = g."""
+
+    @abstractmethod
+    def mod_power(self, base, exponent, modulus):
+        """base ^ exponent mod modulus."""
+
+    @abstractmethod
+    def modulus_context(self, modulus):
+        """
+        Контекст многократной редукции по модулю modulus > 0 с методами
+        reduce, mulmod, sqrmod и addmod (вычеты в [0, modulus)).
+        """
+
+class ReferenceBackend(ArithmeticBackend):
+    """Собственная реализация на лимбах (Карацуба, Toom-3, NTT, Монтгомери и т.д.)."""
+
+    name = "reference"
+
+    def add(self, a, b):
+        return la._add_reference(a, b)
+
+    def subtract(self, a, b):
+        return la._subtract_reference(a, b)
+
+    def multiply(self, a, b):
+        return la._multiply_reference(a, b)
+
+    def square(self, a):
+        return la._square_reference(a)
+
+    def divide(self, a, b):
+        return la._divide_reference(a, b)
+
+    def divide_exact(self, a, b):
+        return la._divide_exact_reference(a, b)
+
+    def power_integer(self, base, exponent):
+        return la._power_integer_reference(base, exponent)
+
+    def iroot(self, a, k):
+        return la._iroot_reference(a, k)
+
+    def gcd(self, a, b):
+        return la._gcd_reference(a, b)
+
+    def extended_gcd(self, a, b):
+        return la._extended_gcd_reference(a, b)
+
+    def mod_power(self, base, exponent, modulus):
+        from .modular_arithmetic import _mod_power_reference
+        return _mod_power_reference(base, exponent, modulus)
+
+    def modulus_context(self, modulus):
+        # Редукция Барретта на лимбах с LRU-кэшем контекстов
+        return get_modulus_context(modulus)
+
+class _NativeModulusContext:
+    """Контекст модуля для бэкендов на встроенных числах: редукция - операция %."""
+
+    def __init__(self, backend, modulus):
+        if modulus.is_negative or not modulus:
+            raise ValueError("Модуль должен быть положительным числом.")
+        self.modulus = modulus
+        self._backend = backend
+        self._n = backend._to_native(modulus)
+
+    def _residue(self, value):
+        return self._backend._from_native(value % self._n)
+
+    def reduce(self, x):
+        return self._residue(self._backend._to_native(x))
+
+    def mulmod(self, x, y):
+        return self._residue(self._backend._to_native(x) * self._backend._to_native(y))
+
+    def sqrmod(self, x):
+        value = self._backend._to_native(x)
+        return self._residue(value * value)
+
+    def addmod(self, x, y):
+        return self._residue(self._backend._to_native(x) + self._backend._to_native(y))
+
+class IntBackend(ArithmeticBackend):
+    """
+    Вычисления на встроенных int. Числа переводятся в int и обратно
+    за O(n log n); сами операции выполняются кодом интерпретатора на C.
+    """
+
+    name = "int"
+
+    def _to_native(self, x):
+        return int(x)
+
+    def _from_native(self, value):
+        return la.LargeNumber.from_int(int(value))
+
+    def _truncated_divmod(self, a, b):
+        if b == 0:
+            raise ZeroDivisionError("Деление на ноль.")
+        quotient = abs(a) // abs(b)
+        if (a < 0) != (b < 0):
+            quotient = -quotient
+        return quotient, a - quotient * b
+
+    def add(self, a, b):
+        return self._from_native(self._to_native(a) + self._to_native(b))
+
+    def subtract(self, a, b):
+        return self._from_native(self._to_native(a) - self._to_native(b))
+
+    def multiply(self, a, b):
+        return self._from_native(self._to_native(a) * self._to_native(b))
+
+    def square(self, a):
+        value = self._to_native(a)
+        return self._from_native(value * value)
+
+    def divide(self, a, b):
+        quotient, remainder = self._truncated_divmod(self._to_native(a), self._to_native(b))
+        return self._from_native(quotient), self._from_native(remainder)
+
+    def divide_exact(self, a, b):
+        if not b:
+            raise ZeroDivisionError("Деление на ноль.")
+        return self._from_native(self._to_native(a) // self._to_native(b))
+
+    def power_integer(self, base, exponent):
+        if exponent.is_negative:
+            raise ValueError("Показатель степени должен быть неотрицательным.")
+        return self._from_native(self._to_native(base) ** self._to_native(exponent))
+
+    def iroot(self, a, k):
+        la._check_root(a, k)
+        value = self._to_native(a)
+        if k == 2:
+            return self._from_native(math.isqrt(value))
+        if k == 1 or value < 2:
+            return a
+        x = 1 << -(-int(value).bit_length() // k)
+        while True:
+            y = ((k - 1) * x + value // x ** (k - 1)) // k
+            if y >= x:
+                return self._from_native(x)
+            x = y
+
+    def gcd(self, a, b):
+        return self._from_native(math.gcd(self._to_native(a), self._to_native(b)))
+
+    def extended_gcd(self, a, b):
+        a_value, b_value = self._to_native(a), self._to_native(b)
+        if b_value == 0:
+            return self._from_native(abs(a_value)), self._from_native(-1 if a_value < 0 else 1), la.ZERO
+        old_r, r = a_value, b_value
+        old_x, x = 1, 0
+        while r:
+            q = old_r // r
+            old_r, r = r, old_r - q * r
+            old_x, x = x, old_x - q * x
+        if old_r < 0:
+            old_r, old_x = -old_r, -old_x
+        y = (old_r - a_value * old_x) // b_value
+        return self._from_native(old_r), self._from_native(old_x), self._from_native(y)
+
+    def mod_power(self, base, exponent, modulus):
+        if exponent.is_negative:
+            raise ValueError("Показатель степени должен быть неотрицательным.")
+        if modulus.is_negative or not modulus:
+            raise ValueError("Модуль должен быть положительным числом.")
+        return self._from_native(pow(self._to_native(base), self._to_native(exponent),
+                                     self._to_native(modulus)))
+
+    def modulus_context(self, modulus):
+        return _NativeModulusContext(self, modulus)
+
+class Gmpy2Backend(IntBackend):
+    """Вычисления на mpz из gmpy2 (GMP)."""
+
+    name = "gmpy2"
+
+    def _to_native(self, x):
+        return gmpy2.mpz(int(x))
+
+    def square(self, a):
+        return self._from_native(gmpy2.square(self._to_native(a)))
+
+    def divide(self, a, b):
+        if not b:
+            raise ZeroDivisionError("Деление на ноль.")
+        quotient, remainder = gmpy2.t_divmod(self._to_native(a), self._to_native(b))
+        return self._from_native(quotient), self._from_native(remainder)
+
+    def divide_exact(self, a, b):
+        if not b:
+            raise ZeroDivisionError("Деление на ноль.")
+        return self._from_native(gmpy2.divexact(self._to_native(a), self._to_native(b)))
+
+    def iroot(self, a, k):
+        la._check_root(a, k)
+        root, _ = gmpy2.iroot(self._to_native(a), k)
+        return self._from_native(root)
+
+    def gcd(self, a, b):
+        return self._from_native(gmpy2.gcd(self._to_native(a), self._to_native(b)))
+
+    def extended_gcd(self, a, b):
+        if not b:
+            return super().extended_gcd(a, b)
+        g, x, y = gmpy2.gcdext(self._to_native(a), self._to_native(b))
+        return self._from_native(g), self._from_native(x), self._from_native(y)
+
+    def mod_power(self, base, exponent, modulus):
+        if exponent.is_negative:
+            raise ValueError("Показатель степени должен быть неотрицательным.")
+        if modulus.is_negative or not modulus:
+            raise ValueError("Модуль должен быть положительным числом.")
+        return self._from_native(gmpy2.powmod(self._to_native(base), self._to_native(exponent),
+                                              self._to_native(modulus)))
+
+# Имя -> (класс бэкенда, функция проверки доступности)
+_REGISTRY = {}
+_instances = {}
+_current = None
+
+def register_backend(backend_class, is_available=lambda: True):
+    """Регистрирует класс бэкенда под его именем name; класс должен реализовать весь интерфейс."""
+    if inspect.isabstract(backend_class):
+        missing = ", ".join(sorted(backend_class.__abstractmethods__))
+        raise TypeError(f"Бэкенд '{backend_class.name}' не реализует методы: {missing}.")
+    _REGISTRY[backend_class.name] = (backend_class, is_available)
+
+register_backend(ReferenceBackend)
+register_backend(IntBackend)
+register_backend(Gmpy2Backend, lambda: gmpy2 is not None)
+
+# Порядок предпочтения для значения "auto"
+_AUTO_ORDER = ("gmpy2", "int", "reference")
+
+def available_backends() -> list[str]:
+    """Имена бэкендов, которые можно выбрать в текущем окружении."""
+    return [name for name, (_, is_available) in _REGISTRY.items() if is_available()]
+
+def _resolve(name):
+    name = name.strip().lower()
+    if name == "auto":
+        return next(candidate for candidate in _AUTO_ORDER if candidate in available_backends())
+    if name not in _REGISTRY:
+        raise ValueError(f"Неизвестный бэкенд арифметики: '{name}'. Доступны: {', '.join(available_backends())}.")
+    if name not in available_backends():
+        raise ValueError(f"Бэкенд арифметики '{name}' недоступен в этом окружении.")
+    return name
+
+def _instance(name):
+    if name not in _instances:
+        _instances[name] = _REGISTRY[name][0]()
+    return _instances[name]
+
+def set_backend(name: str) -> ArithmeticBackend:
+    """Делает бэкенд текущим для всех последующих вычислений и возвращает его."""
+    global _current
+    _current = _instance(_resolve(name))
+    return _current
+
+def get_backend() -> ArithmeticBackend:
+    """Текущий бэкенд; при первом вызове выбирается по переменной окружения."""
+    if _current is None:
+        return set_backend(os.environ.get(BACKEND_ENV_VAR) or DEFAULT_BACKEND)
+    return _current
+
+@contextmanager
+def use_backend(name: str):
+    """Временно переключает бэкенд, например для сверки результатов с эталоном."""
+    previous = get_backend()
+    set_backend(name)
+    try:
+        yield _current
+    finally:
+        set_backend(previous.name)
@@ -0,0 +1,105 @@
+"""
+Кэш разложений на простые множители.
+
+Запись для числа n хранит уже найденные простые множители с кратностями
+и список ещё не разложенных составных частей (тоже с кратностями), так что
+n = Π p^k · Π m^j. Пока список частей не пуст, разложение частичное:
+factorization.factorize сохраняет запись после каждого найденного
+делителя, и прерванная работа (например, долгий поиск кривыми) продолжается
+с того же места.
+
+Два уровня:
+- в памяти - LRU на FACTOR_CACHE_SIZE записей (OrderedDict);
+- на диске - необязательная база SQLite, путь к которой задаёт переменная
+  окружения CALC_FACTOR_CACHE. Числа хранятся в JSON, так что их длина
+  не ограничена 64 битами. Записи с диска поднимаются в память при чтении.
+"""
+
+import json
+import os
+import sqlite3
+from collections import OrderedDict
+
+FACTOR_CACHE_SIZE = 1024
+FACTOR_CACHE_ENV_VAR = "CALC_FACTOR_CACHE"
+
+class FactorCache:
+    """Двухуровневый кэш разложений: LRU в памяти и необязательная база SQLite."""
+
+    def __init__(self, maxsize: int = FACTOR_CACHE_SIZE, path: str | None = None):
+        self.maxsize = maxsize
+        self.path = path
+        self._memory = OrderedDict()
+        self._db = None
+        self._db_pid = None
+
+    def _connection(self):
+        # Соединение SQLite нельзя использовать в процессе, порождённом через fork
+        if self._db is None or self._db_pid != os.getpid():
+            self._db = sqlite3.connect(self.path)
+            self._db_pid = os.getpid()
+            with self._db:
+                self._db.execute("CREATE TABLE IF NOT EXISTS factorizations "
+                                 "(n TEXT PRIMARY KEY, factors TEXT NOT NULL, pending TEXT NOT NULL)")
+        return self._db
+
+    def _remember(self, n, record):
+        self._memory[n] = record
+        self._memory.move_to_end(n)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def get(self, n: int):
+        """
+        Запись для n: пара (словарь простое -> кратность, список пар
+        (составная часть, кратность)) или None. Список пуст у полных разложений.
+        """
+        record = self._memory.get(n)
+        if record is not None:
+            self._memory.move_to_end(n)
+        elif self.path is not None:
+            row = self._connection().execute("SELECT factors, pending FROM factorizations WHERE n = ?",
+                                             (str(n),)).fetchone()
+            if row is not None:
+                record = ({p: k for p, k in json.loads(row[0])}, [tuple(part) for part in json.loads(row[1])])
+                self._remember(n, record)
+        if record is None:
+            return None
+        factors, pending = record
+        return dict(factors), list(pending)
+
+    def put(self, n: int, factors: dict, pending=()) -> None:
+        """Сохраняет (частичное) разложение n на обоих уровнях."""
+        record = (dict(factors), [tuple(part) for part in pending])
+        self._remember(n, record)
+        if self.path is not None:
+            with self._connection() as db:
+                db.execute("INSERT OR REPLACE INTO factorizations VALUES (?, ?, ?)",
+                           (str(n), json.dumps(sorted(record[0].items())), json.dumps(record[1])))
+
+    def clear(self) -> None:
+        """Очищает оба уровня."""
+        self._memory.clear()
+        if self.path is not None:
+            with self._connection() as db:
+                db.execute("DELETE FROM factorizations")
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+_default = None
+
+def get_factor_cache() -> FactorCache:
+    """Общий кэш процесса; при первом вызове база берётся из переменной окружения."""
+    global _default
+    if _default is None:
+        _default = FactorCache(path=os.environ.get(FACTOR_CACHE_ENV_VAR) or None)
+    return _default
+
+def set_factor_cache(cache: FactorCache) -> FactorCache:
+    """Заменяет общий кэш (например, на кэш с другой базой) и возвращает его."""
+    global _default
+    _default = cache
+    return cache
@@ -0,0 +1,277 @@
+"""
+Разложение целых чисел на простые множители в несколько ступеней.
+
+1. Пробные деления на простые до TRIAL_DIVISION_LIMIT из таблицы решета.
+2. ρ-метод Полларда в варианте Брента: последовательность x -> x^2 + c,
+   поиск цикла с удвоением длины шага, НОД не на каждом шаге, а один раз
+   на RHO_BATCH произведений |x - y|. Находит делители до ~10^10 за
+   RHO_MAX_ITERATIONS итераций.
+3. Метод эллиптических кривых Ленстры (ECM) на кривых Монтгомери
+   с параметризацией Сайямы: стадия 1 умножает точку на все степени простых
+   до B1, стадия 2 ищет один простой множитель порядка из (B1, B2] методом
+   "малых и больших шагов". Границы B1 и число кривых растут по ECM_SCHEDULE,
+   рассчитанному на делители из 15, 20, ..., 40 цифр. Кривые можно
+   распределить по процессам (параметр workers).
+
+После каждого найденного делителя обе части проверяются тестом Бэйли-PSW
+и точной степенью; простые части больше не раскладываются. Полные и
+частичные разложения сохраняются в кэше factor_cache.
+
+Внутренние циклы работают со встроенными int, как решето кандидатов
+в primality: в ρ-методе и ECM миллионы умножений по модулю числа из
+нескольких лимбов, и накладные расходы LargeNumber на каждое из них
+в десятки раз превышают саму арифметику. На входе и выходе - LargeNumber.
+"""
+
+import math
+import random
+from collections import Counter
+
+from .factor_cache import get_factor_cache
+from .long_arithmetic import LargeNumber, perfect_power
+from .parallel import check_cancelled, first_result, worker_count
+from .primality import is_probable_prime
+from . import sieve
+
+# Граница пробных делений
+TRIAL_DIVISION_LIMIT = 1 << 16
+# ρ-метод: предел числа итераций на одну попытку и число произведений на один НОД
+RHO_MAX_ITERATIONS = 1 << 18
+RHO_BATCH = 128
+# ECM: (B1, число кривых) для делителей из 15, 20, 25, 30, 35, 40 цифр;
+# B2 = ECM_B2_FACTOR * B1. Последний уровень повторяется, пока делитель не найден.
+ECM_SCHEDULE = ((2000, 25), (11000, 90), (50000, 300), (250000, 700), (1000000, 1800), (3000000, 5100))
+ECM_B2_FACTOR = 100
+# Шаг "больших шагов" стадии 2: произведение первых простых 2·3·5·7
+ECM_STAGE2_D = 210
+
+def _is_prime(m):
+    return is_probable_prime(LargeNumber.from_int(m), method="baillie_psw")
+
+def _trial_division(n, factors):
+    """Снимает с n простые делители до TRIAL_DIVISION_LIMIT, возвращает остаток."""
+    for q in sieve.iter_primes(2, TRIAL_DIVISION_LIMIT):
+        if q * q > n:
+            break
+        if n % q == 0:
+            n //= q
+            factors[q] += 1
+            while n % q == 0:
+                n //= q
+                factors[q] += 1
+    if 1 < n < TRIAL_DIVISION_LIMIT ** 2:
+        # Делителей меньше sqrt(n) не осталось: остаток простой
+        factors[n] += 1
+        n = 1
+    return n
+
+def _pollard_brent(n, max_iterations=RHO_MAX_ITERATIONS):
+    """Нетривиальный делитель составного нечётного n ρ-методом Брента или None."""
+    c = random.randrange(1, n - 1)
+    y = random.randrange(0, n)
+    x = ys = y
+    r, q, g = 1, 1, 1
+    while g == 1:
+        x = y
+        for _ in range(r):
+            y = (y * y + c) % n
+        k = 0
+        while k < r and g == 1:
+            ys = y
+            for _ in range(min(RHO_BATCH, r - k)):
+                y = (y * y + c) % n
+                q = q * (x - y) % n
+            g = math.gcd(q, n)
+            k += RHO_BATCH
+        r *= 2
+        if g == 1 and r > max_iterations:
+            return None
+    if g == n:
+        # Произведение пакета обнулилось: повторяем пакет по одному шагу
+        while True:
+            ys = (ys * ys + c) % n
+            g = math.gcd(x - ys, n)
+            if g > 1:
+                break
+    return g if g != n else None
+
+class _FoundFactor(Exception):
+    """Необратимый элемент при построении кривой: его НОД с n - делитель."""
+
+    def __init__(self, factor):
+        self.factor = factor
+
+def _inverse(a, n):
+    g = math.gcd(a, n)
+    if g != 1:
+        raise _FoundFactor(g)
+    return pow(a, -1, n)
+
+def _double(x, z, a24, n):
+    s = (x + z) * (x + z) % n
+    d = (x - z) * (x - z) % n
+    t = s - d
+    return s * d % n, t * (d + a24 * t) % n
+
+def _add(xp, zp, xq, zq, xd, zd, n):
+    """P + Q по P, Q и P - Q (только координаты X:Z)."""
+    u = (xp - zp) * (xq + zq)
+    v = (xp + zp) * (xq - zq)
+    return zd * (u + v) ** 2 % n, xd * (u - v) ** 2 % n
+
+def _ladder(k, x, z, a24, n):
+    """[k]P лестницей Монтгомери."""
+    if k == 1:
+        return x, z
+    x0, z0 = x, z
+    x1, z1 = _double(x, z, a24, n)
+    for bit in bin(k)[3:]:
+        if bit == "1":
+            x0, z0 = _add(x1, z1, x0, z0, x, z, n)
+            x1, z1 = _double(x1, z1, a24, n)
+        else:
+            x1, z1 = _add(x1, z1, x0, z0, x, z, n)
+            x0, z0 = _double(x0, z0, a24, n)
+    return x0, z0
+
+def _stage2_plan(b1, b2):
+    """
+    Простые q из (max(B1, 2D), B2] в виде q = vD ± u, u < D/2: для каждого q -
+    на сколько больших шагов сдвинуть v от предыдущего q и само u.
+    Возвращает начальное v и две строки байтов.
+    """
+    d = ECM_STAGE2_D
+    low = max(b1, 2 * d)
+    v = (low + 1 + d // 2) // d
+    start, advances, steps = v, bytearray(), bytearray()
+    for q in sieve.iter_primes(low + 1, b2):
+        target = (q + d // 2) // d
+        advances.append(target - v)
+        steps.append(abs(q - target * d))
+        v = target
+    return start, advances, steps
+
+def _ecm_curve(n, b1, stage1_primes, stage2_plan):
+    """Одна случайная кривая: делитель n или None."""
+    sigma = random.randrange(6, n - 1)
+    u = (sigma * sigma - 5) % n
+    v = 4 * sigma % n
+    x, z = pow(u, 3, n), pow(v, 3, n)
+    try:
+        # a24 = (A + 2) / 4 = (v - u)^3 (3u + v) / (16 u^3 v)
+        a24 = pow(v - u, 3, n) * (3 * u + v) * _inverse(16 * x * v % n, n) % n
+    except _FoundFactor as found:
+        return found.factor if found.factor != n else None
+
+    # Стадия 1: умножение на p^e <= B1 для всех простых p <= B1
+    for p in stage1_primes:
+        power = p
+        while power * p <= b1:
+            power *= p
+        x, z = _ladder(power, x, z, a24, n)
+    g = math.gcd(z, n)
+    if g != 1:
+        return g if g != n else None
+
+    # Стадия 2: [q]Q = O для простого q = vD ± u равносильно x([vD]Q) = x([u]Q),
+    # то есть X_vD·Z_u - X_u·Z_vD ≡ 0 по модулю делителя; произведения копятся
+    d = ECM_STAGE2_D
+    x2, z2 = _double(x, z, a24, n)
+    baby = {1: (x, z)}
+    prev, current = (x, z), _add(x2, z2, x, z, x, z, n)
+    for step in range(3, d // 2, 2):
+        baby[step] = current
+        prev, current = current, _add(*current, x2, z2, *prev, n)
+
+    start, advances, steps = stage2_plan
+    xd, zd = _ladder(d, x, z, a24, n)
+    giant_prev = _ladder((start - 1) * d, x, z, a24, n)
+    giant = _ladder(start * d, x, z, a24, n)
+    product = 1
+    for advance, step in zip(advances, steps):
+        for _ in range(advance):
+            giant_prev, giant = giant, _add(*giant, xd, zd, *giant_prev, n)
+        bx, bz = baby[step]
+        product = product * (giant[0] * bz - bx * giant[1]) % n
+    g = math.gcd(product, n)
+    return g if 1 < g < n else None
+
+def _ecm_curves(n, b1, curves):
+    """До curves кривых с границами B1 и ECM_B2_FACTOR·B1; первый найденный делитель или None."""
+    stage1_primes = sieve.primes_up_to(b1)
+    stage2_plan = _stage2_plan(b1, ECM_B2_FACTOR * b1)
+    for _ in range(curves):
+        check_cancelled()
+        factor = _ecm_curve(n, b1, stage1_primes, stage2_plan)
+        if factor is not None:
+            return factor
+    return None
+
+def _ecm(n, workers):
+    """Делитель составного n методом эллиптических кривых."""
+    level = 0
+    while True:
+        b1, curves = ECM_SCHEDULE[min(level, len(ECM_SCHEDULE) - 1)]
+        if workers > 1:
+            factor = first_result(_ecm_curves, (n, b1, -(-curves // workers)), workers)
+        else:
+            factor = _ecm_curves(n, b1, curves)
+        if factor is not None:
+            return factor
+        level += 1
+
+def _find_factor(n, workers):
+    """Нетривиальный делитель составного n без малых делителей."""
+    for _ in range(2):
+        factor = _pollard_brent(n)
+        if factor is not None:
+            return factor
+    return _ecm(n, workers)
+
+def factorize(n: LargeNumber, workers=1) -> list[tuple[LargeNumber, int]]:
+    """
+    Каноническое разложение |n| = p1^k1 · ... · pr^kr в виде списка пар (p, k)
+    по возрастанию p. workers > 1 (или None - по числу процессоров) распределяет
+    кривые ECM по процессам. Сначала проверяется кэш разложений: полное
+    разложение возвращается сразу, прерванное продолжается с найденных ранее
+    множителей. В кэш пишется только новое состояние.
+    """
+    value = abs(int(n))
+    if not value:
+        raise ValueError("Разложение нуля на множители не определено.")
+    workers = worker_count(workers)
+    cache = get_factor_cache()
+    record = cache.get(value)
+    if record is not None and not record[1]:
+        # Полное разложение из кэша возвращается без записи
+        return [(LargeNumber.from_int(p), k) for p, k in sorted(record[0].items())]
+    if record is None:
+        factors = Counter()
+        # Множители, которые ещё нужно разложить, и их кратность
+        pending = [(_trial_division(value, factors), 1)]
+    else:
+        # Продолжение прерванного разложения
+        factors, pending = Counter(record[0]), list(record[1])
+    saved = record
+    while pending:
+        m, multiplicity = pending.pop()
+        if m == 1:
+            continue
+        if _is_prime(m):
+            factors[m] += multiplicity
+            continue
+        power = perfect_power(LargeNumber.from_int(m))
+        if power is not None:
+            pending.append((int(power[0]), multiplicity * power[1]))
+            continue
+        # Перед долгим поиском делителя состояние сохраняется, чтобы его можно было
+        # продолжить; запись повторяется, только если найдены новые множители
+        state = (dict(factors), pending + [(m, multiplicity)])
+        if state != saved:
+            cache.put(value, *state)
+            saved = state
+        d = _find_factor(m, workers)
+        # Части раскладываются независимо; кратности общих простых складываются
+        pending += [(d, multiplicity), (m // d, multiplicity)]
+    cache.put(value, factors)
+    return [(LargeNumber.from_int(p), k) for p, k in sorted(factors.items())]
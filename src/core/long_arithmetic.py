@@ -1,3 +1,54 @@
+import math
+import sys
+from array import array
+
+from . import ntt, sieve, vectorized
+
+# Внутреннее представление: модуль числа хранится в системе счисления
+# с основанием 2^LIMB_BITS ("лимбы"), младший лимб первым.
+# Основание, переданное пользователем, используется только при вводе и выводе.
+LIMB_BITS = 30
+LIMB_BASE = 1 << LIMB_BITS
+LIMB_MASK = LIMB_BASE - 1
+_LIMB_TYPECODE = 'I' if array('I').itemsize * 8 >= LIMB_BITS else 'L'
+
+# Пороги (в лимбах меньшего операнда) переключения алгоритмов умножения.
+# Их можно менять во время работы, например для тестов или подбора под машину.
+KARATSUBA_THRESHOLD = 80
+# Порог Карацубы для возведения в квадрат; подобран отдельно, так как квадрат
+# "в столбик" и квадрат по Карацубе дешевле соответствующих умножений.
+SQR_KARATSUBA_THRESHOLD = 60
+TOOM3_THRESHOLD = 240
+# Порог умножения через NTT: с NumPy и на чистом Python соответственно.
+NTT_THRESHOLD = 250
+NTT_PURE_PYTHON_THRESHOLD = 2000
+# Порог (в лимбах длинного операнда) перехода к векторизованным ядрам сложения,
+# вычитания и умножения на короткое число (только при установленном NumPy).
+# Для чисел LargeNumber лимбы уже лежат в array и не переводятся в список,
+# поэтому порог ниже.
+VECTORIZE_THRESHOLD = 700
+VECTORIZE_ARRAY_THRESHOLD = 150
+# Порог (в лимбах делителя и частного) рекурсивного деления Буркеля-Циглера.
+BURNIKEL_ZIEGLER_THRESHOLD = 60
+# Порог (в лимбах делителя и частного) блочного точного деления через
+# обратный по модулю B^m вместо деления Гензеля по одному лимбу.
+DIVEXACT_BLOCK_THRESHOLD = 400
+# Порог (в лимбах) перехода от алгоритма Лемера к половинному НОД и размер,
+# ниже которого половинный НОД считается обычными шагами деления.
+HGCD_THRESHOLD = 1500
+HGCD_BASE = 4
+# Порог (в лимбах) перехода к рекурсивному переводу между системами счисления.
+RADIX_CONVERSION_THRESHOLD = 20
+# Корни короче стольких бит находятся сразу по машинному приближению;
+# для более длинных точность удваивается рекурсивно (см. _iroot_reference)
+ROOT_BASE_BITS = 32
+
+# Кэш степеней основания для перевода: base -> [base^k, base^(2k), base^(4k), ...],
+# где k - число цифр в одном блоке (см. _digits_per_limb), и обратных к ним
+# величин Барретта: (base, level) -> floor(B^(2m) / base^(k·2^level)).
+_RADIX_POWERS = {}
+_RADIX_RECIPROCALS = {}
+
 def _char_to_int(char: str) -> int:
     """Конвертирует символ в число."""
     if '0' <= char <= '9':
@@ -22,40 +73,862 @@ def _remove_leading_zeros(digits):
         digits.pop()
     return digits
 
+def _digits_per_limb(base):
+    """
+    Возвращает (k, base^k) - сколько цифр в системе base помещается в один лимб.
+    Позволяет разбирать и печатать число блоками по k цифр, а не по одной.
+    """
+    k, power = 1, base
+    while power * base <= LIMB_BASE:
+        power *= base
+        k += 1
+    return k, power
+
+def _is_zero_limbs(limbs):
+    return len(limbs) == 1 and limbs[0] == 0
+
+def _bit_length_limbs(a):
+    """Количество значащих бит модуля."""
+    return (len(a) - 1) * LIMB_BITS + a[-1].bit_length()
+
+def _compare_limbs(a, b):
+    """Сравнивает модули, заданные лимбами. Возвращает -1, 0 или 1."""
+    if len(a) != len(b):
+        return 1 if len(a) > len(b) else -1
+    for i in range(len(a) - 1, -1, -1):
+        if a[i] != b[i]:
+            return 1 if a[i] > b[i] else -1
+    return 0
+
+def _use_vectorized(length, threshold=None):
+    return vectorized.has_numpy() and length >= (VECTORIZE_THRESHOLD if threshold is None else threshold)
+
+def _add_limbs(a, b):
+    """Складывает модули a и b."""
+    if len(a) < len(b):
+        a, b = b, a
+    if _use_vectorized(len(a)):
+        return vectorized.to_list(vectorized.add_limbs(a, b))
+    result = [0] * (len(a) + 1)
+    carry = 0
+    for i in range(len(b)):
+        total = a[i] + b[i] + carry
+        result[i] = total & LIMB_MASK
+        carry = total >> LIMB_BITS
+    for i in range(len(b), len(a)):
+        total = a[i] + carry
+        result[i] = total & LIMB_MASK
+        carry = total >> LIMB_BITS
+    result[len(a)] = carry
+    return _remove_leading_zeros(result)
+
+def _sub_limbs(a, b):
+    """Вычитает модули, |a| >= |b|."""
+    if _use_vectorized(len(a)):
+        return vectorized.to_list(vectorized.sub_limbs(a, b))
+    result = [0] * len(a)
+    borrow = 0
+    for i in range(len(b)):
+        diff = a[i] - b[i] - borrow
+        if diff < 0:
+            diff += LIMB_BASE
+            borrow = 1
+        else:
+            borrow = 0
+        result[i] = diff
+    for i in range(len(b), len(a)):
+        diff = a[i] - borrow
+        if diff < 0:
+            diff += LIMB_BASE
+            borrow = 1
+        else:
+            borrow = 0
+        result[i] = diff
+    return _remove_leading_zeros(result)
+
+def _mul_small(a, m, addend=0):
+    """Вычисляет a * m + addend, где m и addend помещаются в один лимб."""
+    if _use_vectorized(len(a)):
+        return vectorized.to_list(vectorized.mul_small(a, m, addend))
+    result = [0] * (len(a) + 1)
+    carry = addend
+    for i in range(len(a)):
+        total = a[i] * m + carry
+        result[i] = total & LIMB_MASK
+        carry = total >> LIMB_BITS
+    result[len(a)] = carry
+    return _remove_leading_zeros(result)
+
+def _add_into(result, x, offset):
+    """Прибавляет модуль x к списку result начиная с позиции offset (на месте)."""
+    if _is_zero_limbs(x):
+        return
+    carry = 0
+    i = offset
+    for limb in x:
+        total = result[i] + limb + carry
+        result[i] = total & LIMB_MASK
+        carry = total >> LIMB_BITS
+        i += 1
+    while carry:
+        total = result[i] + carry
+        result[i] = total & LIMB_MASK
+        carry = total >> LIMB_BITS
+        i += 1
+
+def _split_limbs(a, start, stop=None):
+    """Возвращает лимбы a[start:stop] как нормализованный список."""
+    return _remove_leading_zeros(list(a[start:stop])) if start < len(a) else [0]
+
+def _mul_schoolbook(a, b):
+    """Умножение модулей "в столбик" по лимбам (Алгоритм 3)."""
+    if _is_zero_limbs(a) or _is_zero_limbs(b):
+        return [0]
+    if len(a) < len(b):
+        a, b = b, a
+    if _use_vectorized(len(a)):
+        return vectorized.to_list(vectorized.mul_short(a, b))
+    len_a = len(a)
+    len_b = len(b)
+    result = [0] * (len_a + len_b)
+    for i in range(len_b):
+        b_i = b[i]
+        if b_i == 0:
+            continue
+        carry = 0
+        for j in range(len_a):
+            total = result[i + j] + a[j] * b_i + carry
+            result[i + j] = total & LIMB_MASK
+            carry = total >> LIMB_BITS
+        result[i + len_a] = carry
+    return _remove_leading_zeros(result)
+
+def _mul_karatsuba(a, b):
+    """
+    Умножение Карацубы: a = a1*B^k + a0, b = b1*B^k + b0,
+    a*b = z2*B^2k + (z1 - z2 - z0)*B^k + z0, где z1 = (a0 + a1)(b0 + b1).
+    Три умножения половинной длины вместо четырёх.
+    """
+    k = (max(len(a), len(b)) + 1) // 2
+    a0, a1 = _split_limbs(a, 0, k), _split_limbs(a, k)
+    b0, b1 = _split_limbs(b, 0, k), _split_limbs(b, k)
+
+    z0 = _mul_limbs(a0, b0)
+    z2 = _mul_limbs(a1, b1)
+    z1 = _mul_limbs(_add_limbs(a0, a1), _add_limbs(b0, b1))
+    z1 = _sub_limbs(_sub_limbs(z1, z0), z2)
+
+    result = [0] * (len(a) + len(b) + 1)
+    _add_into(result, z0, 0)
+    _add_into(result, z1, k)
+    _add_into(result, z2, 2 * k)
+    return _remove_leading_zeros(result)
+
+def _signed_add(x, y):
+    """Складывает числа со знаком, заданные парами (is_negative, limbs)."""
+    x_neg, x_limbs = x
+    y_neg, y_limbs = y
+    if x_neg == y_neg:
+        return x_neg, _add_limbs(x_limbs, y_limbs)
+    if _compare_limbs(x_limbs, y_limbs) >= 0:
+        diff = _sub_limbs(x_limbs, y_limbs)
+        return x_neg and not _is_zero_limbs(diff), diff
+    return y_neg, _sub_limbs(y_limbs, x_limbs)
+
+def _signed_sub(x, y):
+    return _signed_add(x, (not y[0], y[1]))
+
+def _signed_mul(x, y):
+    product = _mul_limbs(x[1], y[1])
+    return (x[0] != y[0]) and not _is_zero_limbs(product), product
+
+def _signed_div_small(x, d):
+    """Точное деление числа со знаком на малое d."""
+    quotient, _ = _divmod_small(x[1], d)
+    return x[0] and not _is_zero_limbs(quotient), quotient
+
+def _toom3_evaluate(m0, m1, m2):
+    """Значения многочлена m0 + m1·x + m2·x^2 в точках 0, 1, -1, -2, ∞."""
+    m0, m1, m2 = (False, m0), (False, m1), (False, m2)
+    p = _signed_add(m0, m2)
+    p_1 = _signed_add(p, m1)
+    p_m1 = _signed_sub(p, m1)
+    # p(-2) = (p(-1) + m2) * 2 - m0
+    p_m2 = _signed_add(p_m1, m2)
+    p_m2 = _signed_sub((p_m2[0], _mul_small(p_m2[1], 2)), m0)
+    return m0, p_1, p_m1, p_m2, m2
+
+def _toom3_interpolate(values, k, length):
+    """Собирает произведение из значений в точках 0, 1, -1, -2, ∞ (последовательность Бодрато)."""
+    r0, r1, r_m1, r_m2, r_inf = values
+    r3 = _signed_div_small(_signed_sub(r_m2, r1), 3)
+    r1 = _signed_div_small(_signed_sub(r1, r_m1), 2)
+    r2 = _signed_sub(r_m1, r0)
+    r3 = _signed_add(_signed_div_small(_signed_sub(r2, r3), 2), (r_inf[0], _mul_small(r_inf[1], 2)))
+    r2 = _signed_sub(_signed_add(r2, r1), r_inf)
+    r1 = _signed_sub(r1, r3)
+
+    result = [0] * (length + 1)
+    for index, (_, coefficient) in enumerate((r0, r1, r2, r3, r_inf)):
+        _add_into(result, coefficient, index * k)
+    return _remove_leading_zeros(result)
+
+def _mul_toom3(a, b):
+    """
+    Умножение Тоома-Кука (Toom-3): каждый множитель делится на три части,
+    многочлены вычисляются в точках 0, 1, -1, -2, ∞, а пять произведений
+    трети длины интерполируются обратно (последовательность Бодрато).
+    """
+    k = (max(len(a), len(b)) + 2) // 3
+    a_points = _toom3_evaluate(_split_limbs(a, 0, k), _split_limbs(a, k, 2 * k), _split_limbs(a, 2 * k))
+    b_points = _toom3_evaluate(_split_limbs(b, 0, k), _split_limbs(b, k, 2 * k), _split_limbs(b, 2 * k))
+    values = [_signed_mul(x, y) for x, y in zip(a_points, b_points)]
+    return _toom3_interpolate(values, k, len(a) + len(b))
+
+def _propagate_carries(coefficients):
+    """Переводит коэффициенты свёртки (произвольной величины) в лимбы."""
+    result = []
+    carry = 0
+    for coefficient in coefficients:
+        total = coefficient + carry
+        result.append(total & LIMB_MASK)
+        carry = total >> LIMB_BITS
+    while carry:
+        result.append(carry & LIMB_MASK)
+        carry >>= LIMB_BITS
+    return _remove_leading_zeros(result)
+
+def _mul_ntt(a, b):
+    """Умножение через свёртку NTT с последующим распространением переносов."""
+    return _propagate_carries(ntt.convolve(a, b))
+
+def _mul_limbs(a, b):
+    """
+    Умножает модули, выбирая алгоритм по длине операндов:
+    "в столбик" для коротких, Карацуба начиная с KARATSUBA_THRESHOLD лимбов,
+    Toom-3 начиная с TOOM3_THRESHOLD лимбов, NTT начиная с NTT_THRESHOLD
+    (NTT_PURE_PYTHON_THRESHOLD без NumPy).
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    if len(b) < KARATSUBA_THRESHOLD:
+        return _mul_schoolbook(a, b)
+    ntt_threshold = NTT_THRESHOLD if ntt.has_numpy() else NTT_PURE_PYTHON_THRESHOLD
+    if len(b) >= ntt_threshold and len(a) + len(b) - 1 <= ntt.MAX_LENGTH:
+        return _mul_ntt(a, b)
+    if len(a) >= 2 * len(b):
+        # Несбалансированные операнды: длинный множитель режется на куски длины b
+        result = [0] * (len(a) + len(b))
+        for start in range(0, len(a), len(b)):
+            _add_into(result, _mul_limbs(_split_limbs(a, start, start + len(b)), b), start)
+        return _remove_leading_zeros(result)
+    if len(b) < TOOM3_THRESHOLD:
+        return _mul_karatsuba(a, b)
+    return _mul_toom3(a, b)
+
+def _sqr_schoolbook(a):
+    """
+    Квадрат "в столбик": каждое перекрёстное произведение a_i·a_j (i < j)
+    считается один раз и удваивается, затем добавляются квадраты a_i^2 -
+    почти вдвое меньше умножений лимбов, чем у _mul_schoolbook(a, a).
+    """
+    n = len(a)
+    result = [0] * (2 * n)
+    for i in range(n - 1):
+        a_i = a[i]
+        if a_i == 0:
+            continue
+        carry = 0
+        for j in range(i + 1, n):
+            total = result[i + j] + a_i * a[j] + carry
+            result[i + j] = total & LIMB_MASK
+            carry = total >> LIMB_BITS
+        result[i + n] = carry
+    carry = 0
+    for i in range(n):
+        square_i = a[i] * a[i]
+        total = (result[2 * i] << 1) + (square_i & LIMB_MASK) + carry
+        result[2 * i] = total & LIMB_MASK
+        total = (result[2 * i + 1] << 1) + (square_i >> LIMB_BITS) + (total >> LIMB_BITS)
+        result[2 * i + 1] = total & LIMB_MASK
+        carry = total >> LIMB_BITS
+    return _remove_leading_zeros(result)
+
+def _sqr_karatsuba(a):
+    """
+    Квадрат по Карацубе: a = a1*B^k + a0,
+    a^2 = a1^2*B^2k + ((a0 + a1)^2 - a0^2 - a1^2)*B^k + a0^2.
+    """
+    k = (len(a) + 1) // 2
+    a0, a1 = _split_limbs(a, 0, k), _split_limbs(a, k)
+
+    z0 = _sqr_limbs(a0)
+    z2 = _sqr_limbs(a1)
+    z1 = _sub_limbs(_sub_limbs(_sqr_limbs(_add_limbs(a0, a1)), z0), z2)
+
+    result = [0] * (2 * len(a) + 1)
+    _add_into(result, z0, 0)
+    _add_into(result, z1, k)
+    _add_into(result, z2, 2 * k)
+    return _remove_leading_zeros(result)
+
+def _sqr_toom3(a):
+    """Квадрат по Тоому-Куку: значения в точках вычисляются один раз и возводятся в квадрат."""
+    k = (len(a) + 2) // 3
+    points = _toom3_evaluate(_split_limbs(a, 0, k), _split_limbs(a, k, 2 * k), _split_limbs(a, 2 * k))
+    values = [(False, _sqr_limbs(limbs)) for _, limbs in points]
+    return _toom3_interpolate(values, k, 2 * len(a))
+
+def _sqr_limbs(a):
+    """
+    Возводит модуль в квадрат, выбирая алгоритм по длине так же, как
+    _mul_limbs: "в столбик", Карацуба, Toom-3 или NTT (одно прямое
+    преобразование вместо двух).
+    """
+    if _is_zero_limbs(a):
+        return [0]
+    if len(a) < SQR_KARATSUBA_THRESHOLD:
+        return _sqr_schoolbook(a)
+    ntt_threshold = NTT_THRESHOLD if ntt.has_numpy() else NTT_PURE_PYTHON_THRESHOLD
+    if len(a) >= ntt_threshold and 2 * len(a) - 1 <= ntt.MAX_LENGTH:
+        return _propagate_carries(ntt.square(a))
+    if len(a) < TOOM3_THRESHOLD:
+        return _sqr_karatsuba(a)
+    return _sqr_toom3(a)
+
+def _divmod_small(a, d):
+    """Делит модуль a на число d, помещающееся в один лимб. Возвращает (частное, остаток)."""
+    quotient = [0] * len(a)
+    remainder = 0
+    for i in range(len(a) - 1, -1, -1):
+        current = (remainder << LIMB_BITS) | a[i]
+        quotient[i] = current // d
+        remainder = current - quotient[i] * d
+    return _remove_leading_zeros(quotient), remainder
+
+def _shl_limbs(a, count):
+    """Сдвигает модуль влево на count бит."""
+    if _is_zero_limbs(a):
+        return [0]
+    limb_shift, bit_shift = divmod(count, LIMB_BITS)
+    result = [0] * limb_shift
+    if bit_shift == 0:
+        result.extend(a)
+        return result
+    carry = 0
+    for limb in a:
+        total = (limb << bit_shift) | carry
+        result.append(total & LIMB_MASK)
+        carry = total >> LIMB_BITS
+    result.append(carry)
+    return _remove_leading_zeros(result)
+
+def _limbs_to_int(limbs):
+    """Модуль в виде int: соседние части склеиваются попарно, O(n log n) вместо O(n^2)."""
+    values = list(limbs)
+    shift = LIMB_BITS
+    while len(values) > 1:
+        if len(values) % 2:
+            values.append(0)
+        values = [values[i] | (values[i + 1] << shift) for i in range(0, len(values), 2)]
+        shift *= 2
+    return values[0]
+
+def _int_to_limbs(value):
+    """Лимбы неотрицательного int: число делится пополам по степеням 2^(LIMB_BITS·2^i)."""
+    size = 1
+    while size * LIMB_BITS < value.bit_length():
+        size *= 2
+    parts = [value]
+    while size > 1:
+        size //= 2
+        bits = size * LIMB_BITS
+        mask = (1 << bits) - 1
+        parts = [piece for part in parts for piece in (part & mask, part >> bits)]
+    return _remove_leading_zeros(parts)
+
+def _low_bits_limbs(a, count):
+    """Младшие count бит модуля (a mod 2^count)."""
+    limb_count, bit_count = divmod(count, LIMB_BITS)
+    if limb_count >= len(a):
+        return list(a)
+    result = list(a[:limb_count + 1])
+    result[limb_count] &= (1 << bit_count) - 1
+    return _remove_leading_zeros(result)
+
+def _twos_complement_limbs(number, length):
+    """Дополнительный код числа со знаком в length лимбах (как у int с бесконечным знаком)."""
+    if not number.is_negative:
+        return list(number.limbs) + [0] * (length - len(number.limbs))
+    magnitude = _sub_limbs(number.limbs, [1])
+    magnitude += [0] * (length - len(magnitude))
+    return [limb ^ LIMB_MASK for limb in magnitude]
+
+def _shr_limbs(a, count):
+    """Сдвигает модуль вправо на count бит (деление на 2^count с отбрасыванием остатка)."""
+    limb_shift, bit_shift = divmod(count, LIMB_BITS)
+    if limb_shift >= len(a):
+        return [0]
+    if bit_shift == 0:
+        return list(a[limb_shift:])
+    result = [0] * (len(a) - limb_shift)
+    low_mask = (1 << bit_shift) - 1
+    for i in range(limb_shift, len(a)):
+        limb = a[i] >> bit_shift
+        if i + 1 < len(a):
+            limb |= (a[i + 1] & low_mask) << (LIMB_BITS - bit_shift)
+        result[i - limb_shift] = limb
+    return _remove_leading_zeros(result)
+
+def _divmod_knuth(a, b):
+    """
+    Деление модулей по алгоритму D Кнута (len(b) >= 2, |a| >= |b|).
+
+    Делитель нормализуется сдвигом так, чтобы старший бит его старшего лимба
+    был единицей. Тогда оценка очередного лимба частного по двум старшим
+    лимбам остатка и старшему лимбу делителя завышена не более чем на 2,
+    а после проверки по второму лимбу делителя — почти всегда точна.
+    Остаток обновляется на месте в рабочем буфере u.
+    """
+    shift = LIMB_BITS - b[-1].bit_length()
+    v = _shl_limbs(b, shift)
+    u = _shl_limbs(a, shift)
+    if len(u) == len(a):
+        u.append(0)
+    n = len(v)
+    m = len(u) - n
+    v_top, v_next = v[-1], v[-2]
+    quotient = [0] * m
+
+    for j in range(m - 1, -1, -1):
+        # Оценка лимба частного по старшим лимбам
+        numerator = (u[j + n] << LIMB_BITS) | u[j + n - 1]
+        q_hat, r_hat = divmod(numerator, v_top)
+        while q_hat >= LIMB_BASE or q_hat * v_next > ((r_hat << LIMB_BITS) | u[j + n - 2]):
+            q_hat -= 1
+            r_hat += v_top
+            if r_hat >= LIMB_BASE:
+                break
+
+        # u[j..j+n] -= q_hat * v
+        carry = 0
+        borrow = 0
+        for i in range(n):
+            product = q_hat * v[i] + carry
+            carry = product >> LIMB_BITS
+            diff = u[i + j] - (product & LIMB_MASK) + borrow
+            u[i + j] = diff & LIMB_MASK
+            borrow = diff >> LIMB_BITS
+        diff = u[j + n] - carry + borrow
+        u[j + n] = diff & LIMB_MASK
+
+        if diff < 0:
+            # Оценка оказалась на единицу больше: возвращаем делитель
+            q_hat -= 1
+            carry = 0
+            for i in range(n):
+                total = u[i + j] + v[i] + carry
+                u[i + j] = total & LIMB_MASK
+                carry = total >> LIMB_BITS
+            u[j + n] = (u[j + n] + carry) & LIMB_MASK
+
+        quotient[j] = q_hat
+
+    remainder = _shr_limbs(_remove_leading_zeros(u[:n]), shift)
+    return _remove_leading_zeros(quotient), remainder
+
+def _join_limbs(high, low, n):
+    """Возвращает high * B^n + low, где low < B^n."""
+    if _is_zero_limbs(high):
+        return list(low)
+    return list(low) + [0] * (n - len(low)) + list(high)
+
+def _bz_div_2n_by_1n(a, b, n):
+    """
+    Рекурсивное деление Буркеля-Циглера: a < b * B^n, b - нормализованное
+    число из n лимбов. Возвращает (частное, остаток).
+    """
+    if n % 2 or n < BURNIKEL_ZIEGLER_THRESHOLD:
+        return _divmod_limbs(a, b, recursive=False)
+    half = n // 2
+    q1, r = _bz_div_3n_by_2n(_split_limbs(a, half), b, half)
+    q2, r = _bz_div_3n_by_2n(_join_limbs(r, _split_limbs(a, 0, half), half), b, half)
+    return _join_limbs(q1, q2, half), r
+
+def _bz_div_3n_by_2n(a, b, n):
+    """Шаг Буркеля-Циглера: a < b * B^n, b - нормализованное число из 2n лимбов."""
+    a12, a3 = _split_limbs(a, n), _split_limbs(a, 0, n)
+    b1, b2 = _split_limbs(b, n), _split_limbs(b, 0, n)
+
+    if _compare_limbs(_split_limbs(a, 2 * n), b1) == 0:
+        # Частное упирается в B^n - 1
+        q = [LIMB_MASK] * n
+        r = _sub_limbs(_add_limbs(a12, b1), _join_limbs(b1, [0], n))
+    else:
+        q, r = _bz_div_2n_by_1n(a12, b1, n)
+
+    # Остаток r * B^n + a3 - q * b2 может оказаться отрицательным
+    # (не более чем на 2b): тогда уменьшаем q и прибавляем b.
+    r = _join_limbs(r, a3, n)
+    correction = _mul_limbs(q, b2)
+    if _compare_limbs(r, correction) >= 0:
+        return q, _sub_limbs(r, correction)
+    deficit = _sub_limbs(correction, r)
+    while True:
+        q = _sub_limbs(q, [1])
+        if _compare_limbs(deficit, b) <= 0:
+            return q, _sub_limbs(b, deficit)
+        deficit = _sub_limbs(deficit, b)
+
+def _divmod_burnikel_ziegler(a, b):
+    """
+    Деление "разделяй и властвуй" (Burnikel, Ziegler, 1998).
+
+    Делитель дополняется до n лимбов, где n = j * 2^k и j < BURNIKEL_ZIEGLER_THRESHOLD,
+    и нормализуется; делимое режется на блоки по n лимбов, и каждый блок
+    частного находится рекурсивным делением 2n на n, которое сводится
+    к двум делениям 3/2 половинного размера и быстрому умножению.
+    """
+    levels = 1
+    while (BURNIKEL_ZIEGLER_THRESHOLD << levels) <= len(b):
+        levels += 1
+    block = 1 << levels
+    n = -(-len(b) // block) * block
+    shift = n * LIMB_BITS - _bit_length_limbs(b)
+    b = _shl_limbs(b, shift)
+    a = _shl_limbs(a, shift)
+
+    # Старший блок делимого должен быть меньше b: оставляем свободный старший бит
+    blocks_count = max(2, _bit_length_limbs(a) // (n * LIMB_BITS) + 1)
+    blocks = [_split_limbs(a, i * n, (i + 1) * n) for i in range(blocks_count)]
+
+    quotient = [0] * (blocks_count * n)
+    remainder = _join_limbs(blocks[-1], blocks[-2], n)
+    for i in range(blocks_count - 2, -1, -1):
+        q_block, remainder = _bz_div_2n_by_1n(remainder, b, n)
+        quotient[i * n:i * n + len(q_block)] = q_block
+        if i > 0:
+            remainder = _join_limbs(remainder, blocks[i - 1], n)
+    return _remove_leading_zeros(quotient), _shr_limbs(remainder, shift)
+
+def _divmod_limbs(a, b, recursive=True):
+    """
+    Делит модули по лимбам. Возвращает (частное, остаток).
+    Для длинных делителя и частного используется рекурсивное деление
+    Буркеля-Циглера, иначе - деление "уголком" по алгоритму D.
+    """
+    if len(b) == 1:
+        quotient, remainder = _divmod_small(a, b[0])
+        return quotient, [remainder]
+    if _compare_limbs(a, b) < 0:
+        return [0], list(a)
+    if (recursive and len(b) >= BURNIKEL_ZIEGLER_THRESHOLD
+            and len(a) - len(b) >= BURNIKEL_ZIEGLER_THRESHOLD):
+        return _divmod_burnikel_ziegler(a, b)
+    return _divmod_knuth(a, b)
+
+def _inverse_mod_base_power(b, k):
+    """
+    b^(-1) mod B^k для нечётного b. Итерация Ньютона-Гензеля x = x·(2 - b·x)
+    удваивает число верных младших лимбов; начальное приближение - обратный
+    к младшему лимбу.
+    """
+    inverse = [pow(b[0], -1, LIMB_BASE)]
+    precision = 1
+    while precision < k:
+        new_precision = min(2 * precision, k)
+        # b·x = 1 + e·B^precision (mod B^new_precision), тогда x' = x - x·e·B^precision
+        error = _split_limbs(_mul_limbs(_split_limbs(b, 0, new_precision), inverse), precision, new_precision)
+        correction = _split_limbs(_mul_limbs(inverse, error), 0, new_precision - precision)
+        if not _is_zero_limbs(correction):
+            correction = _sub_limbs(_shl_limbs([1], (new_precision - precision) * LIMB_BITS), correction)
+            inverse = inverse + [0] * (precision - len(inverse)) + correction
+        precision = new_precision
+    return _remove_leading_zeros(inverse)
+
+def _divexact_hensel(a, b, k):
+    """
+    Деление Гензеля с младших лимбов: очередной лимб частного q_i = r_i·b_0^(-1) mod B
+    обнуляет младший лимб остатка. Вычисления ведутся по модулю B^k, поэтому
+    нужны только младшие k лимбов делимого, а оценки и нормализации, как
+    в алгоритме D, не требуются.
+    """
+    b_inverse = pow(b[0], -1, LIMB_BASE)
+    remainder = list(a[:k]) + [0] * (k - len(a))
+    quotient = [0] * k
+    for i in range(k):
+        q_i = (remainder[i] * b_inverse) & LIMB_MASK
+        if q_i == 0:
+            continue
+        quotient[i] = q_i
+        borrow = 0
+        for j in range(min(len(b), k - i)):
+            total = remainder[i + j] - q_i * b[j] - borrow
+            remainder[i + j] = total & LIMB_MASK
+            borrow = -(total >> LIMB_BITS)
+        index = i + len(b)
+        while borrow and index < k:
+            total = remainder[index] - borrow
+            remainder[index] = total & LIMB_MASK
+            borrow = -(total >> LIMB_BITS)
+            index += 1
+    return _remove_leading_zeros(quotient)
+
+def _divexact_blocks(a, b, k):
+    """
+    Блочное деление Гензеля: частное находится кусками по m = len(b) лимбов,
+    каждый кусок - одно умножение младших лимбов остатка на b^(-1) mod B^m,
+    после чего из остатка (по модулю B^k) вычитается кусок·b. Для длинных
+    операндов оба умножения выполняются быстрыми алгоритмами.
+    """
+    block = min(len(b), k)
+    inverse = _inverse_mod_base_power(b, block)
+    remainder = list(a[:k]) + [0] * (k - len(a))
+    quotient = []
+    for start in range(0, k, block):
+        size = min(block, k - start)
+        q_block = _split_limbs(_mul_limbs(_split_limbs(remainder, start, start + size), inverse), 0, size)
+        quotient += q_block + [0] * (size - len(q_block))
+        if start + size == k:
+            break
+        # remainder -= q_block·b·B^start (mod B^k)
+        borrow = 0
+        i = start
+        for limb in _mul_limbs(q_block, _split_limbs(b, 0, k - start)):
+            if i == k:
+                break
+            total = remainder[i] - limb - borrow
+            remainder[i] = total & LIMB_MASK
+            borrow = -(total >> LIMB_BITS)
+            i += 1
+        while borrow and i < k:
+            total = remainder[i] - borrow
+            remainder[i] = total & LIMB_MASK
+            borrow = -(total >> LIMB_BITS)
+            i += 1
+    return _remove_leading_zeros(quotient)
+
+def _divexact_limbs(a, b):
+    """
+    Точное деление модулей (a делится на b). Младшие нулевые биты делителя
+    снимаются сдвигом, после чего b нечётен и частное, меньшее B^k, равно
+    a·b^(-1) mod B^k. Оно находится с младших лимбов делением Гензеля
+    (если частное не длиннее делителя, нужна лишь часть произведений),
+    для длинных операндов - блоками через обратный по модулю B^m.
+    """
+    if _is_zero_limbs(a):
+        return [0]
+    zero_bits = 0
+    while b[zero_bits // LIMB_BITS] == 0:
+        zero_bits += LIMB_BITS
+    low_limb = b[zero_bits // LIMB_BITS]
+    zero_bits += (low_limb & -low_limb).bit_length() - 1
+    if zero_bits:
+        a, b = _shr_limbs(a, zero_bits), _shr_limbs(b, zero_bits)
+    if len(b) == 1:
+        quotient, _ = _divmod_small(a, b[0])
+        return quotient
+    k = len(a) - len(b) + 1
+    if k <= 0:
+        return [0]
+    shorter = min(k, len(b))
+    if shorter >= DIVEXACT_BLOCK_THRESHOLD:
+        return _divexact_blocks(a, b, k)
+    if k <= len(b) or shorter < BURNIKEL_ZIEGLER_THRESHOLD:
+        return _divexact_hensel(a, b, k)
+    # Длинное частное при делителе средней длины: рекурсивное деление быстрее
+    quotient, _ = _divmod_limbs(a, b)
+    return quotient
+
+def _radix_power(base, level):
+    """Лимбы числа base^(k·2^level); степени вычисляются один раз и кэшируются."""
+    powers = _RADIX_POWERS.get(base)
+    if powers is None:
+        _, power = _digits_per_limb(base)
+        powers = _RADIX_POWERS[base] = [_mul_small([1], power)]
+    while len(powers) <= level:
+        powers.append(_sqr_limbs(powers[-1]))
+    return powers[level]
+
+def _radix_divmod(limbs, base, level):
+    """
+    Делит число не длиннее 2m лимбов на base^(k·2^level) из m лимбов.
+    Частное оценивается по кэшированной обратной величине Барретта двумя
+    умножениями, поэтому многократные деления на одну степень при печати
+    не требуют полного деления.
+    """
+    divisor = _radix_power(base, level)
+    m = len(divisor)
+    reciprocal = _RADIX_RECIPROCALS.get((base, level))
+    if reciprocal is None:
+        reciprocal, _ = _divmod_limbs(_shl_limbs([1], 2 * m * LIMB_BITS), divisor)
+        _RADIX_RECIPROCALS[(base, level)] = reciprocal
+    quotient = _split_limbs(_mul_limbs(_split_limbs(limbs, m - 1), reciprocal), m + 1)
+    remainder = _sub_limbs(limbs, _mul_limbs(quotient, divisor))
+    while _compare_limbs(remainder, divisor) >= 0:
+        remainder = _sub_limbs(remainder, divisor)
+        quotient = _add_limbs(quotient, [1])
+    return quotient, remainder
+
+def _parse_digits(digits, base):
+    """
+    Переводит строку цифр в лимбы. Для оснований 2^b биты цифр просто
+    укладываются в лимбы. В остальных случаях короткие строки разбираются
+    блоками по k цифр, длинные делятся пополам по степени base^(k·2^i):
+    high·base^(k·2^i) + low.
+    """
+    if base & (base - 1) == 0:
+        bits = base.bit_length() - 1
+        limbs = []
+        accumulator = accumulator_bits = 0
+        for char in reversed(digits):
+            digit = _char_to_int(char)
+            if digit >= base:
+                raise ValueError(f"Цифра '{char.upper()}' недопустима для основания {base}.")
+            accumulator |= digit << accumulator_bits
+            accumulator_bits += bits
+            if accumulator_bits >= LIMB_BITS:
+                limbs.append(accumulator & LIMB_MASK)
+                accumulator >>= LIMB_BITS
+                accumulator_bits -= LIMB_BITS
+        limbs.append(accumulator)
+        return _remove_leading_zeros(limbs)
+
+    k, power = _digits_per_limb(base)
+    if len(digits) <= RADIX_CONVERSION_THRESHOLD * k:
+        limbs = [0]
+        position = 0
+        chunk_len = len(digits) % k or k
+        while position < len(digits):
+            chunk = digits[position:position + chunk_len]
+            chunk_value = 0
+            for char in chunk:
+                digit = _char_to_int(char)
+                if digit >= base:
+                    raise ValueError(f"Цифра '{char.upper()}' недопустима для основания {base}.")
+                chunk_value = chunk_value * base + digit
+            limbs = _mul_small(limbs, base ** len(chunk), chunk_value)
+            position += chunk_len
+            chunk_len = k
+        return limbs
+
+    level = 0
+    while k << (level + 1) < len(digits):
+        level += 1
+    split = len(digits) - (k << level)
+    high = _parse_digits(digits[:split], base)
+    low = _parse_digits(digits[split:], base)
+    return _add_limbs(_mul_limbs(high, _radix_power(base, level)), low)
+
+def _format_digits(limbs, base, width=0):
+    """
+    Переводит лимбы в строку цифр, дополненную нулями слева до width.
+    Для оснований 2^b цифры читаются прямо из бит лимбов. Иначе длинные
+    числа делятся на base^(k·2^i) примерно пополам по длине, и обе части
+    переводятся рекурсивно.
+    """
+    if base & (base - 1) == 0:
+        bits = base.bit_length() - 1
+        chars = []
+        accumulator = accumulator_bits = 0
+        for limb in limbs:
+            accumulator |= limb << accumulator_bits
+            accumulator_bits += LIMB_BITS
+            while accumulator_bits >= bits:
+                chars.append(_int_to_char(accumulator & (base - 1)))
+                accumulator >>= bits
+                accumulator_bits -= bits
+        chars.append(_int_to_char(accumulator))
+        return "".join(reversed(chars)).lstrip("0").rjust(width, "0")
+
+    k, power = _digits_per_limb(base)
+    if len(limbs) <= RADIX_CONVERSION_THRESHOLD:
+        chunks = []
+        while not _is_zero_limbs(limbs):
+            limbs, chunk_value = _divmod_small(limbs, power)
+            chunks.append(chunk_value)
+        parts = []
+        for chunk_value in reversed(chunks):
+            chunk_chars = []
+            while chunk_value:
+                chunk_value, digit = divmod(chunk_value, base)
+                chunk_chars.append(_int_to_char(digit))
+            parts.append("".join(reversed(chunk_chars)).rjust(k, "0"))
+        return "".join(parts).lstrip("0").rjust(width, "0")
+
+    # Наименьшая степень, делящая число примерно пополам по длине
+    level = 0
+    while 2 * len(_radix_power(base, level)) < len(limbs):
+        level += 1
+    high, low = _radix_divmod(limbs, base, level)
+    low_width = k << level
+    high_str = _format_digits(high, base, max(width - low_width, 0))
+    return high_str + _format_digits(low, base, low_width)
+
 class LargeNumber:
+    """
+    Неизменяемое целое число произвольной длины.
+
+    Модуль хранится в массиве лимбов limbs (младший первым), знак - в is_negative.
+    После создания число не меняется, поэтому его можно использовать как ключ
+    словаря или элемент множества, а смена знака не копирует лимбы.
+    Операторы // и % округляют вниз, как у int; функция divide сохраняет
+    прежнее поведение (остаток со знаком делимого).
+    """
+
+    __slots__ = ("limbs", "is_negative")
+
     def __init__(self, value_str: str = "0", base: int = 10):
         if not (2 <= base <= 36):
             raise ValueError("Основание системы счисления должно быть от 2 до 36.")
-        
-        self.is_negative = False
+
+        is_negative = False
         if value_str.startswith('-'):
-            self.is_negative = True
+            is_negative = True
             value_str = value_str[1:]
             if not value_str: # Handle case of "-"
                  raise ValueError("Недопустимое число: '-'")
 
-        self.digits = []
-        for char in reversed(value_str.upper()):
-            digit = _char_to_int(char)
-            if digit >= base:
-                raise ValueError(f"Цифра '{char}' недопустима для основания {base}.")
-            self.digits.append(digit)
-        
-        if not self.digits:
-            self.digits.append(0)
-            
-        _remove_leading_zeros(self.digits)
-
+        limbs = array(_LIMB_TYPECODE, _parse_digits(value_str, base))
+        object.__setattr__(self, "limbs", limbs)
         # Ноль не может быть отрицательным
-        if len(self.digits) == 1 and self.digits[0] == 0:
-            self.is_negative = False
+        object.__setattr__(self, "is_negative", is_negative and not _is_zero_limbs(limbs))
+
+    @classmethod
+    def _from_limbs(cls, limbs, is_negative=False):
+        """Создаёт число напрямую из списка лимбов, минуя разбор строки."""
+        return cls._wrap(array(_LIMB_TYPECODE, _remove_leading_zeros(list(limbs) or [0])), is_negative)
+
+    @classmethod
+    def _wrap(cls, limbs, is_negative):
+        """Создаёт число поверх готового нормализованного массива лимбов без копирования."""
+        number = cls.__new__(cls)
+        object.__setattr__(number, "limbs", limbs)
+        object.__setattr__(number, "is_negative", is_negative and not _is_zero_limbs(limbs))
+        return number
+
+    @classmethod
+    def from_int(cls, value: int) -> "LargeNumber":
+        """Создаёт число из int; небольшие значения берутся из кэша."""
+        cached = _SMALL_NUMBERS.get(value)
+        if cached is not None:
+            return cached
+        return cls._wrap(array(_LIMB_TYPECODE, _int_to_limbs(abs(value))), value < 0)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("LargeNumber неизменяем.")
+
+    def __delattr__(self, name):
+        raise AttributeError("LargeNumber неизменяем.")
+
+    def __reduce__(self):
+        return LargeNumber, (self.to_string(16), 16)
 
     def to_string(self, base: int = 10) -> str:
         if not (2 <= base <= 36):
             raise ValueError("Основание системы счисления должно быть от 2 до 36.")
-        
-        res_str = "".join(_int_to_char(d) for d in reversed(self.digits)) if self.digits else "0"
 
+        res_str = _format_digits(list(self.limbs), base) or "0"
         if self.is_negative and res_str != "0":
             return "-" + res_str
         return res_str
@@ -63,227 +936,726 @@ class LargeNumber:
     def __str__(self):
         return self.to_string(10)
 
+    def __repr__(self):
+        return f"LargeNumber('{self.to_string(10)}')"
+
+    def __int__(self):
+        value = _limbs_to_int(self.limbs)
+        return -value if self.is_negative else value
+
+    # --- Сравнения и хеширование ---
+
+    def _compare(self, other):
+        """-1, 0 или 1 в зависимости от знака self - other."""
+        if self.is_negative != other.is_negative:
+            return -1 if self.is_negative else 1
+        result = _compare_limbs(self.limbs, other.limbs)
+        return -result if self.is_negative else result
+
+    def __eq__(self, other):
+        other = _coerce(other)
+        if other is NotImplemented:
+            return NotImplemented
+        return self.is_negative == other.is_negative and self.limbs == other.limbs
+
+    def __lt__(self, other):
+        other = _coerce(other)
+        return other if other is NotImplemented else self._compare(other) < 0
+
+    def __le__(self, other):
+        other = _coerce(other)
+        return other if other is NotImplemented else self._compare(other) <= 0
+
+    def __gt__(self, other):
+        other = _coerce(other)
+        return other if other is NotImplemented else self._compare(other) > 0
+
+    def __ge__(self, other):
+        other = _coerce(other)
+        return other if other is NotImplemented else self._compare(other) >= 0
+
+    def __hash__(self):
+        # Совпадает с hash(int(self)), так как числа равны соответствующим int
+        value = 0
+        for limb in reversed(self.limbs):
+            value = ((value << LIMB_BITS) | limb) % _HASH_MODULUS
+        if self.is_negative:
+            value = -value
+        return -2 if value == -1 else value
+
+    def __bool__(self):
+        return not _is_zero_limbs(self.limbs)
+
+    # --- Арифметика ---
+
+    def __neg__(self):
+        return LargeNumber._wrap(self.limbs, not self.is_negative)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return LargeNumber._wrap(self.limbs, False) if self.is_negative else self
+
+    def __add__(self, other):
+        other = _coerce(other)
+        return other if other is NotImplemented else add(self, other)
+
+    def __radd__(self, other):
+        other = _coerce(other)
+        return other if other is NotImplemented else add(other, self)
+
+    def __sub__(self, other):
+        other = _coerce(other)
+        return other if other is NotImplemented else subtract(self, other)
+
+    def __rsub__(self, other):
+        other = _coerce(other)
+        return other if other is NotImplemented else subtract(other, self)
+
+    def __mul__(self, other):
+        other = _coerce(other)
+        return other if other is NotImplemented else multiply(self, other)
+
+    def __rmul__(self, other):
+        other = _coerce(other)
+        return other if other is NotImplemented else multiply(other, self)
+
+    def __divmod__(self, other):
+        other = _coerce(other)
+        if other is NotImplemented:
+            return other
+        quotient, remainder = divide(self, other)
+        # divide округляет к нулю; для совместимости с int переходим к округлению вниз
+        if remainder and remainder.is_negative != other.is_negative:
+            quotient = subtract(quotient, ONE)
+            remainder = add(remainder, other)
+        return quotient, remainder
+
+    def __rdivmod__(self, other):
+        other = _coerce(other)
+        return other if other is NotImplemented else divmod(other, self)
+
+    def __floordiv__(self, other):
+        result = self.__divmod__(other)
+        return result if result is NotImplemented else result[0]
+
+    def __rfloordiv__(self, other):
+        other = _coerce(other)
+        return other if other is NotImplemented else divmod(other, self)[0]
+
+    def __mod__(self, other):
+        result = self.__divmod__(other)
+        return result if result is NotImplemented else result[1]
+
+    def __rmod__(self, other):
+        other = _coerce(other)
+        return other if other is NotImplemented else divmod(other, self)[1]
+
+    def __pow__(self, exponent, modulus=None):
+        exponent = _coerce(exponent)
+        if exponent is NotImplemented:
+            return exponent
+        if modulus is None:
+            return power_integer(self, exponent)
+        modulus = _coerce(modulus)
+        if modulus is NotImplemented:
+            return modulus
+        from .modular_arithmetic import mod_power
+        return mod_power(self, exponent, modulus)
+
+    # --- Битовые операции (как у int: отрицательные числа в дополнительном коде) ---
+
+    def bit_length(self) -> int:
+        """Число значащих бит модуля; 0 для нуля."""
+        return 0 if _is_zero_limbs(self.limbs) else _bit_length_limbs(self.limbs)
+
+    def is_even(self) -> bool:
+        return self.limbs[0] & 1 == 0
+
+    def test_bit(self, index: int) -> bool:
+        """Значение бита с номером index (то же, что (x >> index) & 1)."""
+        if index < 0:
+            raise ValueError("Номер бита должен быть неотрицательным.")
+        limbs = _sub_limbs(self.limbs, [1]) if self.is_negative else self.limbs
+        limb_index, bit_index = divmod(index, LIMB_BITS)
+        bit = limb_index < len(limbs) and (limbs[limb_index] >> bit_index) & 1 == 1
+        return bit != self.is_negative
+
+    def low_bits(self, count: int) -> "LargeNumber":
+        """Остаток x mod 2^count (неотрицательный, как x & (2^count - 1))."""
+        if count < 0:
+            raise ValueError("Число бит должно быть неотрицательным.")
+        low = _low_bits_limbs(self.limbs, count)
+        if self.is_negative and not _is_zero_limbs(low):
+            low = _sub_limbs(_shl_limbs([1], count), low)
+        return LargeNumber._from_limbs(low)
+
+    def __lshift__(self, count):
+        if not isinstance(count, int):
+            return NotImplemented
+        if count < 0:
+            raise ValueError("Отрицательный сдвиг.")
+        return LargeNumber._from_limbs(_shl_limbs(self.limbs, count), self.is_negative)
+
+    def __rshift__(self, count):
+        if not isinstance(count, int):
+            return NotImplemented
+        if count < 0:
+            raise ValueError("Отрицательный сдвиг.")
+        if not self.is_negative:
+            return LargeNumber._from_limbs(_shr_limbs(self.limbs, count))
+        # Округление вниз: -x >> k = -(((x - 1) >> k) + 1)
+        shifted = _shr_limbs(_sub_limbs(self.limbs, [1]), count)
+        return LargeNumber._from_limbs(_add_limbs(shifted, [1]), True)
+
+    def __invert__(self):
+        return subtract(-self, ONE)
+
+    def _bitwise(self, other, operation):
+        other = _coerce(other)
+        if other is NotImplemented:
+            return other
+        if not self.is_negative and not other.is_negative:
+            length = min(len(self.limbs), len(other.limbs)) if operation is int.__and__ \
+                else max(len(self.limbs), len(other.limbs))
+            x = list(self.limbs[:length]) + [0] * (length - len(self.limbs))
+            y = list(other.limbs[:length]) + [0] * (length - len(other.limbs))
+            return LargeNumber._from_limbs([operation(p, q) for p, q in zip(x, y)])
+        length = max(len(self.limbs), len(other.limbs)) + 1
+        result = [operation(p, q) for p, q in zip(_twos_complement_limbs(self, length),
+                                                  _twos_complement_limbs(other, length))]
+        if not operation(int(self.is_negative), int(other.is_negative)):
+            return LargeNumber._from_limbs(result)
+        magnitude = _add_limbs(_remove_leading_zeros([limb ^ LIMB_MASK for limb in result]), [1])
+        return LargeNumber._from_limbs(magnitude, True)
+
+    def __and__(self, other):
+        return self._bitwise(other, int.__and__)
+
+    def __or__(self, other):
+        return self._bitwise(other, int.__or__)
+
+    def __xor__(self, other):
+        return self._bitwise(other, int.__xor__)
+
+    __rand__ = __and__
+    __ror__ = __or__
+    __rxor__ = __xor__
+
+def _coerce(value):
+    """Приводит операнд (LargeNumber или int) к LargeNumber."""
+    if isinstance(value, LargeNumber):
+        return value
+    if isinstance(value, int) and not isinstance(value, bool):
+        return LargeNumber.from_int(value)
+    return NotImplemented
+
+_HASH_MODULUS = sys.hash_info.modulus
+
+# Небольшие числа создаются один раз и переиспользуются (см. LargeNumber.from_int).
+_SMALL_NUMBERS = {}
+for _value in range(-16, 257):
+    _SMALL_NUMBERS[_value] = LargeNumber._from_limbs([abs(_value)], _value < 0)
+del _value
+
+ZERO = LargeNumber.from_int(0)
+ONE = LargeNumber.from_int(1)
+TWO = LargeNumber.from_int(2)
+
 def _subtract_abs(num_a, num_b, base=10):
     # Эта функция вычитает абсолютные значения, |num_a| >= |num_b|
-    result_digits = []
-    borrow = 0
-    for i in range(len(num_a.digits)):
-        digit_a = num_a.digits[i]
-        digit_b = num_b.digits[i] if i < len(num_b.digits) else 0
-        diff = digit_a - digit_b - borrow
-        if diff < 0:
-            diff += base
-            borrow = 1
-        else:
-            borrow = 0
-        result_digits.append(diff)
-    result = LargeNumber("0", base)
-    result.digits = _remove_leading_zeros(result_digits)
-    return result
+    return LargeNumber._from_limbs(_sub_limbs(num_a.limbs, num_b.limbs))
 
 def _add_abs(num_a, num_b, base=10):
     # Эта функция складывает абсолютные значения
-    result_digits = []
-    carry = 0
-    max_len = max(len(num_a.digits), len(num_b.digits))
-    for i in range(max_len):
-        digit_a = num_a.digits[i] if i < len(num_a.digits) else 0
-        digit_b = num_b.digits[i] if i < len(num_b.digits) else 0
-        total = digit_a + digit_b + carry
-        result_digits.append(total % base)
-        carry = total // base
-    if carry > 0:
-        result_digits.append(carry)
-    result = LargeNumber("0", base)
-    result.digits = _remove_leading_zeros(result_digits)
-    return result
+    return LargeNumber._from_limbs(_add_limbs(num_a.limbs, num_b.limbs))
 
 def _is_abs_greater_or_equal(num_a, num_b):
     # Сравнивает абсолютные значения
-    len_a = len(num_a.digits)
-    len_b = len(num_b.digits)
-    if len_a != len_b:
-        return len_a > len_b
-    for i in range(len_a - 1, -1, -1):
-        if num_a.digits[i] != num_b.digits[i]:
-            return num_a.digits[i] > num_b.digits[i]
-    return True
+    return _compare_limbs(num_a.limbs, num_b.limbs) >= 0
 
-def add(num_a: LargeNumber, num_b: LargeNumber, base: int = 10) -> LargeNumber:
+# Эталонная реализация на лимбах. Публичные функции (в конце модуля)
+# передают вызов выбранному бэкенду, см. backends.py.
+
+def _from_vector(vector, is_negative):
+    """LargeNumber из результата векторизованного ядра, без промежуточного списка."""
+    return LargeNumber._wrap(vectorized.to_array(vector, _LIMB_TYPECODE), is_negative)
+
+def _add_reference(num_a, num_b):
+    if _use_vectorized(max(len(num_a.limbs), len(num_b.limbs)), VECTORIZE_ARRAY_THRESHOLD):
+        if num_a.is_negative == num_b.is_negative:
+            return _from_vector(vectorized.add_limbs(num_a.limbs, num_b.limbs), num_a.is_negative)
+        if not _is_abs_greater_or_equal(num_a, num_b):
+            num_a, num_b = num_b, num_a
+        return _from_vector(vectorized.sub_limbs(num_a.limbs, num_b.limbs), num_a.is_negative)
     if num_a.is_negative == num_b.is_negative:
-        result = _add_abs(num_a, num_b, base)
-        result.is_negative = num_a.is_negative
-    else:
-        if _is_abs_greater_or_equal(num_a, num_b):
-            result = _subtract_abs(num_a, num_b, base)
-            result.is_negative = num_a.is_negative
+        return LargeNumber._from_limbs(_add_limbs(num_a.limbs, num_b.limbs), num_a.is_negative)
+    if _is_abs_greater_or_equal(num_a, num_b):
+        return LargeNumber._from_limbs(_sub_limbs(num_a.limbs, num_b.limbs), num_a.is_negative)
+    return LargeNumber._from_limbs(_sub_limbs(num_b.limbs, num_a.limbs), num_b.is_negative)
+
+def _subtract_reference(num_a, num_b):
+    return _add_reference(num_a, -num_b)
+
+def _square_reference(num):
+    return LargeNumber._from_limbs(_sqr_limbs(num.limbs))
+
+def _multiply_reference(num_a, num_b):
+    """Умножает два больших числа (Алгоритм 3)."""
+    short, long = sorted((num_a.limbs, num_b.limbs), key=len)
+    if len(short) < KARATSUBA_THRESHOLD and _use_vectorized(len(long), VECTORIZE_ARRAY_THRESHOLD):
+        return _from_vector(vectorized.mul_short(long, short), num_a.is_negative != num_b.is_negative)
+    return LargeNumber._from_limbs(_mul_limbs(num_a.limbs, num_b.limbs),
+                                   num_a.is_negative != num_b.is_negative)
+
+def _divide_reference(num_a, num_b):
+    """Делит два больших числа (A / B), возвращая частное и остаток."""
+    if _is_zero_limbs(num_b.limbs):
+        raise ZeroDivisionError("Деление на ноль.")
+
+    quotient_limbs, remainder_limbs = _divmod_limbs(num_a.limbs, num_b.limbs)
+
+    final_quotient = LargeNumber._from_limbs(quotient_limbs, num_a.is_negative != num_b.is_negative)
+    # Знак остатка обычно совпадает со знаком делимого
+    final_remainder = LargeNumber._from_limbs(remainder_limbs, num_a.is_negative)
+    return final_quotient, final_remainder
+
+def _divide_exact_reference(num_a, num_b):
+    if _is_zero_limbs(num_b.limbs):
+        raise ZeroDivisionError("Деление на ноль.")
+    return LargeNumber._from_limbs(_divexact_limbs(num_a.limbs, num_b.limbs),
+                                   num_a.is_negative != num_b.is_negative)
+
+def _window_size(exp_bits):
+    """Ширина окна для показателя длины exp_bits (минимум умножений на таблицу и в цикле)."""
+    for window, max_bits in enumerate((8, 24, 80, 240, 672, 1792), start=1):
+        if exp_bits <= max_bits:
+            return window
+    return 7
+
+def _sliding_window_power(base_val, exp_limbs, mul, sqr, one):
+    """
+    Возведение в степень скользящим окном (слева направо).
+
+    Биты показателя читаются прямо из его лимбов. Заранее считаются нечётные
+    степени base^1, base^3, ..., base^(2^k - 1); затем каждое окно из не более
+    чем k бит, начинающееся и заканчивающееся единицей, обрабатывается одним
+    умножением на элемент таблицы, а нули между окнами - только возведением
+    в квадрат. mul и sqr задают умножение (например, по модулю).
+    """
+    exp_bits = _bit_length_limbs(exp_limbs)
+    if exp_bits == 0:
+        return one
+
+    def bit(i):
+        return (exp_limbs[i // LIMB_BITS] >> (i % LIMB_BITS)) & 1
+
+    k = _window_size(exp_bits)
+    table = [base_val]
+    if k > 1:
+        base_squared = sqr(base_val)
+        for _ in range((1 << (k - 1)) - 1):
+            table.append(mul(table[-1], base_squared))
+
+    result = None
+    i = exp_bits - 1
+    while i >= 0:
+        if not bit(i):
+            result = sqr(result)
+            i -= 1
+            continue
+        # Окно [j, i]: не длиннее k бит и заканчивается единичным битом
+        j = max(i - k + 1, 0)
+        while not bit(j):
+            j += 1
+        window_value = 0
+        for position in range(i, j - 1, -1):
+            window_value = (window_value << 1) | bit(position)
+        if result is None:
+            result = table[window_value >> 1]
         else:
-            result = _subtract_abs(num_b, num_a, base)
-            result.is_negative = num_b.is_negative
+            for _ in range(i - j + 1):
+                result = sqr(result)
+            result = mul(result, table[window_value >> 1])
+        i = j - 1
     return result
 
+def _power_integer_reference(base_num, exp_num):
+    """Возведение в степень скользящим окном по битам показателя."""
+    if exp_num.is_negative:
+        raise ValueError("Показатель степени должен быть неотрицательным.")
+    return _sliding_window_power(base_num, exp_num.limbs, _multiply_reference,
+                                 _square_reference, ONE)
+
+def _check_root(num, k):
+    if k < 1:
+        raise ValueError("Степень корня должна быть натуральным числом.")
+    if num.is_negative:
+        raise ValueError("Корень из отрицательного числа не определён.")
+
+def _small_root(num, k):
+    """
+    Целая часть корня k-й степени, если он меньше 2^ROOT_BASE_BITS: приближение
+    2^(log2(num) / k) по старшим 64 битам числа точнее единицы, и остаётся
+    поправить его на 1 сравнением степеней.
+    """
+    shift = max(0, num.bit_length() - 64)
+    root = LargeNumber.from_int(int(2 ** ((math.log2(_top_bits(num.limbs, shift)) + shift) / k)))
+    k_num = LargeNumber.from_int(k)
+    while root and _power_integer_reference(root, k_num) > num:
+        root = _subtract_reference(root, ONE)
+    while _power_integer_reference(_add_reference(root, ONE), k_num) <= num:
+        root = _add_reference(root, ONE)
+    return root
+
+def _newton_root_step(num, k, x):
+    """Шаг Ньютона для корня k-й степени: ((k - 1)·x + num // x^(k-1)) // k."""
+    k_minus_1 = LargeNumber.from_int(k - 1)
+    quotient, _ = _divide_reference(num, _power_integer_reference(x, k_minus_1))
+    y, _ = _divide_reference(_add_reference(_multiply_reference(x, k_minus_1), quotient), LargeNumber.from_int(k))
+    return y
+
+def _newton_root_descent(num, k, x):
+    """Итерация Ньютона от приближения сверху x до целой части корня."""
+    while True:
+        y = _newton_root_step(num, k, x)
+        if y >= x:
+            return x
+        x = y
+
+def _iroot_reference(num, k):
+    """
+    Целая часть корня k-й степени методом Ньютона с удвоением точности.
+
+    Короткие корни находятся по машинному приближению (_small_root). Для длинных
+    точность удваивается рекурсивно (как в "карацубовском"
+    квадратном корне Циммермана): корень r из старшей половины бит
+    (num >> k·s) даёт приближение снизу x0 = r·2^s с s верными битами.
+    Шаг Ньютона от x0 записывается как x0 + (num - x0^k) / (k·x0^(k-1)):
+    x0^k = r^k·2^(ks) считается на половинной длине, а частное имеет всего
+    ~s бит, так что деление короткое. Результат не меньше корня и обычно
+    превышает его не больше чем на 1, что исправляется проверкой степенью;
+    если этого мало (большие k), спуск продолжается итерацией Ньютона сверху.
+    """
+    _check_root(num, k)
+    if k == 1 or num.bit_length() < 2:
+        return num
+    if num.bit_length() // k < ROOT_BASE_BITS:
+        return _small_root(num, k)
+    # Корень из старших бит имеет не меньше ROOT_BASE_BITS / 2 бит
+    shift = num.bit_length() // (2 * k)
+    root = _iroot_reference(num >> (k * shift), k)
+    k_num = LargeNumber.from_int(k)
+    root_power = _power_integer_reference(root, LargeNumber.from_int(k - 1))
+    remainder = _subtract_reference(num, _multiply_reference(root_power, root) << (k * shift))
+    correction, _ = _divide_reference(remainder >> ((k - 1) * shift), _multiply_reference(root_power, k_num))
+    x = _add_reference(root << shift, correction)
+    for _ in range(2):
+        if _power_integer_reference(x, k_num) <= num:
+            return x
+        x = _subtract_reference(x, ONE)
+    return _newton_root_descent(num, k, x)
+
+def _signed_from_int(value):
+    """Переводит машинное (небольшое) целое со знаком в пару (is_negative, limbs)."""
+    magnitude = abs(value)
+    limbs = []
+    while magnitude:
+        limbs.append(magnitude & LIMB_MASK)
+        magnitude >>= LIMB_BITS
+    return value < 0, limbs or [0]
+
+def _top_bits(a, shift):
+    """Возвращает a >> shift как машинное целое (используются только старшие лимбы)."""
+    start = shift // LIMB_BITS
+    value = 0
+    for i in range(len(a) - 1, start - 1, -1):
+        value = (value << LIMB_BITS) | a[i]
+    return value >> (shift - start * LIMB_BITS)
+
+def _apply_matrix(t, x, y):
+    """(x, y) -> (t00*x + t01*y, t10*x + t11*y) для чисел со знаком."""
+    t00, t01, t10, t11 = t
+    return (_signed_add(_signed_mul(t00, x), _signed_mul(t01, y)),
+            _signed_add(_signed_mul(t10, x), _signed_mul(t11, y)))
+
+def _is_identity(m):
+    return m[0] == [1] and m[1] == [0] and m[2] == [0] and m[3] == [1]
+
+def _inverse_matrix(m):
+    """Обратная к матрице с неотрицательными элементами и определителем 1."""
+    m00, m01, m10, m11 = m
+    return (False, m11), (not _is_zero_limbs(m01), m01), (not _is_zero_limbs(m10), m10), (False, m00)
+
+def _hgcd_steps(a, b, s, m, stop_bits=0):
+    """
+    Шаги деления, не опускающие числа ниже 2^s: из большего числа вычитается
+    q раз меньшее, где q = floor((большее - 2^s) / меньшее). Останавливается,
+    когда |a - b| < 2^s или оба числа стали не длиннее stop_bits бит.
+    Матрица m = [m00, m01, m10, m11] обновляется так, что исходная пара
+    по-прежнему равна m · (a, b).
+    """
+    power = _shl_limbs([1], s)
+    while max(_bit_length_limbs(a), _bit_length_limbs(b)) > stop_bits:
+        if _compare_limbs(a, b) >= 0:
+            if _bit_length_limbs(_sub_limbs(a, b)) <= s:
+                return a, b
+            q, _ = _divmod_limbs(_sub_limbs(a, power), b)
+            a = _sub_limbs(a, _mul_limbs(q, b))
+            m[1] = _add_limbs(m[1], _mul_limbs(q, m[0]))
+            m[3] = _add_limbs(m[3], _mul_limbs(q, m[2]))
+        else:
+            if _bit_length_limbs(_sub_limbs(b, a)) <= s:
+                return a, b
+            q, _ = _divmod_limbs(_sub_limbs(b, power), a)
+            b = _sub_limbs(b, _mul_limbs(q, a))
+            m[0] = _add_limbs(m[0], _mul_limbs(q, m[1]))
+            m[2] = _add_limbs(m[2], _mul_limbs(q, m[3]))
+    return a, b
+
+def _hgcd_apply(m, a, b):
+    """Вычисляет (a', b') = m^(-1) · (a, b); результат неотрицателен."""
+    (_, new_a), (_, new_b) = _apply_matrix(_inverse_matrix(m), (False, a), (False, b))
+    return new_a, new_b
+
+def _matrix_product(m, r):
+    m00, m01, m10, m11 = m
+    r00, r01, r10, r11 = r
+    return [_add_limbs(_mul_limbs(m00, r00), _mul_limbs(m01, r10)),
+            _add_limbs(_mul_limbs(m00, r01), _mul_limbs(m01, r11)),
+            _add_limbs(_mul_limbs(m10, r00), _mul_limbs(m11, r10)),
+            _add_limbs(_mul_limbs(m10, r01), _mul_limbs(m11, r11))]
+
+def _hgcd(a, b):
+    """
+    Половинный НОД (алгоритм Шёнхаге в формулировке Мёллера).
+
+    Для n-битных a, b находит матрицу m с неотрицательными элементами и
+    определителем 1 и пару (a', b') = m^(-1) · (a, b), в которой
+    a', b' >= 2^s и |a' - b'| < 2^s, s = n // 2 + 1. Матрица собирается
+    из двух рекурсивных вызовов на старших половинах чисел, поэтому
+    сложность O(M(n) log n) вместо O(n^2).
+    """
+    m = [[1], [0], [0], [1]]
+    n = max(_bit_length_limbs(a), _bit_length_limbs(b))
+    s = n // 2 + 1
+    if min(_bit_length_limbs(a), _bit_length_limbs(b)) <= s:
+        return m, a, b
+    if n < HGCD_BASE * LIMB_BITS:
+        a, b = _hgcd_steps(a, b, s, m)
+        return m, a, b
+
+    # Первая половина: редукция старших n/2 бит переносится на полные числа
+    p = n // 2
+    m1, _, _ = _hgcd(_shr_limbs(a, p), _shr_limbs(b, p))
+    if not _is_identity(m1):
+        a, b = _hgcd_apply(m1, a, b)
+        m = m1
+    # Досчитываем шагами деления до ~3n/4 бит, чтобы вторая половина была вдвое короче
+    a, b = _hgcd_steps(a, b, s, m, s + n // 4)
+    larger, smaller = (a, b) if _compare_limbs(a, b) >= 0 else (b, a)
+    if _bit_length_limbs(_sub_limbs(larger, smaller)) <= s:
+        return m, a, b
+
+    # Вторая половина: берутся старшие 2(n2 - s) бит оставшихся чисел
+    n2 = max(_bit_length_limbs(a), _bit_length_limbs(b))
+    p = 2 * s - n2
+    if min(_bit_length_limbs(a), _bit_length_limbs(b)) > p + 2:
+        m2, _, _ = _hgcd(_shr_limbs(a, p), _shr_limbs(b, p))
+        if not _is_identity(m2):
+            a, b = _hgcd_apply(m2, a, b)
+            m = _matrix_product(m, m2)
+    a, b = _hgcd_steps(a, b, s, m)
+    return m, a, b
+
+def _lehmer_step(a, b):
+    """
+    Один шаг Лемера: по старшим 2·LIMB_BITS битам a и b восстанавливается
+    начало последовательности частных Евклида (пока оценки снизу и сверху
+    совпадают), и вся серия применяется к полным числам одной матрицей
+    (A, B, C, D): a' = A·a + B·b, b' = C·a + D·b. Возвращает матрицу
+    или None, если ни одно частное не удалось определить.
+    """
+    shift = _bit_length_limbs(a) - 2 * LIMB_BITS
+    x, y = _top_bits(a, shift), _top_bits(b, shift)
+    coef_a, coef_b, coef_c, coef_d = 1, 0, 0, 1
+    while y + coef_c != 0 and y + coef_d != 0:
+        q = (x + coef_a) // (y + coef_c)
+        if q != (x + coef_b) // (y + coef_d):
+            break
+        coef_a, coef_c = coef_c, coef_a - q * coef_c
+        coef_b, coef_d = coef_d, coef_b - q * coef_d
+        x, y = y, x - q * y
+    if coef_b == 0:
+        return None
+    return tuple(_signed_from_int(v) for v in (coef_a, coef_b, coef_c, coef_d))
+
+def _gcd_limbs(a, b, with_cofactor=False):
+    """
+    НОД модулей a и b. Для очень длинных чисел применяется половинный НОД,
+    затем алгоритм Лемера по старшим битам, короткий остаток доводится
+    обычным алгоритмом Евклида.
+    Если with_cofactor, возвращает также коэффициент u (число со знаком)
+    такой, что u·a ≡ НОД (mod b).
+    """
+    # Коэффициенты при исходном a для текущих a и b
+    u_a, u_b = (False, [1]), (False, [0])
+    if _compare_limbs(a, b) < 0:
+        a, b = b, a
+        u_a, u_b = u_b, u_a
+
+    while not _is_zero_limbs(b):
+        matrix = None
+        if len(b) >= HGCD_THRESHOLD:
+            m, new_a, new_b = _hgcd(a, b)
+            if not _is_identity(m):
+                a, b = new_a, new_b
+                matrix = _inverse_matrix(m)
+        elif _bit_length_limbs(a) > 2 * LIMB_BITS:
+            matrix = _lehmer_step(a, b)
+            if matrix is not None:
+                (_, a), (_, b) = _apply_matrix(matrix, (False, a), (False, b))
+
+        if matrix is not None:
+            if with_cofactor:
+                u_a, u_b = _apply_matrix(matrix, u_a, u_b)
+            if _compare_limbs(a, b) < 0:
+                a, b = b, a
+                u_a, u_b = u_b, u_a
+            continue
+
+        # Обычный шаг Евклида
+        q, r = _divmod_limbs(a, b)
+        a, b = b, r
+        if with_cofactor:
+            u_a, u_b = u_b, _signed_sub(u_a, _signed_mul((False, q), u_b))
+    return a, u_a
+
+def _gcd_reference(a, b):
+    g, _ = _gcd_limbs(a.limbs, b.limbs)
+    return LargeNumber._from_limbs(g)
+
+def _extended_gcd_reference(a, b):
+    """Коэффициент y восстанавливается в конце как (g - a*x) / b."""
+    if _is_zero_limbs(b.limbs):
+        return LargeNumber._from_limbs(a.limbs), LargeNumber._from_limbs([1], a.is_negative), ZERO
+
+    g, (x_negative, x_limbs) = _gcd_limbs(a.limbs, b.limbs, with_cofactor=True)
+    # Коэффициент найден для |a|; для отрицательного a меняем знак
+    x = LargeNumber._from_limbs(x_limbs, x_negative != a.is_negative)
+    g_number = LargeNumber._from_limbs(g)
+    y, _ = _divide_reference(_subtract_reference(g_number, _multiply_reference(a, x)), b)
+    return g_number, x, y
+
+# --- Публичный интерфейс ---
+# Все операции выполняются текущим бэкендом (эталонным, на int или gmpy2).
+# Параметр base у арифметических функций сохранён для совместимости:
+# вычисления не зависят от системы счисления.
+
+def add(num_a: LargeNumber, num_b: LargeNumber, base: int = 10) -> LargeNumber:
+    return backends.get_backend().add(num_a, num_b)
+
 def subtract(num_a: LargeNumber, num_b: LargeNumber, base: int = 10) -> LargeNumber:
-    neg_b = LargeNumber(num_b.to_string(base), base)
-    if neg_b.to_string(base) != "0":
-        neg_b.is_negative = not neg_b.is_negative
-    return add(num_a, neg_b, base)
+    return backends.get_backend().subtract(num_a, num_b)
 
 def multiply(num_a: LargeNumber, num_b: LargeNumber, base: int = 10) -> LargeNumber:
-    """Умножает два больших числа (Алгоритм 3)."""
-    if (len(num_a.digits) == 1 and num_a.digits[0] == 0) or \
-       (len(num_b.digits) == 1 and num_b.digits[0] == 0):
-        return LargeNumber("0", base)
+    """Умножает два больших числа."""
+    return backends.get_backend().multiply(num_a, num_b)
 
-    len_a = len(num_a.digits)
-    len_b = len(num_b.digits)
-    result_digits = [0] * (len_a + len_b)
-
-    for i in range(len_b):
-        carry = 0
-        for j in range(len_a):
-            total = result_digits[i + j] + num_a.digits[j] * num_b.digits[i] + carry
-            result_digits[i + j] = total % base
-            carry = total // base
-        if carry > 0:
-            result_digits[i + len_a] += carry
-
-    result = LargeNumber("0", base)
-    result.digits = _remove_leading_zeros(result_digits)
-    result.is_negative = num_a.is_negative != num_b.is_negative
-    if len(result.digits) == 1 and result.digits[0] == 0:
-        result.is_negative = False
-    return result
+def square(num: LargeNumber) -> LargeNumber:
+    """Вычисляет num^2 (дешевле, чем multiply(num, num))."""
+    return backends.get_backend().square(num)
 
 def divide(num_a: LargeNumber, num_b: LargeNumber, base: int = 10) -> (LargeNumber, LargeNumber):
-    """Делит два больших числа (A / B), возвращая частное и остаток."""
-    if len(num_b.digits) == 1 and num_b.digits[0] == 0:
-        raise ZeroDivisionError("Деление на ноль.")
+    """Делит два больших числа (A / B), возвращая частное и остаток со знаком делимого."""
+    return backends.get_backend().divide(num_a, num_b)
 
-    # Работаем с абсолютными значениями
-    a_abs = LargeNumber(num_a.to_string(base).replace('-', ''), base)
-    b_abs = LargeNumber(num_b.to_string(base).replace('-', ''), base)
-
-    if not _is_abs_greater_or_equal(a_abs, b_abs):
-        return LargeNumber("0", base), LargeNumber(num_a.to_string(base), base)
-
-    quotient_str = ""
-    current_dividend = LargeNumber("0", base)
-    
-    for digit_char in a_abs.to_string(base):
-        current_dividend_str = current_dividend.to_string(base)
-        if current_dividend_str == "0":
-             current_dividend_str = ""
-        current_dividend = LargeNumber(current_dividend_str + digit_char, base)
-        
-        if not _is_abs_greater_or_equal(current_dividend, b_abs):
-            if quotient_str: 
-                quotient_str += "0"
-            continue
-        
-        q_digit = 0
-        low, high = 0, base
-        while low < high:
-            mid = (low + high) // 2
-            if mid == 0: # Avoid infinite loop
-                low = 1
-                continue
-            
-            test_product = multiply(b_abs, LargeNumber(_int_to_char(mid), base), base)
-            if _is_abs_greater_or_equal(current_dividend, test_product):
-                q_digit = mid
-                low = mid + 1
-            else:
-                high = mid
-        
-        quotient_str += _int_to_char(q_digit)
-        subtrahend = multiply(b_abs, LargeNumber(_int_to_char(q_digit), base), base)
-        current_dividend = _subtract_abs(current_dividend, subtrahend, base)
-
-    final_quotient = LargeNumber(quotient_str or "0", base)
-    final_remainder = LargeNumber(current_dividend.to_string(base) or "0", base)
-
-    final_quotient.is_negative = num_a.is_negative != num_b.is_negative
-    if len(final_quotient.digits) == 1 and final_quotient.digits[0] == 0:
-        final_quotient.is_negative = False
-    
-    # Знак остатка обычно совпадает со знаком делимого
-    final_remainder.is_negative = num_a.is_negative
-    if len(final_remainder.digits) == 1 and final_remainder.digits[0] == 0:
-        final_remainder.is_negative = False
-        
-    return final_quotient, final_remainder
+def divide_exact(num_a: LargeNumber, num_b: LargeNumber) -> LargeNumber:
+    """
+    Частное A / B, когда заранее известно, что A делится на B (например,
+    N / n_i в КТО). Быстрее divide, так как остаток не вычисляется;
+    если A на B не делится, результат не определён.
+    """
+    return backends.get_backend().divide_exact(num_a, num_b)
 
 def power_integer(base_num: LargeNumber, exp_num: LargeNumber) -> LargeNumber:
+    """Вычисляет base_num ^ exp_num для больших чисел."""
+    return backends.get_backend().power_integer(base_num, exp_num)
+
+def isqrt(num: LargeNumber) -> LargeNumber:
+    """Целая часть квадратного корня из неотрицательного числа."""
+    return backends.get_backend().iroot(num, 2)
+
+def iroot(num: LargeNumber, k: int) -> LargeNumber:
+    """Целая часть корня k-й степени (k >= 1) из неотрицательного числа."""
+    return backends.get_backend().iroot(num, k)
+
+def _exponent_candidates(limit):
+    """Простые числа до limit (из таблицы решета): показатели, которые нужно проверить."""
+    return sieve.primes_up_to(limit)
+
+# Квадраты по модулю 64: быстрый отсев чисел, не являющихся квадратами
+_SQUARES_MOD_64 = frozenset(i * i % 64 for i in range(64))
+# Показатель p -> простые q = 2jp + 1 для отсева по вычетам p-х степеней
+_POWER_RESIDUE_MODULI = {}
+
+def _power_residue_moduli(p, count=3):
+    """
+    Несколько простых q ≡ 1 (mod p). Вычет p-й степени по модулю q равен нулю
+    или удовлетворяет x^((q-1)/p) = 1, а это лишь доля 1/p всех вычетов.
     """
-    Вычисляет base_num ^ exp_num для больших чисел.
-    Использует алгоритм бинарного возведения в степень.
-    """
-    base = 10 # Внутренняя база для операций
-    one = LargeNumber("1", base)
-    two = LargeNumber("2", base)
-
-    res = LargeNumber("1", base)
-    
-    b = LargeNumber(base_num.to_string(base), base)
-    e = LargeNumber(exp_num.to_string(base), base)
-    
-    while e.to_string(base) != "0":
-        _, rem = divide(e, two, base)
-        if rem.to_string(base) == "1":
-            res = multiply(res, b, base)
-        b = multiply(b, b, base)
-        e, _ = divide(e, two, base)
-        
-    return res
+    moduli = _POWER_RESIDUE_MODULI.get(p)
+    if moduli is None:
+        moduli = []
+        q = 2 * p + 1
+        while len(moduli) < count:
+            if all(q % d for d in range(2, math.isqrt(q) + 1)):
+                moduli.append(q)
+            q += 2 * p
+        _POWER_RESIDUE_MODULI[p] = moduli
+    return moduli
+
+def perfect_power(num: LargeNumber):
+    """
+    Если num = r^k для num >= 2 и k >= 2, возвращает (r, k) с наибольшим k,
+    иначе None. Перебираются только простые показатели p <= log2(num):
+    чётное число может быть p-й степенью, только если p делит число его
+    младших нулевых бит. Остальные кандидаты отсеиваются по вычетам p-х
+    степеней по малым простым модулям, и лишь затем извлекается корень.
+    """
+    if num.is_negative or num.bit_length() < 2:
+        return None
+    trailing_zeros = (num & -num).bit_length() - 1
+    for p in _exponent_candidates(num.bit_length()):
+        if trailing_zeros and trailing_zeros % p:
+            continue
+        if p == 2 and int(num.low_bits(6)) not in _SQUARES_MOD_64:
+            continue
+        if any(pow(_divmod_small(num.limbs, q)[1], (q - 1) // p, q) > 1 for q in _power_residue_moduli(p)):
+            continue
+        root = iroot(num, p)
+        if power_integer(root, LargeNumber.from_int(p)) == num:
+            inner = perfect_power(root)
+            if inner is None:
+                return root, p
+            return inner[0], inner[1] * p
+    return None
+
+def is_perfect_power(num: LargeNumber) -> bool:
+    """Является ли num >= 2 точной степенью r^k при k >= 2."""
+    return perfect_power(num) is not None
 
 def gcd(a: LargeNumber, b: LargeNumber) -> LargeNumber:
     """Вычисляет наибольший общий делитель (НОД) для двух больших чисел."""
-    base = 10
-    zero = LargeNumber("0", base)
-    
-    # Работаем с абсолютными значениями
-    a_abs = LargeNumber(a.to_string(base).replace('-', ''), base)
-    b_abs = LargeNumber(b.to_string(base).replace('-', ''), base)
-
-    while b_abs.to_string(base) != zero.to_string(base):
-        _, remainder = divide(a_abs, b_abs, base)
-        a_abs = b_abs
-        b_abs = remainder
-        
-    return a_abs 
+    return backends.get_backend().gcd(a, b)
 
 def extended_gcd(a: LargeNumber, b: LargeNumber) -> (LargeNumber, LargeNumber, LargeNumber):
     """
     Выполняет расширенный алгоритм Евклида.
-    Возвращает (g, x, y), где g = НОД(a, b) и a*x + b*y = g.
-    """
-    base = 10
-    zero = LargeNumber("0", base)
-    one = LargeNumber("1", base)
-
-    # Инициализация коэффициентов Безу
-    x, last_x = LargeNumber("0", base), LargeNumber("1", base)
-    y, last_y = LargeNumber("1", base), LargeNumber("0", base)
-
-    # Алгоритм работает с копиями, чтобы не изменять оригинальные числа
-    a_copy = LargeNumber(a.to_string(base), base)
-    b_copy = LargeNumber(b.to_string(base), base)
-
-    while b_copy.to_string(base) != "0":
-        quotient, remainder = divide(a_copy, b_copy, base)
-        
-        a_copy, b_copy = b_copy, remainder
-
-        # Обновляем коэффициенты x
-        temp_x = x
-        x = subtract(last_x, multiply(quotient, x, base), base)
-        last_x = temp_x
-
-        # Обновляем коэффициенты y
-        temp_y = y
-        y = subtract(last_y, multiply(quotient, y, base), base)
-        last_y = temp_y
-        
-    # a_copy теперь содержит НОД
-    # last_x и last_y - коэффициенты Безу
-    return a_copy, last_x, last_y 
\ No newline at end of file
+    Возвращает (g, x, y), где g = НОД(a, b) >= 0 и a*x + b*y = g.
+    """
+    return backends.get_backend().extended_gcd(a, b)
+
+# Импорт в конце модуля: backends сам использует LargeNumber и эталонные функции.
+from . import backends
@@ -0,0 +1,75 @@
+from functools import lru_cache
+
+from .long_arithmetic import (LargeNumber, LIMB_BITS, _mul_limbs, _sqr_limbs, _divmod_limbs,
+                              _add_limbs, _sub_limbs, _shl_limbs, _compare_limbs,
+                              _split_limbs, _is_zero_limbs)
+
+class ModulusContext:
+    """
+    Контекст многократной редукции по фиксированному модулю n (метод Барретта).
+
+    Один раз вычисляется константа mu = floor(B^(2k) / n), где B = 2^LIMB_BITS,
+    k - число лимбов n. После этого остаток x mod n для x < B^(2k) находится
+    двумя умножениями и не более чем двумя вычитаниями, без деления.
+    В отличие от метода Монтгомери, подходит и для чётных модулей.
+    Все методы возвращают вычеты в диапазоне [0, n).
+    """
+
+    def __init__(self, modulus: LargeNumber):
+        if modulus.is_negative or _is_zero_limbs(modulus.limbs):
+            raise ValueError("Модуль должен быть положительным числом.")
+        self.modulus = modulus
+        self._n = list(modulus.limbs)
+        self._k = len(self._n)
+        self._mu, _ = _divmod_limbs(_shl_limbs([1], 2 * self._k * LIMB_BITS), self._n)
+
+    def _reduce_limbs(self, x):
+        """Остаток от деления модуля x на n."""
+        n, k = self._n, self._k
+        if _compare_limbs(x, n) < 0:
+            return list(x)
+        if len(x) > 2 * k:
+            _, remainder = _divmod_limbs(x, n)
+            return remainder
+        # Оценка частного: q = ((x >> (k-1) лимбов) * mu) >> (k+1) лимбов,
+        # она меньше точного частного не более чем на 2.
+        q = _split_limbs(_mul_limbs(_split_limbs(x, k - 1), self._mu), k + 1)
+        remainder = _sub_limbs(x, _mul_limbs(q, n))
+        while _compare_limbs(remainder, n) >= 0:
+            remainder = _sub_limbs(remainder, n)
+        return remainder
+
+    def reduce(self, x: LargeNumber) -> LargeNumber:
+        """Возвращает x mod n в диапазоне [0, n), в том числе для отрицательных x."""
+        remainder = self._reduce_limbs(x.limbs)
+        if x.is_negative and not _is_zero_limbs(remainder):
+            remainder = _sub_limbs(self._n, remainder)
+        return LargeNumber._from_limbs(remainder)
+
+    def mulmod(self, x: LargeNumber, y: LargeNumber) -> LargeNumber:
+        """Возвращает x * y mod n."""
+        product = LargeNumber._from_limbs(_mul_limbs(x.limbs, y.limbs), x.is_negative != y.is_negative)
+        return self.reduce(product)
+
+    def sqrmod(self, x: LargeNumber) -> LargeNumber:
+        """Возвращает x^2 mod n."""
+        return LargeNumber._from_limbs(self._reduce_limbs(_sqr_limbs(x.limbs)))
+
+    def addmod(self, x: LargeNumber, y: LargeNumber) -> LargeNumber:
+        """Возвращает x + y mod n."""
+        if x.is_negative or y.is_negative:
+            x, y = self.reduce(x), self.reduce(y)
+        return LargeNumber._from_limbs(self._reduce_limbs(_add_limbs(x.limbs, y.limbs)))
+
+@lru_cache(maxsize=32)
+def _cached_context(modulus_limbs):
+    return ModulusContext(LargeNumber._from_limbs(modulus_limbs))
+
+def get_modulus_context(modulus: LargeNumber) -> ModulusContext:
+    """
+    Возвращает контекст для модуля из небольшого LRU-кэша, чтобы повторные
+    вызовы с теми же p, q или N не пересчитывали константу Барретта.
+    """
+    if modulus.is_negative:
+        raise ValueError("Модуль должен быть положительным числом.")
+    return _cached_context(tuple(modulus.limbs))
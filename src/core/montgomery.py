@@ -0,0 +1,102 @@
+from functools import lru_cache
+
+from .long_arithmetic import (LargeNumber, LIMB_BITS, LIMB_MASK, divide,
+                              _mul_limbs, _sqr_limbs, _divmod_limbs, _shl_limbs, _sub_limbs,
+                              _compare_limbs, _remove_leading_zeros)
+
+def _inverse_mod_limb_base(odd_limb):
+    """
+    Обратный к нечётному лимбу по модулю 2^LIMB_BITS (итерация Ньютона-Гензеля:
+    каждый шаг x = x * (2 - a * x) удваивает число верных младших бит).
+    """
+    inverse = 1
+    correct_bits = 1
+    while correct_bits < LIMB_BITS:
+        inverse = (inverse * (2 - odd_limb * inverse)) & LIMB_MASK
+        correct_bits *= 2
+    return inverse
+
+class MontgomeryContext:
+    """
+    Контекст умножения Монтгомери по фиксированному нечётному модулю n.
+
+    Число x хранится в форме Монтгомери x·R mod n, где R = B^k, B = 2^LIMB_BITS,
+    k - число лимбов модуля. Произведение двух таких чисел приводится обратно
+    в форму Монтгомери редукцией REDC, которая делит на R вместо деления на n:
+    достаточно сдвигов и умножений на лимбы модуля.
+    Константы (n' = -n^(-1) mod B, R mod n, R^2 mod n) считаются один раз.
+    """
+
+    def __init__(self, modulus: LargeNumber):
+        if modulus.is_negative or modulus.limbs[0] % 2 == 0:
+            raise ValueError("Модуль для метода Монтгомери должен быть нечётным положительным числом.")
+        self.modulus = modulus
+        self._n = list(modulus.limbs)
+        self._k = len(self._n)
+        self._n_prime = -_inverse_mod_limb_base(self._n[0]) & LIMB_MASK
+        _, self._r_mod_n = _divmod_limbs(_shl_limbs([1], self._k * LIMB_BITS), self._n)
+        _, self._r2_mod_n = _divmod_limbs(_shl_limbs([1], 2 * self._k * LIMB_BITS), self._n)
+
+    def _redc(self, t):
+        """Возвращает t·R^(-1) mod n для 0 <= t < n·R."""
+        n, k, n_prime = self._n, self._k, self._n_prime
+        t = list(t) + [0] * (2 * k + 1 - len(t))
+        for i in range(k):
+            # m подбирается так, чтобы младший лимб t + m·n·B^i обнулился
+            m = (t[i] * n_prime) & LIMB_MASK
+            if m == 0:
+                continue
+            carry = 0
+            for j in range(k):
+                total = t[i + j] + m * n[j] + carry
+                t[i + j] = total & LIMB_MASK
+                carry = total >> LIMB_BITS
+            index = i + k
+            while carry:
+                total = t[index] + carry
+                t[index] = total & LIMB_MASK
+                carry = total >> LIMB_BITS
+                index += 1
+        result = _remove_leading_zeros(t[k:])
+        if _compare_limbs(result, n) >= 0:
+            result = _sub_limbs(result, n)
+        return result
+
+    def _mul(self, x, y):
+        return self._redc(_mul_limbs(x, y))
+
+    def one(self) -> LargeNumber:
+        """Единица в форме Монтгомери (R mod n)."""
+        return LargeNumber._from_limbs(self._r_mod_n)
+
+    def to_montgomery(self, x: LargeNumber) -> LargeNumber:
+        """Переводит x в форму Монтгомери: x·R mod n."""
+        _, reduced = divide(x, self.modulus)
+        if reduced.is_negative:
+            reduced = LargeNumber._from_limbs(_sub_limbs(self._n, reduced.limbs))
+        return LargeNumber._from_limbs(self._mul(reduced.limbs, self._r2_mod_n))
+
+    def from_montgomery(self, x: LargeNumber) -> LargeNumber:
+        """Переводит число из формы Монтгомери в обычный вычет x mod n."""
+        return LargeNumber._from_limbs(self._redc(x.limbs))
+
+    def multiply(self, x: LargeNumber, y: LargeNumber) -> LargeNumber:
+        """Произведение чисел в форме Монтгомери: x·y·R^(-1) mod n."""
+        return LargeNumber._from_limbs(self._mul(x.limbs, y.limbs))
+
+    def square(self, x: LargeNumber) -> LargeNumber:
+        """Квадрат числа в форме Монтгомери: x^2·R^(-1) mod n."""
+        return LargeNumber._from_limbs(self._redc(_sqr_limbs(x.limbs)))
+
+@lru_cache(maxsize=32)
+def _cached_context(modulus_limbs):
+    return MontgomeryContext(LargeNumber._from_limbs(modulus_limbs))
+
+def get_montgomery_context(modulus: LargeNumber) -> MontgomeryContext:
+    """
+    Возвращает контекст для нечётного модуля из небольшого LRU-кэша, чтобы
+    повторные возведения в степень по тому же модулю не пересчитывали n' и R^2 mod n.
+    """
+    if modulus.is_negative or modulus.limbs[0] % 2 == 0:
+        raise ValueError("Модуль для метода Монтгомери должен быть нечётным положительным числом.")
+    return _cached_context(tuple(modulus.limbs))
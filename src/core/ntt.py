@@ -0,0 +1,171 @@
+"""
+Теоретико-числовое преобразование (NTT) для умножения очень длинных чисел.
+
+Свёртка двух последовательностей лимбов считается по модулю трёх простых
+вида c·2^k + 1, меньших 2^31, после чего коэффициенты восстанавливаются
+по китайской теореме об остатках (схема Гарнера). Бабочки векторизованы
+с помощью NumPy, если он установлен; иначе используется реализация на
+чистом Python с той же схемой.
+"""
+
+try:
+    import numpy as np
+except ImportError:  # NumPy не обязателен
+    np = None
+
+# (простое p, первообразный корень g, максимальная степень двойки, делящая p - 1)
+_PRIMES = (
+    (2013265921, 31, 27),
+    (469762049, 3, 26),
+    (754974721, 11, 24),
+)
+
+# Наибольшая длина свёртки, которую поддерживают все три простых.
+MAX_LENGTH = 1 << min(k for _, _, k in _PRIMES)
+
+# Произведение модулей (~2^89) покрывает коэффициенты свёртки
+# n·(2^30)^2 при n <= MAX_LENGTH.
+_P1, _P2, _P3 = (p for p, _, _ in _PRIMES)
+_P1_INV_MOD_P2 = pow(_P1, -1, _P2)
+_P12_INV_MOD_P3 = pow(_P1 * _P2, -1, _P3)
+_P1_MOD_P3 = _P1 % _P3
+_P12 = _P1 * _P2
+
+def has_numpy() -> bool:
+    """Доступна ли векторизованная реализация."""
+    return np is not None
+
+def _transform_size(length):
+    size = 1
+    while size < length:
+        size <<= 1
+    return size
+
+def _bit_reverse_permutation(size):
+    bits = size.bit_length() - 1
+    rev = [0] * size
+    for i in range(1, size):
+        rev[i] = (rev[i >> 1] >> 1) | ((i & 1) << (bits - 1))
+    return rev
+
+# --- Реализация на NumPy ---
+
+def _stage_twiddles_np(root, half, p):
+    """Степени root^0 .. root^(half-1) по модулю p."""
+    twiddles = np.ones(half, dtype=np.uint64)
+    length = 1
+    while length < half:
+        step = pow(root, length, p)
+        twiddles[length:2 * length] = twiddles[:length] * np.uint64(step) % np.uint64(p)
+        length *= 2
+    return twiddles
+
+def _ntt_np(values, p, g, invert):
+    size = values.shape[0]
+    p_np = np.uint64(p)
+    values = values[np.array(_bit_reverse_permutation(size), dtype=np.int64)]
+    half = 1
+    while half < size:
+        root = pow(g, (p - 1) // (2 * half), p)
+        if invert:
+            root = pow(root, -1, p)
+        twiddles = _stage_twiddles_np(root, half, p)
+        blocks = values.reshape(-1, 2 * half)
+        u = blocks[:, :half].copy()
+        v = blocks[:, half:] * twiddles % p_np
+        blocks[:, :half] = (u + v) % p_np
+        blocks[:, half:] = (u + p_np - v) % p_np
+        values = blocks.reshape(-1)
+        half *= 2
+    if invert:
+        values = values * np.uint64(pow(size, -1, p)) % p_np
+    return values
+
+def _convolve_mod_np(a, b, size, p, g):
+    """Свёртка по модулю p; b = None означает свёртку a с собой (одно прямое преобразование)."""
+    fa = np.zeros(size, dtype=np.uint64)
+    fa[:len(a)] = a
+    fa = _ntt_np(fa, p, g, False)
+    if b is None:
+        fb = fa
+    else:
+        fb = np.zeros(size, dtype=np.uint64)
+        fb[:len(b)] = b
+        fb = _ntt_np(fb, p, g, False)
+    return _ntt_np(fa * fb % np.uint64(p), p, g, True)
+
+def _convolve_np(a, b, length):
+    size = _transform_size(length)
+    r1, r2, r3 = (_convolve_mod_np(a, b, size, p, g)[:length] for p, g, _ in _PRIMES)
+    # Схема Гарнера: x = r1 + p1·t2 + p1·p2·t3
+    p2, p3 = np.uint64(_P2), np.uint64(_P3)
+    t2 = (r2 + p2 - r1 % p2) % p2 * np.uint64(_P1_INV_MOD_P2) % p2
+    x12_mod_p3 = (r1 % p3 + np.uint64(_P1_MOD_P3) * t2 % p3) % p3
+    t3 = (r3 + p3 - x12_mod_p3) % p3 * np.uint64(_P12_INV_MOD_P3) % p3
+    return [x1 + _P1 * x2 + _P12 * x3
+            for x1, x2, x3 in zip(r1.tolist(), t2.tolist(), t3.tolist())]
+
+# --- Реализация на чистом Python ---
+
+def _ntt_py(values, p, g, invert):
+    size = len(values)
+    rev = _bit_reverse_permutation(size)
+    values = [values[i] for i in rev]
+    half = 1
+    while half < size:
+        root = pow(g, (p - 1) // (2 * half), p)
+        if invert:
+            root = pow(root, -1, p)
+        twiddles = [1] * half
+        for j in range(1, half):
+            twiddles[j] = twiddles[j - 1] * root % p
+        for start in range(0, size, 2 * half):
+            for j in range(half):
+                u = values[start + j]
+                v = values[start + j + half] * twiddles[j] % p
+                values[start + j] = (u + v) % p
+                values[start + j + half] = (u - v) % p
+        half *= 2
+    if invert:
+        size_inv = pow(size, -1, p)
+        values = [x * size_inv % p for x in values]
+    return values
+
+def _convolve_py(a, b, length):
+    size = _transform_size(length)
+    residues = []
+    for p, g, _ in _PRIMES:
+        fa = _ntt_py(list(a) + [0] * (size - len(a)), p, g, False)
+        fb = fa if b is None else _ntt_py(list(b) + [0] * (size - len(b)), p, g, False)
+        residues.append(_ntt_py([x * y % p for x, y in zip(fa, fb)], p, g, True)[:length])
+    result = []
+    for r1, r2, r3 in zip(*residues):
+        t2 = (r2 - r1) * _P1_INV_MOD_P2 % _P2
+        x12 = r1 + _P1 * t2
+        t3 = (r3 - x12) * _P12_INV_MOD_P3 % _P3
+        result.append(x12 + _P12 * t3)
+    return result
+
+def convolve(a, b):
+    """
+    Точная свёртка последовательностей неотрицательных чисел меньше 2^30:
+    c[k] = сумма a[i]·b[k-i]. Возвращает список Python int длины len(a) + len(b) - 1.
+    """
+    length = len(a) + len(b) - 1
+    if length > MAX_LENGTH:
+        raise ValueError("Слишком длинные операнды для NTT.")
+    if np is not None:
+        return _convolve_np(a, b, length)
+    return _convolve_py(a, b, length)
+
+def square(a):
+    """
+    Свёртка a с собой (коэффициенты квадрата числа). Прямое преобразование
+    по каждому модулю выполняется один раз вместо двух.
+    """
+    length = 2 * len(a) - 1
+    if length > MAX_LENGTH:
+        raise ValueError("Слишком длинные операнды для NTT.")
+    if np is not None:
+        return _convolve_np(a, None, length)
+    return _convolve_py(a, None, length)
@@ -0,0 +1,76 @@
+"""
+Параллельный поиск "кто первый": несколько независимых попыток одной
+функции в процессах concurrent.futures.ProcessPoolExecutor.
+
+Используется генераторами простых чисел (primality) и методом
+эллиптических кривых (factorization): каждая попытка случайна, и нужен
+лишь первый успешный результат.
+"""
+
+import multiprocessing
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from . import backends
+
+# Событие остановки параллельного поиска; задаётся только в процессах-исполнителях
+_stop_event = None
+
+class SearchCancelled(Exception):
+    """Поиск прерван: другой процесс уже нашёл результат."""
+
+def check_cancelled():
+    """Прерывает поиск в процессе-исполнителе, если результат уже найден."""
+    if _stop_event is not None and _stop_event.is_set():
+        raise SearchCancelled
+
+def _init_worker(stop_event):
+    global _stop_event
+    _stop_event = stop_event
+
+def _run_search(function, args, seed, backend_name):
+    """Одна независимая попытка в процессе-исполнителе; None, если её остановили."""
+    random.seed(seed)
+    backends.set_backend(backend_name)
+    try:
+        return function(*args)
+    except SearchCancelled:
+        return None
+
+def worker_count(workers):
+    """Число процессов: None - по числу процессоров."""
+    if workers is None:
+        return os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("Число процессов должно быть положительным.")
+    return workers
+
+def first_result(function, args, workers):
+    """
+    Запускает workers независимых попыток function(*args) в отдельных процессах
+    и возвращает первый результат, отличный от None (None, если такого нет).
+
+    Каждый процесс получает своё зерно random из системного источника (при fork
+    дочерние процессы иначе унаследовали бы одно и то же состояние генератора)
+    и текущий бэкенд арифметики. Как только результат найден, общее событие
+    останавливает остальные попытки при следующем вызове check_cancelled.
+    """
+    context = multiprocessing.get_context()
+    stop_event = context.Event()
+    seeds = random.SystemRandom()
+    backend_name = backends.get_backend().name
+    with ProcessPoolExecutor(workers, mp_context=context, initializer=_init_worker,
+                             initargs=(stop_event,)) as executor:
+        futures = [executor.submit(_run_search, function, args, seeds.getrandbits(64), backend_name)
+                   for _ in range(workers)]
+        try:
+            for future in as_completed(futures):
+                result = future.result()
+                if result is not None:
+                    return result
+        finally:
+            stop_event.set()
+            for future in futures:
+                future.cancel()
+    return None
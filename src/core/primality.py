@@ -1,7 +1,36 @@
+import itertools
 import math
 import random
-from .long_arithmetic import LargeNumber, add, subtract, multiply, divide, power_integer, gcd
-from .modular_arithmetic import mod_power
+from collections import Counter
+
+from . import prime_table, sieve
+from .factor_cache import get_factor_cache
+from .parallel import check_cancelled, first_result, worker_count
+from .long_arithmetic import (LargeNumber, ONE, TWO, add, subtract, multiply, divide, divide_exact,
+                              gcd, isqrt, square)
+from .modular_arithmetic import mod_power, modulus_context, jacobi_symbol
+
+# Простые меньше 100: пробные деления перед вероятностными тестами
+_SMALL_PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47,
+                 53, 59, 61, 67, 71, 73, 79, 83, 89, 97)
+# Основания Миллера-Рабина, дающие точный ответ для всех n < 3.18·10^23 (в частности, n < 2^64)
+_DETERMINISTIC_BASES = _SMALL_PRIMES[:12]
+
+# Доступные тесты простоты: имя -> название для интерфейса
+PRIMALITY_TESTS = {
+    "miller_rabin": "Миллер-Рабин",
+    "baillie_psw": "Бэйли-PSW",
+    "solovay_strassen": "Ферма + Соловей-Штрассен",
+}
+DEFAULT_PRIMALITY_TEST = "miller_rabin"
+
+# Решето кандидатов в generate_prime: число малых нечётных простых, по которым
+# отсеиваются кандидаты, и число нечётных кандидатов в одном окне решета
+SIEVE_PRIME_COUNT = 2000
+SIEVE_WINDOW = 4096
+# generate_small_primes выбирает из таблицы решета все простые нужной длины,
+# если они не превышают этой границы, иначе проверяет случайные кандидаты
+SMALL_PRIME_TABLE_LIMIT = 1 << 20
 
 def legendre_symbol(a, p):
     """
@@ -9,17 +38,14 @@ def legendre_symbol(a, p):
     Возвращает 1, -1 или 0.
     """
     base = 10
-    one = LargeNumber("1", base)
-    two = LargeNumber("2", base)
-    
-    p_minus_1 = subtract(p, one, base)
-    exponent, _ = divide(p_minus_1, two, base)
+    p_minus_1 = subtract(p, ONE, base)
+    exponent = p_minus_1 >> 1
     
     result_large_num = mod_power(a, exponent, p)
     
-    if result_large_num.to_string(base) == "1":
+    if result_large_num == ONE:
         return 1
-    elif result_large_num.to_string(base) == subtract(p, one, base).to_string(base):
+    elif result_large_num == p_minus_1:
         return -1
     else:
         return 0
@@ -27,27 +53,28 @@ def legendre_symbol(a, p):
 def is_fermat_prime(p, k):
     """Тест Ферма на простоту. k - количество раундов."""
     base = 10
-    one = LargeNumber("1", base)
-    two = LargeNumber("2", base)
-    p_minus_1 = subtract(p, one, base)
+    p_minus_1 = subtract(p, ONE, base)
     
     for _ in range(k):
-        p_minus_2_str = subtract(p, two, base).to_string(base)
+        p_minus_2_str = subtract(p, TWO, base).to_string(base)
         if int(p_minus_2_str) < 2: return True
         b_str = str(random.randint(2, int(p_minus_2_str)))
         b = LargeNumber(b_str, base)
         
-        if mod_power(b, p_minus_1, p).to_string(base) != "1":
+        if mod_power(b, p_minus_1, p) != ONE:
             return False
     return True
 
 def is_solovay_strassen_prime(p, k):
-    """Тест Соловея-Штрассена на простоту. k - количество раундов."""
+    """
+    Тест Соловея-Штрассена на простоту. k - количество раундов.
+    Символ Якоби считается алгоритмом типа Евклида, без второго возведения в степень.
+    """
     base = 10
-    one = LargeNumber("1", base)
-    two = LargeNumber("2", base)
-    p_minus_1 = subtract(p, one, base)
-    exponent, _ = divide(p_minus_1, two, base)
+    if p.is_even():
+        return p == TWO
+    p_minus_1 = subtract(p, ONE, base)
+    exponent = p_minus_1 >> 1
 
     for _ in range(k):
         p_minus_1_int = int(p_minus_1.to_string(base))
@@ -58,21 +85,150 @@ def is_solovay_strassen_prime(p, k):
         
         r = mod_power(b, exponent, p)
         
-        if r.to_string(base) != "1" and r.to_string(base) != p_minus_1.to_string(base):
+        if r != ONE and r != p_minus_1:
             return False
             
-        s = legendre_symbol(b, p)
+        s = jacobi_symbol(b, p)
         
         if s == 1:
-            s_large = LargeNumber("1", base)
+            s_large = ONE
         else:
-            s_large = subtract(p, one, base)
+            s_large = p_minus_1
         
-        if r.to_string(base) != s_large.to_string(base):
+        if r != s_large:
             return False
     
     return True
 
+def _check_small_primes(n):
+    """
+    Пробные деления на простые меньше 100: True/False, если ответ уже
+    известен, иначе None.
+    """
+    if n < TWO:
+        return False
+    for q in _SMALL_PRIMES:
+        if n == q:
+            return True
+        if not n % q:
+            return False
+    return None
+
+def _is_strong_probable_prime(n, a, d, s, context):
+    """
+    Сильная проверка по основанию a для n - 1 = d·2^s, d нечётно:
+    a^d ≡ 1 или a^(d·2^r) ≡ -1 (mod n) для некоторого 0 <= r < s.
+    context - контекст модуля n текущего бэкенда, общий для всех оснований.
+    """
+    n_minus_1 = subtract(n, ONE)
+    x = mod_power(a, d, n)
+    if x == ONE or x == n_minus_1:
+        return True
+    for _ in range(s - 1):
+        x = context.sqrmod(x)
+        if x == n_minus_1:
+            return True
+        if x == ONE:
+            return False
+    return False
+
+def _split_power_of_two(m):
+    """m = d·2^s с нечётным d; возвращает (d, s)."""
+    s = (m & -m).bit_length() - 1
+    return m >> s, s
+
+def is_miller_rabin_prime(p, k):
+    """
+    Тест Миллера-Рабина. Для p < 2^64 проверяются фиксированные основания
+    (первые 12 простых), и ответ точен; для больших p - k случайных оснований,
+    вероятность ошибки не больше 4^(-k).
+    """
+    known = _check_small_primes(p)
+    if known is not None:
+        return known
+    d, s = _split_power_of_two(subtract(p, ONE))
+    if p.bit_length() <= 64:
+        bases = _DETERMINISTIC_BASES
+    else:
+        bases = [random.randint(2, int(p) - 2) for _ in range(k)]
+    context = modulus_context(p)
+    return all(_is_strong_probable_prime(p, LargeNumber.from_int(a), d, s, context) for a in bases)
+
+def _is_strong_lucas_prime(n):
+    """
+    Сильный тест Люка с параметрами Селфриджа: D - первое из 5, -7, 9, -11, ...
+    с символом Якоби (D/n) = -1, P = 1, Q = (1 - D)/4. Для n + 1 = d·2^s
+    простое n удовлетворяет U_d ≡ 0 или V_(d·2^r) ≡ 0 (mod n) при некотором r < s.
+    n - нечётное, больше 100 и не делится на малые простые.
+    """
+    # Для точного квадрата подходящего D не существует
+    if square(isqrt(n)) == n:
+        return False
+    d_value = 5
+    while True:
+        jacobi = jacobi_symbol(LargeNumber.from_int(d_value), n)
+        if jacobi == -1:
+            break
+        if jacobi == 0:
+            return False
+        d_value = -d_value - 2 if d_value > 0 else -d_value + 2
+
+    context = modulus_context(n)
+    D = context.reduce(LargeNumber.from_int(d_value))
+    Q = context.reduce(LargeNumber.from_int((1 - d_value) // 4))
+
+    def halve(x):
+        # x / 2 по модулю нечётного n
+        return (add(x, n) if not x.is_even() else x) >> 1
+
+    d, s = _split_power_of_two(add(n, ONE))
+    # Лестница по битам d: (U_k, V_k, Q^k) -> (U_2k, V_2k, Q^2k) [-> (U_2k+1, V_2k+1, Q^2k+1)]
+    u, v, q_power = ONE, ONE, Q
+    for i in range(d.bit_length() - 2, -1, -1):
+        u = context.mulmod(u, v)
+        v = context.reduce(subtract(context.sqrmod(v), q_power << 1))
+        q_power = context.sqrmod(q_power)
+        if d.test_bit(i):
+            u, v = halve(context.addmod(u, v)), halve(context.addmod(context.mulmod(D, u), v))
+            q_power = context.mulmod(q_power, Q)
+
+    if not u or not v:
+        return True
+    for _ in range(s - 1):
+        v = context.reduce(subtract(context.sqrmod(v), q_power << 1))
+        if not v:
+            return True
+        q_power = context.sqrmod(q_power)
+    return False
+
+def is_baillie_psw_prime(p):
+    """
+    Тест Бэйли-PSW: сильный тест Миллера-Рабина по основанию 2 и сильный
+    тест Люка. Составных чисел, проходящих обе проверки, не известно;
+    для p < 2^64 их нет.
+    """
+    known = _check_small_primes(p)
+    if known is not None:
+        return known
+    d, s = _split_power_of_two(subtract(p, ONE))
+    return _is_strong_probable_prime(p, TWO, d, s, modulus_context(p)) and _is_strong_lucas_prime(p)
+
+def is_probable_prime(p, k=20, method=DEFAULT_PRIMALITY_TEST):
+    """
+    Проверяет p выбранным тестом из PRIMALITY_TESTS. k - число раундов
+    (тест Бэйли-PSW его не использует).
+    """
+    if method == "miller_rabin":
+        return is_miller_rabin_prime(p, k)
+    if method == "baillie_psw":
+        return is_baillie_psw_prime(p)
+    if method == "solovay_strassen":
+        known = _check_small_primes(p)
+        if known is not None:
+            return known
+        return is_fermat_prime(p, 5) and is_solovay_strassen_prime(p, k)
+    raise ValueError(f"Неизвестный тест простоты: '{method}'. Доступны: {', '.join(PRIMALITY_TESTS)}.")
+
 def is_prime_trial_division(n_large):
     """
     Детерминистический тест на простоту методом пробных делений.
@@ -84,52 +240,62 @@ def is_prime_trial_division(n_large):
     
     n = int(n_str)
     if n < 2: return False
-    if n == 2 or n == 3: return True
-    if n % 2 == 0 or n % 3 == 0: return False
-    
-    limit = math.isqrt(n)
-    for i in range(5, limit + 1, 6):
-        if n % i == 0 or n % (i + 2) == 0:
+
+    # Если построен файл таблицы простых и n в нём, ответ - один прочитанный байт
+    table = prime_table.get_prime_table()
+    if table is not None and n <= table.limit:
+        return table.is_small_prime(n)
+
+    # Иначе делим только на простые из общей таблицы решета
+    for q in sieve.iter_primes(2, math.isqrt(n)):
+        if n % q == 0:
             return False
     return True
 
 def generate_small_primes(count, bit_length):
-    """Генерирует список детерминистически проверенных малых простых чисел."""
+    """
+    Генерирует список из count случайных простых заданной битовой длины
+    (с возможными повторами). Короткие простые выбираются прямо из таблицы
+    решета, длинные - проверкой случайных нечётных кандидатов функцией
+    is_prime_trial_division (по файлу таблицы простых, если он построен).
+    """
+    min_val = 1 << (bit_length - 1)
+    max_val = (1 << bit_length) - 1
+    if max_val <= SMALL_PRIME_TABLE_LIMIT:
+        pool = sieve.primes_in_range(min_val, max_val)
+        if not pool:
+            raise ValueError(f"Простых длины {bit_length} бит не существует.")
+        return [LargeNumber.from_int(random.choice(pool)) for _ in range(count)]
+
     primes = []
     while len(primes) < count:
-        min_val = 1 << (bit_length - 1)
-        max_val = (1 << bit_length) - 1
-        candidate_int = random.randint(min_val, max_val)
-        if candidate_int % 2 == 0:
-            candidate_int += 1
-            
-        candidate_large = LargeNumber(str(candidate_int))
-        if is_prime_trial_division(candidate_large):
-            primes.append(candidate_large)
+        check_cancelled()
+        candidate = LargeNumber.from_int(random.randint(min_val, max_val) | 1)
+        if is_prime_trial_division(candidate):
+            primes.append(candidate)
     return primes
 
 def _pocklington_test(p, p_minus_1_factors, num_witnesses):
     """Тест Поклингтона на простоту."""
     base = 10
-    one = LargeNumber("1", base)
-    p_minus_1, _ = divide(p, one, base)
-    p_minus_1 = subtract(p, one, base)
+    p_minus_1 = subtract(p, ONE, base)
+    # Показатели (p-1)/mi не зависят от свидетеля: считаем их один раз
+    exponents = [divide_exact(p_minus_1, factor) for factor in sorted(set(p_minus_1_factors))]
     
     for _ in range(num_witnesses):
         b = LargeNumber(str(random.randint(2, int(p.to_string(10)) - 2)))
         
         # 1) b^(p-1) === 1 (mod p)
-        if mod_power(b, p_minus_1, p).to_string(base) != "1":
+        if mod_power(b, p_minus_1, p) != ONE:
             continue # Пробуем другого свидетеля
             
         # 2) gcd(b^((p-1)/mi) - 1, p) = 1 для всех mi
         all_factors_pass = True
-        for factor in p_minus_1_factors:
-            exponent, _ = divide(p_minus_1, factor, base)
+        for exponent in exponents:
             term = mod_power(b, exponent, p)
-            term_minus_1 = subtract(term, one, base)
+            term_minus_1 = subtract(term, ONE, base)
             
-            if gcd(term_minus_1, p).to_string(base) != "1":
+            if gcd(term_minus_1, p) != ONE:
                 all_factors_pass = False
                 break
         
@@ -138,50 +304,99 @@ def _pocklington_test(p, p_minus_1_factors, num_witnesses):
             
     return False
 
-def generate_prime_with_factorization(small_primes_count, small_primes_bits, h, num_witnesses):
+def generate_prime_with_factorization(small_primes_count, small_primes_bits, h, num_witnesses, workers=1):
     """
     Генерирует простое p с известным разложением p-1.
+    workers > 1 (или None - по числу процессоров) запускает независимые поиски
+    в нескольких процессах и возвращает первый результат.
     """
     base = 10
-    one = LargeNumber("1", base)
-    two = LargeNumber("2", base)
-    
+    workers = worker_count(workers)
+    if workers > 1:
+        return first_result(generate_prime_with_factorization,
+                            (small_primes_count, small_primes_bits, h, num_witnesses), workers)
+
     # Шаг 1: Генерируем набор малых простых
     small_primes = generate_small_primes(small_primes_count, small_primes_bits)
     
     while True:
+        check_cancelled()
         # Шаг 2: Выбираем подмножество
         if h > len(small_primes):
             raise ValueError("h не может быть больше количества сгенерированных малых простых.")
         factors = random.sample(small_primes, h)
         
         # Шаг 3: Конструируем p = 2 * m1 * m2 * ... * mh + 1
-        p_minus_1_div_2 = LargeNumber("1", base)
+        p_minus_1_div_2 = ONE
         for m in factors:
             p_minus_1_div_2 = multiply(p_minus_1_div_2, m, base)
         
-        p = add(multiply(two, p_minus_1_div_2, base), one, base)
+        p = add(multiply(TWO, p_minus_1_div_2, base), ONE, base)
         
         # Шаг 4: Проверяем по Поклингтону
         if _pocklington_test(p, factors, num_witnesses):
+            # Разложение p-1 = 2·m1·...·mh известно по построению: сохраняем его,
+            # чтобы функция Эйлера не раскладывала p-1 заново
+            p_minus_1_factors = Counter(int(m) for m in factors)
+            p_minus_1_factors[2] += 1
+            get_factor_cache().put(int(p) - 1, p_minus_1_factors)
             return p, factors, small_primes
 
-def generate_prime(bit_length, k):
-    """Генерирует псевдопростое число заданной битовой длины."""
+def _sieve_primes():
+    """Первые SIEVE_PRIME_COUNT нечётных простых из общей таблицы решета."""
+    return sieve.first_primes(SIEVE_PRIME_COUNT + 1)[1:]
+
+def _sieved_candidates(bit_length):
+    """
+    Бесконечный поток нечётных кандидатов из [2^(bit_length-1), 2^bit_length),
+    не делящихся ни на одно из малых простых решета.
+
+    От случайной нечётной точки start кандидаты start, start + 2, ... идут
+    окнами по SIEVE_WINDOW. Остатки start по каждому простому q хранятся
+    и сдвигаются на 2·SIEVE_WINDOW между окнами; по остатку сразу видно, какие
+    кандидаты окна делятся на q, и они вычёркиваются срезом bytearray.
+    Возведение в степень нужно только уцелевшим (~12% нечётных чисел).
+    """
+    min_val = 1 << (bit_length - 1)
+    max_val = (1 << bit_length) - 1
+    # Простые не меньше кандидатов не используются, чтобы не вычеркнуть само простое
+    primes = [q for q in _sieve_primes() if q < min_val]
+    while True:
+        start = random.randint(min_val, max_val) | 1
+        residues = [start % q for q in primes]
+        while start <= max_val:
+            window = min(SIEVE_WINDOW, (max_val - start) // 2 + 1)
+            alive = bytearray([1]) * window
+            for q, r in zip(primes, residues):
+                # start + 2j ≡ 0 (mod q)  <=>  j ≡ -r·2^(-1) (mod q)
+                first = (q - r) * ((q + 1) // 2) % q
+                alive[first::q] = bytes(len(range(first, window, q)))
+            for j in itertools.compress(range(window), alive):
+                yield start + 2 * j
+            step = 2 * window
+            residues = [(r + step) % q for q, r in zip(primes, residues)]
+            start += step
+
+def generate_prime(bit_length, k, method=DEFAULT_PRIMALITY_TEST, workers=1):
+    """
+    Генерирует псевдопростое число заданной битовой длины.
+    method - тест простоты из PRIMALITY_TESTS, k - число его раундов.
+    workers > 1 (или None - по числу процессоров) ищет кандидатов параллельно
+    в нескольких процессах со своими случайными начальными точками.
+    """
     if bit_length < 2:
         raise ValueError("Длина битов должна быть >= 2")
+    if method not in PRIMALITY_TESTS:
+        raise ValueError(f"Неизвестный тест простоты: '{method}'. Доступны: {', '.join(PRIMALITY_TESTS)}.")
+    workers = worker_count(workers)
+    if workers > 1:
+        return first_result(generate_prime, (bit_length, k, method), workers)
 
-    while True:
-        min_val = 1 << (bit_length - 1)
-        max_val = (1 << bit_length) - 1
-        p_int = random.randint(min_val, max_val)
-        if p_int % 2 == 0:
-            p_int += 1
-        
-        p = LargeNumber(str(p_int))
-        
-        if is_fermat_prime(p, 5) and is_solovay_strassen_prime(p, k):
-            return p 
+    for p_int in _sieved_candidates(bit_length):
+        check_cancelled()
+        p = LargeNumber.from_int(p_int)
+        if is_probable_prime(p, k, method):
+            return p
 
 def _gost_primality_test(p, N):
     """
@@ -189,30 +404,35 @@ def _gost_primality_test(p, N):
     p = N*q+1. Тест проверяет: 2^(p-1)==1 mod p И 2^N != 1 mod p.
     """
     base = 10
-    one = LargeNumber("1", base)
-    two = LargeNumber("2", base)
-    
-    p_minus_1 = subtract(p, one, base)
+    p_minus_1 = subtract(p, ONE, base)
     
     # Условие 1: 2^(p-1) mod p == 1
-    if mod_power(two, p_minus_1, p).to_string(base) != "1":
+    if mod_power(TWO, p_minus_1, p) != ONE:
         return False
 
     # Условие 2: 2^N mod p != 1
-    if mod_power(two, N, p).to_string(base) == "1":
+    if mod_power(TWO, N, p) == ONE:
         return False
         
     return True
 
-def generate_gost_prime(target_bit_length, progress_callback=None):
+def generate_gost_prime(target_bit_length, progress_callback=None, workers=1):
     """
     Генерирует простое число по алгоритму из ГОСТ Р 34.10-94.
+    workers > 1 (или None - по числу процессоров) строит независимые цепочки
+    в нескольких процессах; progress_callback тогда получает только начало
+    и конец генерации.
     """
     base = 10
-    two = LargeNumber("2", base)
 
     if target_bit_length < 17:
         raise ValueError("Целевая битовая длина должна быть >= 17.")
+    workers = worker_count(workers)
+    if workers > 1:
+        if progress_callback: progress_callback(f"Параллельный поиск в {workers} процессах...")
+        p_current = first_result(generate_gost_prime, (target_bit_length,), workers)
+        if progress_callback: progress_callback("\nГенерация завершена.")
+        return p_current
 
     # 1. Строим убывающую последовательность битовых длин
     t_list = [target_bit_length]
@@ -235,19 +455,23 @@ def generate_gost_prime(target_bit_length, progress_callback=None):
         
         if progress_callback: progress_callback(f"\nШаг {i+2}: Генерация {t_next}-битного простого...")
             
-        # Находим начальное значение для N
-        min_p_next = power_integer(two, LargeNumber(str(t_next - 1)))
-        N, _ = divide(min_p_next, p_i)
+        # Находим начальное значение для N = ceil(2^(t-1) / p_i),
+        # чтобы p = N*p_i + 1 не оказалось короче t бит
+        min_p_next = ONE << (t_next - 1)
+        N, remainder = divide(min_p_next, p_i)
+        if remainder:
+            N = add(N, ONE)
         
-        if divide(N, two)[1].to_string(base) != "0": # N должно быть четным
-            N = add(N, LargeNumber("1", base))
+        if not N.is_even(): # N должно быть четным
+            N = add(N, ONE)
             
         # Итеративно ищем подходящее p_{i-1}
         while True:
-            p_next = add(multiply(p_i, N), LargeNumber("1", base))
+            check_cancelled()
+            p_next = add(multiply(p_i, N), ONE)
             
-            if len(p_next.to_string(2)) > t_next:
-                N = add(N, two) # N слишком велико, p перескочило битность
+            if p_next.bit_length() > t_next:
+                N = add(N, TWO) # N слишком велико, p перескочило битность
                 continue
 
             if progress_callback: progress_callback(f"Проверка кандидата N={N.to_string(10)}...", is_sub_step=True)
@@ -257,7 +481,7 @@ def generate_gost_prime(target_bit_length, progress_callback=None):
                 if progress_callback: progress_callback(f"Найден промежуточный простой: {p_current.to_string(10)}")
                 break
             else:
-                N = add(N, two)
+                N = add(N, TWO)
 
     if progress_callback: progress_callback("\nГенерация завершена.")
         
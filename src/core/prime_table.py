@@ -0,0 +1,192 @@
+"""
+Постоянная таблица простых чисел в файле с битовой картой по колесу 30.
+
+Все простые больше 5 имеют вид 30k + r, где r - один из восьми вычетов
+(1, 7, 11, 13, 17, 19, 23, 29), взаимно простых с 30. Поэтому одного байта
+хватает на 30 чисел: бит i байта k установлен, если 30k + r_i простое.
+Простые до 10^9 занимают около 33 МБ.
+
+Формат файла (все числа little-endian):
+- заголовок: сигнатура b"WHEEL30\\0", версия, BLOCK_BYTES, граница limit,
+  число установленных битов;
+- индекс: для каждого блока из BLOCK_BYTES байт (и конца файла) количество
+  установленных битов до его начала, uint64;
+- битовая карта: (limit // 30 + 1) байт.
+
+Таблица строится один раз командой
+
+    python -m src.core.prime_table build 1000000000 [--output путь]
+
+и затем открывается через mmap без чтения в память. Система загружает
+только страницы, к которым обращались, а все процессы, открывшие один и тот
+же файл, делят эти страницы. is_small_prime читает один байт; primes_in -
+только байты отрезка; nth_prime находит блок двоичным поиском по индексу
+и считает биты внутри него.
+"""
+
+import argparse
+import bisect
+import mmap
+import os
+import struct
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # NumPy не обязателен
+    np = None
+
+from . import sieve
+
+_MAGIC = b"WHEEL30\0"
+_VERSION = 1
+_HEADER = struct.Struct("<8sIIQQ")
+# Вычеты по модулю 30, взаимно простые с 30, и их биты в байте
+_RESIDUES = (1, 7, 11, 13, 17, 19, 23, 29)
+_BIT_OF_RESIDUE = bytes((1 << _RESIDUES.index(r)) if r in _RESIDUES else 0 for r in range(30))
+# Байт -> смещения чисел с установленными битами; байт -> число установленных битов
+_BYTE_OFFSETS = [tuple(r for i, r in enumerate(_RESIDUES) if value >> i & 1) for value in range(256)]
+_POPCOUNT = bytes(bin(value).count("1") for value in range(256))
+
+# Байт битовой карты в одном блоке индекса (4096 байт - 122880 чисел)
+BLOCK_BYTES = 4096
+
+PRIME_TABLE_ENV_VAR = "CALC_PRIME_TABLE"
+DEFAULT_TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "data", "primes30.bin")
+
+def _encode(primes, first_byte, length):
+    """Битовая карта length байт, начиная с байта first_byte, для простых > 5."""
+    if np is not None and primes:
+        values = np.asarray(primes, dtype=np.int64)
+        chunk = np.zeros(length, dtype=np.uint8)
+        np.bitwise_or.at(chunk, values // 30 - first_byte, np.frombuffer(_BIT_OF_RESIDUE, dtype=np.uint8)[values % 30])
+        return chunk.tobytes()
+    chunk = bytearray(length)
+    for p in primes:
+        chunk[p // 30 - first_byte] |= _BIT_OF_RESIDUE[p % 30]
+    return bytes(chunk)
+
+def build_prime_table(path: str, limit: int) -> None:
+    """
+    Записывает в path таблицу простых <= limit. Файл сначала пишется под
+    временным именем и затем подменяется целиком, так что (в POSIX-системах)
+    процессы, уже открывшие старую таблицу, продолжают с ней работать.
+    """
+    if limit < 7:
+        raise ValueError("Граница таблицы простых должна быть не меньше 7.")
+    total_bytes = limit // 30 + 1
+    block_count = -(-total_bytes // BLOCK_BYTES)
+    index = array('Q', [0])
+    temporary_path = path + ".tmp"
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(temporary_path, "wb") as file:
+        file.write(bytes(_HEADER.size + 8 * (block_count + 1)))
+        for block in range(block_count):
+            first_byte = block * BLOCK_BYTES
+            length = min(BLOCK_BYTES, total_bytes - first_byte)
+            primes = sieve.primes_in_range(max(30 * first_byte, 7), min(30 * (first_byte + length) - 1, limit))
+            file.write(_encode(primes, first_byte, length))
+            index.append(index[-1] + len(primes))
+        file.seek(0)
+        file.write(_HEADER.pack(_MAGIC, _VERSION, BLOCK_BYTES, limit, index[-1]))
+        file.write(index.tobytes())
+    os.replace(temporary_path, path)
+
+class PrimeTable:
+    """Таблица простых из файла, открытая через mmap только для чтения."""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self._block_bytes, self.limit, self._bit_count = _HEADER.unpack_from(self._map)
+        if magic != _MAGIC or version != _VERSION:
+            self._map.close()
+            raise ValueError(f"Файл '{path}' не является таблицей простых.")
+        block_count = -(-(self.limit // 30 + 1) // self._block_bytes)
+        self._bits_offset = _HEADER.size + 8 * (block_count + 1)
+        self._index = memoryview(self._map)[_HEADER.size:self._bits_offset].cast('Q')
+
+    def close(self):
+        self._index.release()
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        """Число простых в таблице."""
+        return self._bit_count + 3
+
+    def _check_bound(self, n):
+        if n > self.limit:
+            raise ValueError(f"Число {n} выходит за границу таблицы простых ({self.limit}).")
+
+    def is_small_prime(self, n: int) -> bool:
+        """Является ли n <= limit простым."""
+        self._check_bound(n)
+        if n < 7:
+            return n in (2, 3, 5)
+        bit = _BIT_OF_RESIDUE[n % 30]
+        return bool(bit and self._map[self._bits_offset + n // 30] & bit)
+
+    def primes_in(self, a: int, b: int) -> list[int]:
+        """Простые из отрезка [a, b] при b <= limit."""
+        self._check_bound(b)
+        primes = [p for p in (2, 3, 5) if a <= p <= b]
+        if b < max(a, 7):
+            return primes
+        first, last = max(a, 0) // 30, b // 30
+        data = self._map[self._bits_offset + first:self._bits_offset + last + 1]
+        primes += [30 * k + r for k, value in enumerate(data, first) if value for r in _BYTE_OFFSETS[value]]
+        return [p for p in primes if a <= p <= b]
+
+    def nth_prime(self, n: int) -> int:
+        """n-е простое число (nth_prime(1) = 2)."""
+        if n < 1:
+            raise ValueError("Номер простого должен быть положительным.")
+        if n <= 3:
+            return (2, 3, 5)[n - 1]
+        rank = n - 3
+        if rank > self._bit_count:
+            raise ValueError(f"В таблице только {self._bit_count + 3} простых.")
+        # Последний блок, до начала которого установлено меньше rank битов
+        block = bisect.bisect_left(self._index, rank) - 1
+        rank -= self._index[block]
+        start = self._bits_offset + block * self._block_bytes
+        data = self._map[start:start + self._block_bytes]
+        for k, count in enumerate(data.translate(_POPCOUNT)):
+            if rank <= count:
+                return 30 * (block * self._block_bytes + k) + _BYTE_OFFSETS[data[k]][rank - 1]
+            rank -= count
+
+# Путь -> открытая таблица
+_tables = {}
+
+def get_prime_table():
+    """
+    Таблица из файла, заданного переменной окружения CALC_PRIME_TABLE
+    (по умолчанию DEFAULT_TABLE_PATH), или None, если файла нет.
+    """
+    path = os.path.abspath(os.environ.get(PRIME_TABLE_ENV_VAR) or DEFAULT_TABLE_PATH)
+    table = _tables.get(path)
+    if table is None and os.path.exists(path):
+        table = _tables[path] = PrimeTable(path)
+    return table
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Построение файла таблицы простых (колесо 30).")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="построить таблицу простых до заданной границы")
+    build.add_argument("limit", type=int, help="наибольшее число таблицы, например 1000000000")
+    build.add_argument("--output", default=os.environ.get(PRIME_TABLE_ENV_VAR) or DEFAULT_TABLE_PATH,
+                       help="путь к файлу таблицы")
+    args = parser.parse_args(argv)
+    build_prime_table(args.output, args.limit)
+    with PrimeTable(args.output) as table:
+        print(f"{args.output}: простые до {table.limit}, всего {len(table)}")
+
+if __name__ == "__main__":
+    main()
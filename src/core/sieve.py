@@ -0,0 +1,152 @@
+"""
+Сегментированное решето Эратосфена и общая таблица малых простых.
+
+Решето хранит только нечётные числа: байт j сегмента соответствует числу
+lo + 2j. Кратные каждого базового простого q <= sqrt(b) вычёркиваются
+срезом bytearray с шагом q, так что внутренний цикл выполняется кодом на C.
+Диапазон [a, b] обходится сегментами по SEGMENT_SIZE байт, которые
+помещаются в кэш процессора, поэтому память не зависит от длины диапазона.
+Номера уцелевших байтов извлекаются через NumPy, если он установлен.
+
+Таблица простых общая для всего процесса. Она растёт по мере надобности
+(граница как минимум удваивается), но не дальше TABLE_MAX_LIMIT, так что
+её память ограничена. Простые выше этой границы, в том числе базовые для
+отрезков за 2^52, вырабатываются сегментами заново и не сохраняются. Из таблицы берут
+простые генераторы малых простых, пробные деления, решето кандидатов
+в generate_prime и разложение на множители.
+"""
+
+import bisect
+import itertools
+import math
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # NumPy не обязателен
+    np = None
+
+# Нечётных чисел в одном сегменте (байт bytearray): 32 КиБ помещаются в кэш L1/L2
+SEGMENT_SIZE = 1 << 15
+# Граница таблицы при первом обращении и предел её роста
+# (простые до 2^26 - около 3.9 млн чисел, 16 МБ в array('I'))
+TABLE_INITIAL_LIMIT = 1 << 16
+TABLE_MAX_LIMIT = 1 << 26
+
+_table = array('I')
+_table_limit = 0
+
+def _nonzero(flags):
+    """Номера ненулевых байтов."""
+    if np is not None:
+        return np.flatnonzero(np.frombuffer(flags, dtype=np.uint8)).tolist()
+    return list(itertools.compress(range(len(flags)), flags))
+
+def _simple_sieve(limit):
+    """Простые <= limit обычным решетом (для начальной таблицы)."""
+    is_prime = bytearray([1]) * (limit + 1)
+    is_prime[:2] = b"\x00\x00"
+    for q in range(2, math.isqrt(limit) + 1):
+        if is_prime[q]:
+            is_prime[q * q::q] = bytes(len(range(q * q, limit + 1, q)))
+    return _nonzero(is_prime)
+
+def _sieve_segment(lo, count, base_primes):
+    """Флаги простоты нечётных чисел lo, lo + 2, ..., lo + 2(count - 1) (lo нечётно, lo >= 3)."""
+    flags = bytearray([1]) * count
+    hi = lo + 2 * (count - 1)
+    for q in itertools.islice(base_primes, 1, None):  # 2 пропускаем: чётных в сегменте нет
+        if q * q > hi:
+            break
+        # Первое нечётное кратное q, не меньшее max(q^2, lo)
+        start = max(q * q, -(-lo // q) * q)
+        if not start & 1:
+            start += q
+        first = (start - lo) // 2
+        if first < count:
+            flags[first::q] = bytes(len(range(first, count, q)))
+    return flags
+
+def _segments(a, b=None):
+    """Списки простых из [a, b] по сегментам; b=None - без верхней границы."""
+    if a <= 2 and (b is None or b >= 2):
+        yield [2]
+    lo = max(a, 3) | 1
+    while b is None or lo <= b:
+        count = SEGMENT_SIZE if b is None else min(SEGMENT_SIZE, (b - lo) // 2 + 1)
+        hi = lo + 2 * (count - 1)
+        flags = _sieve_segment(lo, count, _base_primes(math.isqrt(hi)))
+        yield [lo + 2 * j for j in _nonzero(flags)]
+        lo = hi + 2
+
+def _base_primes(limit):
+    """
+    Простые, покрывающие все простые <= limit (могут быть и большие): таблица
+    или, если limit выше её предела, таблица и поток простых за ней.
+    """
+    if limit > _table_limit:
+        _grow_table(limit)
+    if limit <= _table_limit:
+        return _table
+    return itertools.chain(_table, itertools.chain.from_iterable(_segments(_table_limit + 1, limit)))
+
+def _grow_table(limit):
+    """Расширяет таблицу до границы не меньше limit, но не больше TABLE_MAX_LIMIT."""
+    global _table_limit
+    if not _table_limit:
+        _table.extend(_simple_sieve(TABLE_INITIAL_LIMIT))
+        _table_limit = TABLE_INITIAL_LIMIT
+        if limit <= _table_limit:
+            return
+    limit = min(max(limit, 2 * _table_limit), TABLE_MAX_LIMIT)
+    if limit <= _table_limit:
+        return
+    # Базовые простые для новых сегментов; рекурсия по sqrt быстро сходится
+    _base_primes(math.isqrt(limit))
+    # Остаток прерванного расширения отбрасываем
+    del _table[bisect.bisect_right(_table, _table_limit):]
+    for primes in _segments(_table_limit + 1, limit):
+        _table.extend(primes)
+    _table_limit = limit
+
+def primes_in_range(a: int, b: int) -> list[int]:
+    """Простые из отрезка [a, b] по возрастанию."""
+    if b < max(a, 2):
+        return []
+    if b <= max(_table_limit, TABLE_MAX_LIMIT):
+        table = _base_primes(b)
+        return table[bisect.bisect_left(table, a):bisect.bisect_right(table, b)].tolist()
+    return list(itertools.chain.from_iterable(_segments(a, b)))
+
+def primes_up_to(n: int) -> list[int]:
+    """Все простые <= n."""
+    return primes_in_range(2, n)
+
+def first_primes(count: int) -> list[int]:
+    """Первые count простых чисел."""
+    while len(_table) < count and _table_limit < TABLE_MAX_LIMIT:
+        # p_n < n (ln n + ln ln n) при n >= 6
+        estimate = int(count * (math.log(count) + math.log(math.log(count)))) + 1 if count >= 6 else 13
+        _grow_table(max(estimate, _table_limit + 1))
+    primes = _table[:count].tolist()
+    # Простые за пределом таблицы вырабатываются сегментами
+    primes += itertools.islice(iter_primes(_table_limit + 1), count - len(primes))
+    return primes
+
+def iter_primes(start: int = 2, stop: int | None = None):
+    """
+    Простые из [start, stop] по возрастанию; stop=None - бесконечный поток.
+    Часть до TABLE_MAX_LIMIT берётся из таблицы (она при необходимости растёт),
+    дальше простые вырабатываются сегментами.
+    """
+    position = max(start, 2)
+    while position <= TABLE_MAX_LIMIT and (stop is None or position <= stop):
+        if position > _table_limit:
+            _grow_table(position)
+        end = _table_limit if stop is None else min(stop, _table_limit)
+        # Срез - копия, поэтому рост таблицы во время обхода ему не мешает
+        yield from _table[bisect.bisect_left(_table, position):bisect.bisect_right(_table, end)]
+        position = end + 1
+    if stop is None or position <= stop:
+        for primes in _segments(position, stop):
+            yield from primes
@@ -0,0 +1,119 @@
+"""
+Векторизованные (NumPy) ядра для операций над массивами лимбов.
+
+Поэлементные суммы, разности и произведения считаются одной операцией
+над всем массивом, а переносы распространяются пакетно. Сначала большие
+значения несколько раз "разрезаются" на младшие LIMB_BITS бит и перенос
+в соседний лимб, пока каждый перенос не станет 0 или 1. Затем оставшиеся
+цепочки переносов находятся сразу для всех позиций по схеме ускоренного
+переноса (carry-lookahead): битовые маски "порождает перенос" G и
+"пропускает перенос" P упаковываются в int, и переносы получаются
+одним сложением (G | P) + G.
+
+Функции принимают списки или array лимбов по LIMB_BITS бит и возвращают
+вектор NumPy без ведущих нулей; to_list и to_array переводят его в списки
+(как у функций long_arithmetic) или в array без поэлементного копирования.
+"""
+
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # NumPy не обязателен
+    np = None
+
+# Совпадает с long_arithmetic.LIMB_BITS
+LIMB_BITS = 30
+LIMB_MASK = (1 << LIMB_BITS) - 1
+
+def has_numpy() -> bool:
+    """Доступны ли векторизованные ядра."""
+    return np is not None
+
+def _as_vector(limbs, length):
+    vector = np.zeros(length, dtype=np.uint64)
+    vector[:len(limbs)] = np.asarray(limbs, dtype=np.uint64)
+    return vector
+
+def _trim(vector):
+    nonzero = np.flatnonzero(vector)
+    return vector[:nonzero[-1] + 1] if len(nonzero) else vector[:1]
+
+def to_list(vector):
+    """Лимбы в виде списка Python int."""
+    return vector.tolist()
+
+def to_array(vector, typecode):
+    """Лимбы в виде array с заданным кодом типа (копирование одним блоком памяти)."""
+    return array(typecode, vector.astype(np.dtype(typecode)).tobytes())
+
+def _mask_to_int(bits):
+    return int.from_bytes(np.packbits(bits, bitorder="little").tobytes(), "little")
+
+def _int_to_mask(value, length):
+    data = value.to_bytes(length // 8 + 1, "little")
+    return np.unpackbits(np.frombuffer(data, dtype=np.uint8), bitorder="little")[:length]
+
+def _lookahead(generate, propagate):
+    """
+    Входящие переносы для всех позиций сразу: c_i = g_i | (p_i & c_(i-1)).
+    Переносы в сумме (G | P) + G совпадают с c_i, поэтому входящий перенос
+    позиции i равен биту i у ((G | P) + G) ^ (G | P) ^ G.
+    """
+    g = _mask_to_int(generate)
+    m = g | _mask_to_int(propagate)
+    return _int_to_mask(((m + g) ^ m ^ g), len(generate) + 1)
+
+def _resolve(values):
+    """Нормализует неотрицательные значения < 2^63 в лимбы (последний элемент - запас под перенос)."""
+    limit = np.uint64(2 * LIMB_MASK)
+    shift, mask = np.uint64(LIMB_BITS), np.uint64(LIMB_MASK)
+    while values.max(initial=0) > limit:
+        high = values >> shift
+        values = values & mask
+        values[1:] += high[:-1]
+    carries = _lookahead(values > mask, values == mask)
+    return (values + carries[:-1]) & mask
+
+def add_limbs(a, b):
+    """Сумма модулей."""
+    length = max(len(a), len(b)) + 1
+    return _trim(_resolve(_as_vector(a, length) + _as_vector(b, length)))
+
+def sub_limbs(a, b):
+    """Разность модулей при |a| >= |b|."""
+    length = len(a)
+    diff = _as_vector(a, length).astype(np.int64) - _as_vector(b, length).astype(np.int64)
+    # Заём порождается отрицательной разностью и пропускается нулевой
+    borrows = _lookahead(diff < 0, diff == 0)
+    return _trim(((diff - borrows[:-1].astype(np.int64)) & LIMB_MASK).astype(np.uint64))
+
+def mul_short(a, b):
+    """
+    Произведение длинного a на короткое b (до нескольких сотен лимбов):
+    по строке a·b_i на каждый лимб b, младшие и старшие половины
+    произведений накапливаются раздельно, переносы разрешаются один раз.
+    """
+    length = len(a) + len(b) + 1
+    vector_a = np.asarray(a, dtype=np.uint64)
+    low = np.zeros(length, dtype=np.uint64)
+    high = np.zeros(length, dtype=np.uint64)
+    shift, mask = np.uint64(LIMB_BITS), np.uint64(LIMB_MASK)
+    for i, b_i in enumerate(b):
+        if b_i == 0:
+            continue
+        products = vector_a * np.uint64(b_i)
+        low[i:i + len(a)] += products & mask
+        high[i + 1:i + 1 + len(a)] += products >> shift
+        if i % 1024 == 1023:
+            # Не даём суммам переполнить 64 бита на очень длинных b
+            low = _resolve(low + high)
+            high[:] = 0
+    return _trim(_resolve(low + high))
+
+def mul_small(a, m, addend=0):
+    """a * m + addend для m, addend < 2^LIMB_BITS."""
+    result = mul_short(a, [m])
+    if addend:
+        return add_limbs(result, [addend])
+    return result
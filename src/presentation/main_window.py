@@ -11,7 +11,8 @@ from core.modular_arithmetic import (modular_sqrt, mod_power,
                                      chinese_remainder_theorem, euler_totient,
                                      legendre_symbol, jacobi_symbol,
                                      find_quadratic_residues, find_cubic_residues)
-from core.primality import generate_prime, generate_prime_with_factorization, generate_gost_prime, is_solovay_strassen_prime
+from core.primality import (generate_prime, generate_prime_with_factorization, generate_gost_prime,
+                            is_probable_prime, PRIMALITY_TESTS, DEFAULT_PRIMALITY_TEST)
 
 
 class CryptographicCalculatorWindow(QMainWindow):
@@ -442,7 +443,13 @@ class CryptographicCalculatorWindow(QMainWindow):
         self.prime_rounds_input.setRange(1, 100)
         self.prime_rounds_input.setValue(20)
 
+        self.prime_test_combo = QComboBox()
+        for name, title in PRIMALITY_TESTS.items():
+            self.prime_test_combo.addItem(title, name)
+        self.prime_test_combo.setCurrentIndex(self.prime_test_combo.findData(DEFAULT_PRIMALITY_TEST))
+
         form_layout.addRow("Битовая длина:", self.prime_bit_length_input)
+        form_layout.addRow("Тест простоты:", self.prime_test_combo)
         form_layout.addRow("Раунды проверки (k):", self.prime_rounds_input)
 
         generate_button = QPushButton("Сгенерировать")
@@ -462,11 +469,12 @@ class CryptographicCalculatorWindow(QMainWindow):
         try:
             bit_length = self.prime_bit_length_input.value()
             k = self.prime_rounds_input.value()
+            method = self.prime_test_combo.currentData()
 
             self.prime_result_label.setText("Идёт генерация, пожалуйста, подождите...")
             QApplication.processEvents() # Обновляем UI
 
-            prime = generate_prime(bit_length, k)
+            prime = generate_prime(bit_length, k, method)
             
             self.prime_result_label.setText(
                 f"Сгенерировано псевдопростое число ({bit_length} бит):\n"
@@ -657,7 +665,7 @@ class CryptographicCalculatorWindow(QMainWindow):
                 return
 
             m = LargeNumber(m_str)
-            if m.is_negative or m.to_string() == "0":
+            if m.is_negative or not m:
                 self.euler_result_label.setText("Ошибка: число m должно быть натуральным ( > 0).")
                 return
 
@@ -712,8 +720,7 @@ class CryptographicCalculatorWindow(QMainWindow):
             
             one = LargeNumber("1")
             two = LargeNumber("2")
-            _, n_rem_2 = divide(n, two)
-            is_n_odd = n_rem_2.to_string() != "0"
+            is_n_odd = not n.is_even()
 
             if not _is_abs_greater_or_equal(n, one):
                 self.lj_result_label.setText("Ошибка: n должно быть > 0.")
@@ -722,15 +729,14 @@ class CryptographicCalculatorWindow(QMainWindow):
             result_text = ""
             
             # Проверка на простоту (вероятностная)
-            is_n_prime = is_solovay_strassen_prime(n, k=20)
+            is_n_prime = is_probable_prime(n, k=20)
             
             if is_n_prime:
                 result_text += f"Число {n_str} вероятно простое.\n"
                 l_symbol = 0
-                if n.to_string() == "2":
+                if n == two:
                     # (a/2) = 0 если a четное, 1 если a нечетное
-                    _, a_rem_2 = divide(a, two)
-                    l_symbol = 0 if a_rem_2.to_string() == "0" else 1
+                    l_symbol = 0 if a.is_even() else 1
                 else: # n - нечетное простое
                     l_symbol = legendre_symbol(a, n)
                 result_text += f"Символ Лежандра ({a_str}/{n_str}) = {l_symbol}\n\n"
@@ -739,7 +745,7 @@ class CryptographicCalculatorWindow(QMainWindow):
             if is_n_odd and _is_abs_greater_or_equal(n, one):
                 j_symbol = jacobi_symbol(a, n)
                 result_text += f"Символ Якоби ({a_str}/{n_str}) = {j_symbol}\n"
-            elif not is_n_odd and n.to_string() != "2":
+            elif not is_n_odd and n != two:
                  result_text += "Символ Якоби не определён для четных составных n."
 
             self.lj_result_label.setText(result_text.strip())
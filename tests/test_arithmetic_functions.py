@@ -0,0 +1,79 @@
+import math
+from array import array
+import unittest
+from unittest import mock
+
+from src.core import arithmetic_functions, factorization
+from src.core.arithmetic_functions import arithmetic_functions_range, iter_arithmetic_functions
+from src.core.long_arithmetic import LargeNumber
+from src.core.modular_arithmetic import euler_totient
+
+
+def _naive(m):
+    """φ, μ, σ, τ по определениям."""
+    if m == 0:
+        return 0, 0, 0, 0
+    divisors = [d for d in range(1, m + 1) if m % d == 0]
+    phi = sum(1 for k in range(1, m + 1) if math.gcd(k, m) == 1)
+    squarefree = all(m % (d * d) for d in range(2, m + 1) if d * d <= m)
+    primes = [d for d in divisors if d > 1 and all(d % q for q in range(2, d))]
+    mu = (-1) ** len(primes) if squarefree else 0
+    return phi, mu, sum(divisors), len(divisors)
+
+
+def _from_factorization(m):
+    """φ, μ, σ, τ по разложению m на множители."""
+    phi, mu, sigma, tau = 1, 1, 1, 1
+    for p, k in factorization.factorize(LargeNumber.from_int(m)):
+        p = int(p)
+        phi *= (p - 1) * p ** (k - 1)
+        mu = -mu if k == 1 else 0
+        sigma *= (p ** (k + 1) - 1) // (p - 1)
+        tau *= k + 1
+    return phi, mu, sigma, tau
+
+
+def _rows(columns):
+    return list(zip(*columns))
+
+
+class TestArithmeticFunctions(unittest.TestCase):
+    def test_small_numbers(self):
+        expected = [_naive(m) for m in range(1001)]
+        self.assertEqual(_rows(arithmetic_functions.arithmetic_functions(1000)), expected)
+        self.assertEqual(_rows(arithmetic_functions_range(500, 1000)), expected[500:])
+        self.assertEqual([column.typecode for column in arithmetic_functions.arithmetic_functions(10)],
+                         ['I', 'b', 'Q', 'H'])
+        # Без NumPy те же шаги выполняются списками
+        with mock.patch.object(arithmetic_functions, "np", None):
+            self.assertEqual(_rows(arithmetic_functions_range(0, 1000)), expected)
+
+    def test_segments(self):
+        """Сегменты на дальнем отрезке, в том числе степени простых и простые больше sqrt(b)."""
+        low = 10 ** 9 - 500
+        segments = list(iter_arithmetic_functions(low, low + 999, segment_size=128))
+        self.assertEqual([start for start, *_ in segments], list(range(low, low + 1000, 128)))
+        rows = [row for _, *columns in segments for row in _rows(columns)]
+        self.assertEqual(rows, _rows(arithmetic_functions_range(low, low + 999)))
+        for m in (low, 10 ** 9, 999999937, 999999999, low + 999):
+            self.assertEqual(rows[m - low], _from_factorization(m), m)
+        with self.assertRaises(ValueError):
+            arithmetic_functions_range(2 ** 32 - 10, 2 ** 32)
+
+    def test_euler_totient_uses_table(self):
+        with mock.patch.object(arithmetic_functions, "_totients", array('I')):
+            with mock.patch.object(factorization, "factorize", side_effect=AssertionError):
+                self.assertEqual(int(euler_totient(LargeNumber("1000"))), 400)
+                self.assertEqual(int(euler_totient(LargeNumber.from_int(65521))), 65520)
+            # Сама таблица не растёт дальше TOTIENT_TABLE_LIMIT: большие m раскладываются
+            self.assertEqual(len(arithmetic_functions._totients), arithmetic_functions.TOTIENT_TABLE_LIMIT + 1)
+            with mock.patch.object(factorization, "factorize", wraps=factorization.factorize) as factorize:
+                self.assertEqual(int(euler_totient(LargeNumber.from_int(999983))), 999982)
+                factorize.assert_called_once()
+            # Построенная заранее большая таблица используется
+            arithmetic_functions.totient_table(10 ** 6)
+            with mock.patch.object(factorization, "factorize", side_effect=AssertionError):
+                self.assertEqual(int(euler_totient(LargeNumber.from_int(999983))), 999982)
+
+if __name__ == '__main__':
+    unittest.main()
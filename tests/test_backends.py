@@ -0,0 +1,140 @@
+import os
+import random
+import unittest
+from unittest import mock
+
+from src.core import backends
+from src.core.long_arithmetic import (LargeNumber, add, subtract, multiply, square, divide, divide_exact,
+                                      power_integer, isqrt, iroot, gcd, extended_gcd)
+from src.core.modular_arithmetic import (mod_power, modulus_context, modular_sqrt, chinese_remainder_theorem,
+                                         fast_modular_multiplication)
+from src.core.modulus_context import ModulusContext
+
+class TestBackends(unittest.TestCase):
+
+    def setUp(self):
+        self._saved = backends.get_backend().name
+
+    def tearDown(self):
+        backends.set_backend(self._saved)
+
+    def _operands(self):
+        rng = random.Random(13)
+        values = [0, 1, -1, 7, -12, 2 ** 64, -(3 ** 90)]
+        values += [rng.getrandbits(rng.randint(1, 700)) * rng.choice((1, -1)) for _ in range(8)]
+        return [LargeNumber.from_int(v) for v in values]
+
+    def _results(self):
+        results = []
+        operands = self._operands()
+        modulus_values = [LargeNumber("1000000007"), LargeNumber("2" * 40), LargeNumber("1" + "0" * 50)]
+        for a in operands:
+            for b in operands:
+                results += [add(a, b), subtract(a, b), multiply(a, b)]
+                if b:
+                    results += list(divide(a, b))
+                    results.append(divide_exact(multiply(a, b), b))
+                results.append(gcd(a, b))
+                g, x, y = extended_gcd(a, b)
+                # Коэффициенты Безу могут различаться между бэкендами, проверяем тождество
+                self.assertEqual(add(multiply(a, x), multiply(b, y)), g)
+                results.append(g)
+            results.append(square(a))
+            results += [isqrt(abs(a)), iroot(abs(a), 3), iroot(abs(a), 17)]
+            results.append(power_integer(a, LargeNumber("5")))
+            for modulus in modulus_values:
+                results.append(mod_power(a, LargeNumber("65537"), modulus))
+        return results
+
+    def test_backends_agree_with_reference(self):
+        backends.set_backend("reference")
+        expected = self._results()
+        for name in backends.available_backends():
+            with backends.use_backend(name) as backend:
+                self.assertEqual(backend.name, name)
+                self.assertEqual(self._results(), expected)
+
+    def _modular_results(self):
+        results = []
+        for modulus in [LargeNumber("1000000007"), LargeNumber("2" * 40), LargeNumber("1" + "0" * 50)]:
+            context = modulus_context(modulus)
+            for a in self._operands():
+                for b in self._operands()[:6]:
+                    results += [context.mulmod(a, b), context.addmod(a, b)]
+                results += [context.reduce(a), context.sqrmod(a)]
+        p, q = LargeNumber("1000000007"), LargeNumber("1000000087")  # простые, ≡ 3 (mod 4)
+        results += modular_sqrt(LargeNumber("15241578750190521"), p, q)  # 123456789^2
+        results += chinese_remainder_theorem([(LargeNumber("2"), LargeNumber("3")), (LargeNumber("3"), LargeNumber("5")),
+                                              (LargeNumber("-2"), LargeNumber("7")), (LargeNumber("12345"), p)])
+        a, b = LargeNumber("9" * 60), LargeNumber("8" * 55)
+        for sign in "+-":
+            results += fast_modular_multiplication(a, b, LargeNumber("127"), LargeNumber("1"), sign)
+        return results
+
+    def test_modular_functions_agree_with_reference(self):
+        """Корни по модулю, КТО и умножение по модулю 2^n ± c выполняются контекстом текущего бэкенда."""
+        backends.set_backend("reference")
+        self.assertIsInstance(modulus_context(LargeNumber("1000000007")), ModulusContext)
+        expected = self._modular_results()
+        for name in backends.available_backends():
+            with backends.use_backend(name) as backend:
+                with mock.patch.object(type(backend), "modulus_context", autospec=True,
+                                       side_effect=type(backend).modulus_context) as factory:
+                    self.assertEqual(self._modular_results(), expected)
+                    self.assertTrue(factory.called)
+                if name != "reference":
+                    self.assertNotIsInstance(modulus_context(LargeNumber("1000000007")), ModulusContext)
+
+    def test_errors_are_identical(self):
+        for name in backends.available_backends():
+            with backends.use_backend(name):
+                with self.assertRaises(ZeroDivisionError):
+                    divide(LargeNumber("5"), LargeNumber("0"))
+                with self.assertRaises(ZeroDivisionError):
+                    divide_exact(LargeNumber("5"), LargeNumber("0"))
+                with self.assertRaises(ValueError):
+                    power_integer(LargeNumber("2"), LargeNumber("-1"))
+                with self.assertRaises(ValueError):
+                    mod_power(LargeNumber("2"), LargeNumber("3"), LargeNumber("-7"))
+                with self.assertRaises(ValueError):
+                    modulus_context(LargeNumber("-7"))
+                with self.assertRaises(ValueError):
+                    modulus_context(LargeNumber("0"))
+                with self.assertRaises(ValueError):
+                    isqrt(LargeNumber("-1"))
+                with self.assertRaises(ValueError):
+                    iroot(LargeNumber("5"), 0)
+
+    def test_selection(self):
+        self.assertIn("reference", backends.available_backends())
+        self.assertIn("int", backends.available_backends())
+        with self.assertRaises(ValueError):
+            backends.set_backend("abacus")
+
+        backends.set_backend("reference")
+        with backends.use_backend("int"):
+            self.assertEqual(backends.get_backend().name, "int")
+        self.assertEqual(backends.get_backend().name, "reference")
+
+        self.assertNotEqual(backends.set_backend("auto").name, "reference")
+
+    def test_incomplete_backend_is_rejected(self):
+        class PartialBackend(backends.ArithmeticBackend):
+            name = "partial"
+
+            def add(self, a, b):
+                return backends.get_backend().add(a, b)
+
+        with self.assertRaises(TypeError):
+            PartialBackend()
+        with self.assertRaises(TypeError):
+            backends.register_backend(PartialBackend)
+        self.assertNotIn("partial", backends.available_backends())
+
+    def test_environment_variable(self):
+        with mock.patch.dict(os.environ, {backends.BACKEND_ENV_VAR: "int"}), \
+             mock.patch.object(backends, "_current", None):
+            self.assertEqual(backends.get_backend().name, "int")
+
+if __name__ == '__main__':
+    unittest.main()
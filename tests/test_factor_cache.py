@@ -0,0 +1,98 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from src.core import factor_cache, factorization
+from src.core.factor_cache import FactorCache
+from src.core.factorization import factorize
+from src.core.long_arithmetic import LargeNumber
+from src.core.modular_arithmetic import euler_totient
+from src.core.primality import generate_prime_with_factorization
+
+
+class TestFactorCache(unittest.TestCase):
+    def setUp(self):
+        self._saved = factor_cache.get_factor_cache()
+        self.cache = factor_cache.set_factor_cache(FactorCache())
+
+    def tearDown(self):
+        factor_cache.set_factor_cache(self._saved)
+
+    def test_lru_tier(self):
+        cache = FactorCache(maxsize=2)
+        cache.put(6, {2: 1, 3: 1})
+        cache.put(10, {2: 1, 5: 1})
+        self.assertEqual(cache.get(6), ({2: 1, 3: 1}, []))
+        cache.put(14, {2: 1, 7: 1})
+        # 10 дольше всех не использовалось и вытеснено
+        self.assertIsNone(cache.get(10))
+        self.assertIsNotNone(cache.get(6))
+        # Изменение возвращённой записи не портит кэш
+        cache.get(6)[0][2] = 5
+        self.assertEqual(cache.get(6)[0], {2: 1, 3: 1})
+
+    def test_sqlite_tier(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "factors.sqlite")
+            n = 2 ** 64 + 1
+            cache = FactorCache(maxsize=1, path=path)
+            cache.put(n, {274177: 1}, [(67280421310721, 1)])
+            cache.put(12, {2: 2, 3: 1})
+            cache.close()
+
+            reopened = FactorCache(path=path)
+            self.assertEqual(reopened.get(n), ({274177: 1}, [(67280421310721, 1)]))
+            self.assertEqual(reopened.get(12), ({2: 2, 3: 1}, []))
+            reopened.clear()
+            self.assertIsNone(reopened.get(12))
+            reopened.close()
+
+            with mock.patch.dict(os.environ, {factor_cache.FACTOR_CACHE_ENV_VAR: path}), \
+                 mock.patch.object(factor_cache, "_default", None):
+                self.assertEqual(factor_cache.get_factor_cache().path, path)
+                factor_cache.get_factor_cache().close()
+
+    def test_factorize_uses_cache_and_resumes(self):
+        p, q = 1000000007, 998244353
+        n = 2 ** 5 * p * q
+        # Прерывание во время поиска делителя: сохранено частичное разложение
+        with mock.patch.object(factorization, "_find_factor", side_effect=KeyboardInterrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                factorize(LargeNumber.from_int(n))
+        self.assertEqual(self.cache.get(n), ({2: 5}, [(p * q, 1)]))
+
+        # Продолжение: пробные деления не повторяются, найденные множители сохраняются
+        with mock.patch.object(factorization, "_trial_division", side_effect=AssertionError):
+            result = factorize(LargeNumber.from_int(n))
+        self.assertEqual([(int(f), k) for f, k in result], [(2, 5), (q, 1), (p, 1)])
+        self.assertEqual(self.cache.get(n), ({2: 5, p: 1, q: 1}, []))
+
+        # Повторный вызов не раскладывает число заново и ничего не пишет в кэш
+        with mock.patch.object(factorization, "_find_factor", side_effect=AssertionError), \
+             mock.patch.object(self.cache, "put", side_effect=AssertionError):
+            self.assertEqual(int(euler_totient(LargeNumber.from_int(n))), 16 * (p - 1) * (q - 1))
+
+    def test_resume_writes_only_new_state(self):
+        p, q, r = 1000000007, 998244353, 1000000009
+        n = 3 * p * q * r
+        with mock.patch.object(factorization, "_find_factor", side_effect=KeyboardInterrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                factorize(LargeNumber.from_int(n))
+        # Сохранённое состояние не перезаписывается перед тем же поиском; после каждого
+        # найденного делителя и в конце - новая запись
+        with mock.patch.object(self.cache, "put", wraps=self.cache.put) as put:
+            factorize(LargeNumber.from_int(n))
+        self.assertNotIn(mock.call(n, {3: 1}, [(p * q * r, 1)]), put.call_args_list)
+        self.assertEqual(put.call_args_list[-1], mock.call(n, {3: 1, p: 1, q: 1, r: 1}))
+
+    def test_pocklington_records_p_minus_1(self):
+        p, factors, _ = generate_prime_with_factorization(20, 12, 3, 5)
+        expected = {2: 1}
+        for m in factors:
+            expected[int(m)] = expected.get(int(m), 0) + 1
+        self.assertEqual(self.cache.get(int(p) - 1), (expected, []))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import random
+import unittest
+from unittest import mock
+
+from src.core import factorization
+from src.core.factorization import factorize
+from src.core.long_arithmetic import LargeNumber
+
+
+def _as_ints(n, workers=1):
+    return [(int(p), k) for p, k in factorize(LargeNumber.from_int(n), workers)]
+
+
+class TestFactorization(unittest.TestCase):
+    def setUp(self):
+        random.seed(23)
+
+    def test_small_and_structured_numbers(self):
+        self.assertEqual(_as_ints(1), [])
+        self.assertEqual(_as_ints(-12), [(2, 2), (3, 1)])
+        self.assertEqual(_as_ints(65537), [(65537, 1)])
+        self.assertEqual(_as_ints(2 ** 10 * 3 ** 5 * 7), [(2, 10), (3, 5), (7, 1)])
+        self.assertEqual(_as_ints(4294967291 * 4294967279), [(4294967279, 1), (4294967291, 1)])
+        # Точные степени и повторяющиеся большие множители
+        self.assertEqual(_as_ints(1000003 ** 5), [(1000003, 5)])
+        self.assertEqual(_as_ints((10 ** 12 + 39) ** 2 * 3 ** 5 * 1000003),
+                         [(3, 5), (1000003, 1), (10 ** 12 + 39, 2)])
+        self.assertEqual(_as_ints(2 ** 64 + 1), [(274177, 1), (67280421310721, 1)])
+        with self.assertRaises(ValueError):
+            factorize(LargeNumber("0"))
+
+    def test_pollard_brent(self):
+        n = 1000000007 * 998244353
+        self.assertIn(factorization._pollard_brent(n), (1000000007, 998244353))
+
+    def test_ecm(self):
+        """25-значное произведение двух 13-значных простых раскладывается кривыми без ρ-метода."""
+        p, q = 1000000000039, 1000000000000037
+        with mock.patch.object(factorization, "RHO_MAX_ITERATIONS", 1):
+            self.assertEqual(_as_ints(p * q), [(p, 1), (q, 1)])
+            self.assertEqual(_as_ints(p * q, workers=2), [(p, 1), (q, 1)])
+
+
+if __name__ == '__main__':
+    unittest.main()
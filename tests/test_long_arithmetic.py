@@ -1,7 +1,10 @@
+import pickle
 import unittest
 
-from src.core.long_arithmetic import (LargeNumber, add, subtract, multiply, 
-                                      divide, gcd, extended_gcd, _is_abs_greater_or_equal)
+from src.core import long_arithmetic
+from src.core.long_arithmetic import (LargeNumber, add, subtract, multiply, square,
+                                      divide, divide_exact, isqrt, iroot, perfect_power, is_perfect_power, gcd, extended_gcd, power_integer,
+                                      _is_abs_greater_or_equal)
 
 class TestLongArithmetic(unittest.TestCase):
 
@@ -12,6 +15,96 @@ class TestLongArithmetic(unittest.TestCase):
         self.assertFalse(LargeNumber("-0").is_negative)
         self.assertEqual(LargeNumber("-0").to_string(10), "0")
 
+    def test_base_conversion(self):
+        # Основание влияет только на ввод и вывод
+        self.assertEqual(LargeNumber("FF", 16).to_string(10), "255")
+        self.assertEqual(LargeNumber("255").to_string(2), "11111111")
+        self.assertEqual(LargeNumber("-Z", 36).to_string(10), "-35")
+        big = "123456789" * 20
+        self.assertEqual(LargeNumber(LargeNumber(big).to_string(7), 7).to_string(10), big)
+        # Операнды в разных системах счисления складываются корректно
+        self.assertEqual(add(LargeNumber("A", 16), LargeNumber("10")).to_string(10), "20")
+
+    def test_recursive_base_conversion(self):
+        """Рекурсивный перевод совпадает с переводом блоками."""
+        decimal = "9" + "1234567890" * 60 + "0" * 45
+        number = LargeNumber(decimal)
+        expected = {base: number.to_string(base) for base in (2, 7, 10, 16, 36)}
+        self.assertEqual(expected[10], decimal)
+        self.assertEqual(LargeNumber("-" + expected[16], 16).to_string(10), "-" + decimal)
+
+        saved = long_arithmetic.RADIX_CONVERSION_THRESHOLD
+        try:
+            for threshold in (1, 2, 3):
+                long_arithmetic.RADIX_CONVERSION_THRESHOLD = threshold
+                for base, digits in expected.items():
+                    self.assertEqual(number.to_string(base), digits)
+                    self.assertEqual(LargeNumber(digits, base).to_string(10), decimal)
+                self.assertEqual(LargeNumber("0" * 200).to_string(), "0")
+                with self.assertRaises(ValueError):
+                    LargeNumber("12" * 100 + "A")
+        finally:
+            long_arithmetic.RADIX_CONVERSION_THRESHOLD = saved
+
+    def test_value_semantics(self):
+        """Сравнения, хеширование и неизменяемость LargeNumber."""
+        a = LargeNumber("123456789012345678901234567890")
+        self.assertEqual(a, LargeNumber("123456789012345678901234567890"))
+        self.assertEqual(a, 123456789012345678901234567890)
+        self.assertNotEqual(a, -a)
+        self.assertEqual(hash(a), hash(123456789012345678901234567890))
+        self.assertEqual(hash(LargeNumber("-1")), hash(-1))
+        self.assertEqual(len({a, LargeNumber("123456789012345678901234567890"), -a}), 2)
+        self.assertTrue(-a < LargeNumber("-5") < 0 < LargeNumber("7") <= 7 < a)
+        self.assertEqual(sorted([a, -a, long_arithmetic.ZERO]), [-a, 0, a])
+        self.assertFalse(LargeNumber("-0"))
+        self.assertTrue(LargeNumber("-1"))
+
+        # Смена знака не копирует лимбы, мелкие числа не создаются заново
+        self.assertIs((-a).limbs, a.limbs)
+        self.assertIs(abs(-a).limbs, a.limbs)
+        self.assertIs(LargeNumber.from_int(2), long_arithmetic.TWO)
+        self.assertEqual(LargeNumber.from_int(-(1 << 100)).to_string(16), "-1" + "0" * 25)
+        with self.assertRaises(AttributeError):
+            a.is_negative = True
+
+        self.assertEqual(pickle.loads(pickle.dumps(-a)), -a)
+        self.assertEqual(int(-a), -123456789012345678901234567890)
+
+    def test_operators(self):
+        a, b = LargeNumber("1000000000000000000007"), LargeNumber("-12345")
+        self.assertEqual(a + b, 1000000000000000000007 - 12345)
+        self.assertEqual(1 - a, 1 - 1000000000000000000007)
+        self.assertEqual(a * b * 2, 1000000000000000000007 * -12345 * 2)
+        self.assertEqual(a ** 3, 1000000000000000000007 ** 3)
+        self.assertEqual(pow(a, 65537, 1000003), pow(1000000000000000000007, 65537, 1000003))
+        # // и % округляют вниз, как у int
+        for x, y in ((17, 5), (-17, 5), (17, -5), (-17, -5), (15, -5)):
+            q, r = divmod(LargeNumber.from_int(x), LargeNumber.from_int(y))
+            self.assertEqual((q, r), divmod(x, y))
+            self.assertEqual(LargeNumber.from_int(x) // y, x // y)
+            self.assertEqual(x % LargeNumber.from_int(y), x % y)
+
+    def test_bit_operations(self):
+        """Битовые операции совпадают с операциями над int."""
+        values = [0, 1, 6, 255, (1 << 95) + 12345, -1, -6, -(1 << 64), -(3 << 70) - 7]
+        for x in values:
+            num_x = LargeNumber.from_int(x)
+            self.assertEqual(num_x.bit_length(), x.bit_length())
+            self.assertEqual(num_x.is_even(), x % 2 == 0)
+            for k in (0, 1, 3, 30, 31, 64, 100):
+                self.assertEqual(num_x >> k, x >> k)
+                self.assertEqual(num_x << k, x << k)
+                self.assertEqual(num_x.low_bits(k), x & ((1 << k) - 1))
+                self.assertEqual(num_x.test_bit(k), bool((x >> k) & 1))
+            for y in values:
+                num_y = LargeNumber.from_int(y)
+                self.assertEqual(num_x & num_y, x & y)
+                self.assertEqual(num_x | num_y, x | y)
+                self.assertEqual(num_x ^ num_y, x ^ y)
+        self.assertEqual(LargeNumber("FF", 16) & 15, 15)
+        self.assertEqual(LargeNumber("1" + "0" * 300).bit_length(), 997)
+
     def test_addition(self):
         # Base 10
         num1 = LargeNumber("123")
@@ -68,6 +161,40 @@ class TestLongArithmetic(unittest.TestCase):
         self.assertEqual(multiply(LargeNumber("-12"), LargeNumber("-10")).to_string(10), "120")
         self.assertEqual(multiply(LargeNumber("0"), LargeNumber("-10")).to_string(10), "0")
 
+    def test_fast_multiplication_matches_schoolbook(self):
+        """Карацуба и Toom-3 дают тот же результат, что и умножение "в столбик"."""
+        num_a = LargeNumber("-" + "987654321" * 60)
+        num_b = LargeNumber("123456789" * 45 + "1")
+        expected = multiply(num_a, num_b).to_string()
+
+        saved = long_arithmetic.KARATSUBA_THRESHOLD, long_arithmetic.TOOM3_THRESHOLD
+        try:
+            for thresholds in [(2, 10**9), (2, 3), (4, 9)]:
+                long_arithmetic.KARATSUBA_THRESHOLD, long_arithmetic.TOOM3_THRESHOLD = thresholds
+                self.assertEqual(multiply(num_a, num_b).to_string(), expected)
+        finally:
+            long_arithmetic.KARATSUBA_THRESHOLD, long_arithmetic.TOOM3_THRESHOLD = saved
+
+    def test_square(self):
+        """Квадрат совпадает с произведением числа на себя при любых порогах."""
+        self.assertEqual(square(LargeNumber("-12")).to_string(), "144")
+        self.assertEqual(square(LargeNumber("0")).to_string(), "0")
+        numbers = [LargeNumber("-" + "987654321" * 60), LargeNumber("1" + "0" * 400),
+                   LargeNumber("3FFFFFFF" * 40, 16)]
+        expected = [multiply(x, x) for x in numbers]
+
+        names = ("SQR_KARATSUBA_THRESHOLD", "TOOM3_THRESHOLD", "NTT_THRESHOLD", "NTT_PURE_PYTHON_THRESHOLD")
+        saved = [getattr(long_arithmetic, name) for name in names]
+        try:
+            for thresholds in [(10**9, 10**9, 10**9, 10**9), (2, 10**9, 10**9, 10**9),
+                               (2, 3, 10**9, 10**9), (4, 9, 10**9, 10**9), (2, 3, 5, 5)]:
+                for name, value in zip(names, thresholds):
+                    setattr(long_arithmetic, name, value)
+                self.assertEqual([square(x) for x in numbers], expected)
+        finally:
+            for name, value in zip(names, saved):
+                setattr(long_arithmetic, name, value)
+
     def test_division(self):
         # Base 10
         num1 = LargeNumber("123")
@@ -85,6 +212,97 @@ class TestLongArithmetic(unittest.TestCase):
         self.assertEqual(q.to_string(10), "-12")
         self.assertEqual(r.to_string(10), "3")
 
+    def test_long_division(self):
+        """Деление многолимбовых чисел: a = q*b + r, 0 <= r < b."""
+        num_b = LargeNumber("1" + "0" * 40 + "7")
+        cases = [
+            LargeNumber("98765432109876543210" * 9),
+            multiply(num_b, LargeNumber("123456789123456789123456789")),
+            subtract(multiply(num_b, num_b), LargeNumber("1")),
+        ]
+        for num_a in cases:
+            q, r = divide(num_a, num_b)
+            self.assertEqual(add(multiply(q, num_b), r).to_string(), num_a.to_string())
+            self.assertFalse(_is_abs_greater_or_equal(r, num_b))
+
+        q, r = divide(LargeNumber("FFFFFFFFFFFFFFFFFFFFFFFF", 16), LargeNumber("FFFFFFFFFFFF", 16), 16)
+        self.assertEqual(q.to_string(16), "1000000000001")
+        self.assertEqual(r.to_string(16), "0")
+
+    def test_recursive_division_matches_long_division(self):
+        """Деление Буркеля-Циглера совпадает с делением "уголком"."""
+        num_a = LargeNumber("31415926535897932384" * 40)
+        num_b = LargeNumber("27182818284590452353" * 12 + "9")
+        expected = [x.to_string() for x in divide(num_a, num_b)]
+
+        saved = long_arithmetic.BURNIKEL_ZIEGLER_THRESHOLD
+        try:
+            for threshold in (2, 3, 4):
+                long_arithmetic.BURNIKEL_ZIEGLER_THRESHOLD = threshold
+                self.assertEqual([x.to_string() for x in divide(num_a, num_b)], expected)
+        finally:
+            long_arithmetic.BURNIKEL_ZIEGLER_THRESHOLD = saved
+
+    def test_divide_exact(self):
+        """Точное деление совпадает с частным divide для всех путей алгоритма."""
+        divisors = [LargeNumber("-7"), LargeNumber("1" + "0" * 30), LargeNumber("987654321" * 25 + "3"),
+                    LargeNumber("3" * 400)]
+        cofactors = [LargeNumber("1"), LargeNumber("-" + "123456789" * 3), LargeNumber("5" * 700)]
+        with self.assertRaises(ZeroDivisionError):
+            divide_exact(LargeNumber("5"), LargeNumber("0"))
+        self.assertEqual(divide_exact(LargeNumber("0"), LargeNumber("-3")).to_string(), "0")
+
+        saved = long_arithmetic.DIVEXACT_BLOCK_THRESHOLD, long_arithmetic.BURNIKEL_ZIEGLER_THRESHOLD
+        try:
+            for thresholds in [saved, (2, 10**9), (10**9, 2), (5, 3)]:
+                long_arithmetic.DIVEXACT_BLOCK_THRESHOLD, long_arithmetic.BURNIKEL_ZIEGLER_THRESHOLD = thresholds
+                for b in divisors:
+                    for q in cofactors:
+                        self.assertEqual(divide_exact(multiply(b, q), b), q)
+        finally:
+            long_arithmetic.DIVEXACT_BLOCK_THRESHOLD, long_arithmetic.BURNIKEL_ZIEGLER_THRESHOLD = saved
+
+    def test_power_integer(self):
+        self.assertEqual(power_integer(LargeNumber("2"), LargeNumber("100")).to_string(),
+                         "1267650600228229401496703205376")
+        self.assertEqual(power_integer(LargeNumber("-3"), LargeNumber("5")).to_string(), "-243")
+        self.assertEqual(power_integer(LargeNumber("7"), LargeNumber("0")).to_string(), "1")
+        # 10^1000 проходит несколько окон и длинные серии нулевых бит
+        self.assertEqual(power_integer(LargeNumber("10"), LargeNumber("1000")).to_string(), "1" + "0" * 1000)
+        with self.assertRaises(ValueError):
+            power_integer(LargeNumber("2"), LargeNumber("-1"))
+
+    def test_roots(self):
+        for value in [0, 1, 2, 3, 4, 15, 16, 17, 10 ** 18, 2 ** 64 - 1, 3 ** 300, 3 ** 300 - 1, 7 ** 200 + 5]:
+            number = LargeNumber.from_int(value)
+            root = isqrt(number)
+            self.assertTrue(root * root <= number < (root + 1) * (root + 1), value)
+            for k in (1, 3, 5, 64, 1000):
+                root = iroot(number, k)
+                self.assertTrue(root ** k <= number < (root + 1) ** k, (value, k))
+        # Длинные корни: рекурсивное удвоение точности, точные степени и соседние числа
+        for base, k in ((7 ** 3000 + 12345, 2), (7 ** 3000 + 12345, 3), (7 ** 1000 + 5, 7), (3 ** 60 + 5, 300)):
+            power = base ** k
+            for value in (power - 1, power, power + 1):
+                root = iroot(LargeNumber.from_int(value), k)
+                self.assertEqual(int(root), base - 1 if value < power else base, (k, value - power))
+        with self.assertRaises(ValueError):
+            isqrt(LargeNumber("-4"))
+        with self.assertRaises(ValueError):
+            iroot(LargeNumber("8"), 0)
+
+    def test_perfect_power(self):
+        self.assertEqual(perfect_power(LargeNumber("1024")), (LargeNumber("2"), 10))
+        self.assertEqual(perfect_power(LargeNumber("3486784401")), (LargeNumber("3"), 20))
+        self.assertEqual(perfect_power(LargeNumber("144")), (LargeNumber("12"), 2))
+        base = LargeNumber("123456789012345678901")
+        self.assertEqual(perfect_power(base ** 6), (base, 6))
+        self.assertEqual(perfect_power(base ** 7 * 4), None)
+        self.assertIsNone(perfect_power(LargeNumber("1")))
+        self.assertTrue(is_perfect_power(LargeNumber("1000000")))
+        self.assertFalse(is_perfect_power(LargeNumber("1000001")))
+        self.assertFalse(is_perfect_power(LargeNumber("18446744073709551617")))  # 2^64 + 1
+
     def test_is_abs_greater_or_equal(self):
         self.assertTrue(_is_abs_greater_or_equal(LargeNumber("100"), LargeNumber("10")))
         self.assertTrue(_is_abs_greater_or_equal(LargeNumber("10"), LargeNumber("10")))
@@ -106,5 +324,27 @@ class TestLongArithmetic(unittest.TestCase):
         d_check = add(ax, by)
         self.assertEqual(d_check.to_string(10), d.to_string(10))
 
+    def test_gcd_of_large_numbers(self):
+        """Лемер и половинный НОД дают тот же результат и верные коэффициенты Безу."""
+        common = LargeNumber("1000000000000000000000007" * 4)
+        num_a = multiply(common, LargeNumber("31415926535897932384626433" * 12))
+        num_b = multiply(common, add(power_integer(LargeNumber("2"), LargeNumber("1000")), LargeNumber("1")))
+        expected = gcd(num_a, num_b).to_string()
+
+        saved = long_arithmetic.HGCD_THRESHOLD
+        try:
+            for threshold in (1, 2, 5, saved):
+                long_arithmetic.HGCD_THRESHOLD = threshold
+                self.assertEqual(gcd(num_a, num_b).to_string(), expected)
+                for sign_a, sign_b in (("", ""), ("-", ""), ("", "-"), ("-", "-")):
+                    a = LargeNumber(sign_a + num_a.to_string())
+                    b = LargeNumber(sign_b + num_b.to_string())
+                    d, x, y = extended_gcd(a, b)
+                    self.assertEqual(d.to_string(), expected)
+                    self.assertEqual(add(multiply(a, x), multiply(b, y)).to_string(), expected)
+        finally:
+            long_arithmetic.HGCD_THRESHOLD = saved
+        self.assertEqual(divide(LargeNumber(expected), common)[1].to_string(), "0")
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -3,7 +3,7 @@ import unittest
 from src.core.long_arithmetic import LargeNumber
 from src.core.modular_arithmetic import (
     modular_sqrt, mod_power, fast_modular_multiplication, chinese_remainder_theorem,
-    euler_totient, legendre_symbol, jacobi_symbol, 
+    euler_totient, prime_factorization, legendre_symbol, jacobi_symbol, 
     find_quadratic_residues, find_cubic_residues
 )
 
@@ -66,6 +66,22 @@ class TestModularArithmetic(unittest.TestCase):
         self.assertEqual(euler_totient(LargeNumber("10")).to_string(), "4")
         self.assertEqual(euler_totient(LargeNumber("99")).to_string(), "60") # φ(9)*φ(11) = 6*10
 
+    def test_prime_factorization(self):
+        def factors(n):
+            return [f.to_string() for f in prime_factorization(LargeNumber(n))]
+        self.assertEqual(factors("1"), [])
+        self.assertEqual(factors("97"), ["97"])
+        self.assertEqual(factors("1741824"), ["2", "3", "7"])  # 2^10 * 3^5 * 7
+        self.assertEqual(factors("10403"), ["101", "103"])
+        # Точная степень: делители ищутся у основания 1000003
+        self.assertEqual(factors("1000009000027000027"), ["1000003"])
+        # φ(p^3) = p^3 - p^2
+        self.assertEqual(euler_totient(LargeNumber("1000009000027000027")).to_string(), "1000008000021000018")
+        # 25-значное произведение двух 13-значных простых
+        p, q = 1000000000039, 1000000000000037
+        self.assertEqual(factors(str(p * q)), [str(p), str(q)])
+        self.assertEqual(int(euler_totient(LargeNumber.from_int(p * q))), (p - 1) * (q - 1))
+
     def test_legendre_symbol(self):
         # (2/7) = 1, т.к. 2 = 3^2 (mod 7) = 9 (mod 7) = 2
         self.assertEqual(legendre_symbol(LargeNumber("2"), LargeNumber("7")), 1)
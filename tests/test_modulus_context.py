@@ -0,0 +1,39 @@
+import unittest
+
+from src.core.long_arithmetic import LargeNumber, power_integer
+from src.core.modulus_context import ModulusContext, get_modulus_context
+
+
+class TestModulusContext(unittest.TestCase):
+    def setUp(self):
+        # Чётный модуль: метод Монтгомери к нему неприменим
+        self.context = ModulusContext(LargeNumber("1" + "0" * 39 + "6"))
+        self.x = power_integer(LargeNumber("3"), LargeNumber("120"))
+        self.y = LargeNumber("-" + power_integer(LargeNumber("7"), LargeNumber("50")).to_string())
+
+    def test_reduce(self):
+        self.assertEqual(self.context.reduce(self.x).to_string(),
+                         "413179829509605039730397421357902447675")
+        self.assertEqual(self.context.reduce(LargeNumber("-1")).to_string(), "1" + "0" * 39 + "5")
+
+    def test_mulmod_sqrmod_addmod(self):
+        self.assertEqual(self.context.mulmod(self.x, self.y).to_string(),
+                         "5378660893789688815436888974932977242149")
+        self.assertEqual(self.context.sqrmod(self.x).to_string(),
+                         "4640477344592807508345223448654502047677")
+        self.assertEqual(self.context.addmod(self.x, self.y).to_string(),
+                         "1948137182097458419450056851708553197506")
+
+    def test_contexts_are_cached(self):
+        first = get_modulus_context(LargeNumber("1000000007"))
+        self.assertIs(get_modulus_context(LargeNumber("3B9ACA07", 16)), first)
+
+    def test_invalid_modulus(self):
+        with self.assertRaises(ValueError):
+            ModulusContext(LargeNumber("0"))
+        with self.assertRaises(ValueError):
+            get_modulus_context(LargeNumber("-7"))
+
+
+if __name__ == '__main__':
+    unittest.main()
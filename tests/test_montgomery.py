@@ -0,0 +1,53 @@
+import unittest
+
+from src.core.long_arithmetic import LargeNumber, multiply, divide
+from src.core.montgomery import MontgomeryContext, get_montgomery_context
+from src.core.modular_arithmetic import mod_power
+
+
+class TestMontgomery(unittest.TestCase):
+    def test_multiply(self):
+        n = LargeNumber("170141183460469231731687303715884105727")  # 2^127 - 1
+        x = LargeNumber("123456789012345678901234567890")
+        y = LargeNumber("98765432109876543210987654321")
+        context = MontgomeryContext(n)
+
+        product = context.from_montgomery(
+            context.multiply(context.to_montgomery(x), context.to_montgomery(y)))
+        self.assertEqual(product.to_string(), "82544020355360328516762341607148724078")
+        _, expected = divide(multiply(x, y), n)
+        self.assertEqual(product.to_string(), expected.to_string())
+
+    def test_square(self):
+        n = LargeNumber("170141183460469231731687303715884105727")  # 2^127 - 1
+        x = LargeNumber("123456789012345678901234567890")
+        context = MontgomeryContext(n)
+        x_montgomery = context.to_montgomery(x)
+        self.assertEqual(context.square(x_montgomery), context.multiply(x_montgomery, x_montgomery))
+
+    def test_one_round_trip(self):
+        context = MontgomeryContext(LargeNumber("1000000007"))
+        self.assertEqual(context.from_montgomery(context.one()).to_string(), "1")
+
+    def test_even_modulus_rejected(self):
+        with self.assertRaises(ValueError):
+            MontgomeryContext(LargeNumber("1000000"))
+        with self.assertRaises(ValueError):
+            get_montgomery_context(LargeNumber("1000000"))
+
+    def test_contexts_are_cached(self):
+        first = get_montgomery_context(LargeNumber("1000000007"))
+        self.assertIs(get_montgomery_context(LargeNumber("3B9ACA07", 16)), first)
+
+    def test_mod_power_odd_and_even_moduli(self):
+        # 2^(p-1) ≡ 1 (mod p) для простого p = 2^61 - 1
+        p = LargeNumber("2305843009213693951")
+        self.assertEqual(mod_power(LargeNumber("2"), LargeNumber("2305843009213693950"), p).to_string(), "1")
+        # Чётный модуль идёт по обычному пути
+        self.assertEqual(mod_power(LargeNumber("3"), LargeNumber("200"), LargeNumber("1000")).to_string(), "1")
+        # Отрицательное основание даёт неотрицательный вычет
+        self.assertEqual(mod_power(LargeNumber("-2"), LargeNumber("3"), LargeNumber("7")).to_string(), "6")
+
+
+if __name__ == '__main__':
+    unittest.main()
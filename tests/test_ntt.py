@@ -0,0 +1,59 @@
+import unittest
+
+from src.core import ntt, long_arithmetic
+from src.core.long_arithmetic import LargeNumber, multiply
+
+
+def _naive_convolution(a, b):
+    result = [0] * (len(a) + len(b) - 1)
+    for i, x in enumerate(a):
+        for j, y in enumerate(b):
+            result[i + j] += x * y
+    return result
+
+
+class TestNTT(unittest.TestCase):
+    def setUp(self):
+        max_limb = (1 << 30) - 1
+        self.a = [max_limb] * 37 + [12345, 0, 7]
+        self.b = [max_limb, 1, 0, 999999937] * 9
+
+    def test_convolve(self):
+        self.assertEqual(ntt.convolve(self.a, self.b), _naive_convolution(self.a, self.b))
+
+    def test_square(self):
+        self.assertEqual(ntt.square(self.a), _naive_convolution(self.a, self.a))
+        saved_np = ntt.np
+        ntt.np = None
+        try:
+            self.assertEqual(ntt.square(self.b), _naive_convolution(self.b, self.b))
+        finally:
+            ntt.np = saved_np
+
+    def test_convolve_pure_python(self):
+        """Реализация без NumPy даёт ту же свёртку."""
+        saved_np = ntt.np
+        ntt.np = None
+        try:
+            self.assertFalse(ntt.has_numpy())
+            self.assertEqual(ntt.convolve(self.a, self.b), _naive_convolution(self.a, self.b))
+        finally:
+            ntt.np = saved_np
+
+    def test_multiply_dispatches_to_ntt(self):
+        num_a = LargeNumber("-" + "987654321" * 60)
+        num_b = LargeNumber("123456789" * 45 + "1")
+        expected = multiply(num_a, num_b).to_string()
+
+        names = ("KARATSUBA_THRESHOLD", "NTT_THRESHOLD", "NTT_PURE_PYTHON_THRESHOLD")
+        saved = [getattr(long_arithmetic, name) for name in names]
+        try:
+            for name, value in zip(names, (2, 1, 1)):
+                setattr(long_arithmetic, name, value)
+            self.assertEqual(multiply(num_a, num_b).to_string(), expected)
+        finally:
+            for name, value in zip(names, saved):
+                setattr(long_arithmetic, name, value)
+
+if __name__ == '__main__':
+    unittest.main()
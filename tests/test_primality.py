@@ -1,6 +1,18 @@
+import itertools
+import threading
 import unittest
+from unittest import mock
+from src.core import backends, parallel, primality
 from src.core.long_arithmetic import LargeNumber
-from src.core.primality import generate_prime, is_solovay_strassen_prime
+from src.core.modulus_context import ModulusContext
+from src.core.primality import (generate_prime, generate_gost_prime, generate_prime_with_factorization,
+                                is_solovay_strassen_prime,
+                                is_miller_rabin_prime, is_baillie_psw_prime, is_probable_prime,
+                                PRIMALITY_TESTS)
+
+# Числа Кармайкла, сильные псевдопростые по основаниям 2, 3, 5, ... и сильные псевдопростые Люка
+PSEUDOPRIMES = ["561", "1105", "1729", "2047", "3277", "4033", "3215031751", "3825123056546413051",
+                "318665857834031151167461", "5459", "5777", "10877", "16109", "18971"]
 
 class TestPrimality(unittest.TestCase):
     def test_generate_prime(self):
@@ -18,6 +30,99 @@ class TestPrimality(unittest.TestCase):
         self.assertFalse(is_solovay_strassen_prime(LargeNumber("10"), 20))
         self.assertFalse(is_solovay_strassen_prime(LargeNumber("25"), 20))
 
+    def test_miller_rabin_and_baillie_psw(self):
+        primes = ["2", "3", "97", "101", "18446744073709551557", "618970019642690137449562111",  # 2^64 - 59, 2^89 - 1
+                  "170141183460469231731687303715884105727"]  # 2^127 - 1
+        composites = PSEUDOPRIMES + ["0", "1", "100", "1000006000009",  # 1000003^2
+                                     "4611686014132420609"]  # (2^31 - 1)^2
+        for test in (lambda p: is_miller_rabin_prime(p, 10), is_baillie_psw_prime):
+            for prime in primes:
+                self.assertTrue(test(LargeNumber(prime)), prime)
+            for composite in composites:
+                self.assertFalse(test(LargeNumber(composite)), composite)
+
+    def test_tests_use_selected_backend(self):
+        """Возведения в степень и умножения по модулю в MR и BPSW идут через выбранный бэкенд."""
+        p = LargeNumber.from_int(177 * 2 ** 150 + 1)
+        for name in backends.available_backends():
+            if name == "reference":
+                continue
+            with backends.use_backend(name) as backend, \
+                 mock.patch.object(ModulusContext, "sqrmod", side_effect=AssertionError), \
+                 mock.patch.object(ModulusContext, "mulmod", side_effect=AssertionError), \
+                 mock.patch.object(type(backend), "modulus_context", autospec=True,
+                                   side_effect=type(backend).modulus_context) as factory, \
+                 mock.patch.object(type(backend), "mod_power", autospec=True,
+                                   side_effect=type(backend).mod_power) as power:
+                self.assertTrue(is_miller_rabin_prime(p, 3))
+                self.assertTrue(is_baillie_psw_prime(p))
+                self.assertFalse(is_baillie_psw_prime(LargeNumber("3825123056546413051")))
+                self.assertEqual(factory.call_count, 5)
+                self.assertTrue(power.called)
+
+    def test_generate_prime_methods(self):
+        for method in PRIMALITY_TESTS:
+            prime = generate_prime(48, 10, method)
+            self.assertEqual(prime.bit_length(), 48)
+            self.assertTrue(is_probable_prime(prime, method="baillie_psw"))
+        with self.assertRaises(ValueError):
+            generate_prime(48, 10, "guess")
+
+    def test_sieved_candidates(self):
+        """Решето пропускает все простые нужной длины и вычёркивает кратные малых простых."""
+        small_primes = primality._sieve_primes()
+        self.assertEqual(small_primes[:5], [3, 5, 7, 11, 13])
+        self.assertEqual(len(small_primes), primality.SIEVE_PRIME_COUNT)
+
+        candidates = list(itertools.islice(primality._sieved_candidates(200), 500))
+        for candidate in candidates:
+            self.assertEqual(candidate.bit_length(), 200)
+            self.assertTrue(all(candidate % q for q in small_primes))
+
+        # 10-битные: простые не вычёркиваются, выход за 2^10 ведёт к новой случайной точке
+        seen = set(itertools.islice(primality._sieved_candidates(10), 20000))
+        primes_10_bits = [n for n in range(513, 1024, 2) if all(n % d for d in range(3, 32, 2))]
+        self.assertEqual(seen, set(primes_10_bits))
+
+    def test_generate_gost_prime_bit_length(self):
+        """Простое по ГОСТ имеет ровно заданную битовую длину."""
+        prime = generate_gost_prime(64)
+        self.assertEqual(prime.bit_length(), 64)
+        self.assertTrue(is_solovay_strassen_prime(prime, 20))
+
+    def test_parallel_generation(self):
+        """Параллельный режим возвращает корректные простые и останавливает остальные поиски."""
+        prime = generate_prime(128, 10, workers=2)
+        self.assertEqual(prime.bit_length(), 128)
+        self.assertTrue(is_probable_prime(prime, method="baillie_psw"))
+
+        prime = generate_gost_prime(64, workers=2)
+        self.assertEqual(prime.bit_length(), 64)
+        self.assertTrue(is_probable_prime(prime))
+
+        p, factors, _ = generate_prime_with_factorization(20, 12, 3, 5, workers=2)
+        product = 2
+        for factor in factors:
+            product *= int(factor)
+        self.assertEqual(int(p), product + 1)
+        self.assertTrue(is_probable_prime(p))
+
+        with self.assertRaises(ValueError):
+            generate_prime(64, 10, workers=0)
+
+    def test_search_cancellation(self):
+        """Установленное событие остановки прерывает поиск на следующем кандидате."""
+        stop_event = threading.Event()
+        stop_event.set()
+        parallel._init_worker(stop_event)
+        try:
+            for search in (lambda: generate_prime(256, 10), lambda: generate_gost_prime(64),
+                           lambda: generate_prime_with_factorization(4, 12, 2, 5)):
+                with self.assertRaises(parallel.SearchCancelled):
+                    search()
+        finally:
+            parallel._init_worker(None)
+
 
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
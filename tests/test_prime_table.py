@@ -0,0 +1,76 @@
+import os
+import random
+import tempfile
+import unittest
+from unittest import mock
+
+from src.core import prime_table, sieve
+from src.core.long_arithmetic import LargeNumber
+from src.core.primality import is_prime_trial_division, generate_small_primes
+
+
+class TestPrimeTable(unittest.TestCase):
+    LIMIT = 1000003
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.directory.name, "primes30.bin")
+        prime_table.build_prime_table(cls.path, cls.LIMIT)
+        cls.table = prime_table.PrimeTable(cls.path)
+        cls.primes = sieve.primes_up_to(cls.LIMIT)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.table.close()
+        cls.directory.cleanup()
+
+    def test_queries(self):
+        self.assertEqual(self.table.limit, self.LIMIT)
+        self.assertEqual(len(self.table), len(self.primes))
+        self.assertEqual(self.table.primes_in(0, self.LIMIT), self.primes)
+        self.assertEqual([n for n in range(-3, 3000) if self.table.is_small_prime(n)], sieve.primes_up_to(2999))
+        self.assertTrue(self.table.is_small_prime(self.LIMIT))
+
+        rng = random.Random(22)
+        for _ in range(50):
+            a = rng.randint(0, self.LIMIT)
+            b = rng.randint(a - 10, self.LIMIT)
+            self.assertEqual(self.table.primes_in(a, b), sieve.primes_in_range(a, b))
+        for n in [1, 2, 3, 4, 5, 1000, len(self.primes)] + [rng.randint(1, len(self.primes)) for _ in range(200)]:
+            self.assertEqual(self.table.nth_prime(n), self.primes[n - 1], n)
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            self.table.is_small_prime(self.LIMIT + 1)
+        with self.assertRaises(ValueError):
+            self.table.primes_in(0, self.LIMIT + 1)
+        with self.assertRaises(ValueError):
+            self.table.nth_prime(len(self.primes) + 1)
+        with self.assertRaises(ValueError):
+            self.table.nth_prime(0)
+        with self.assertRaises(ValueError):
+            prime_table.PrimeTable(__file__)
+
+    def test_builder_command_and_primality_integration(self):
+        path = os.path.join(self.directory.name, "command.bin")
+        with mock.patch("builtins.print"):
+            prime_table.main(["build", "5000", "--output", path])
+        with mock.patch.dict(os.environ, {prime_table.PRIME_TABLE_ENV_VAR: path}):
+            table = prime_table.get_prime_table()
+            self.assertEqual(table.primes_in(4900, 5000), sieve.primes_in_range(4900, 5000))
+            self.assertIs(prime_table.get_prime_table(), table)
+            # Числа в пределах таблицы проверяются по ней, без пробных делений
+            with mock.patch.object(sieve, "iter_primes", side_effect=AssertionError):
+                self.assertTrue(is_prime_trial_division(LargeNumber("4999")))
+                self.assertFalse(is_prime_trial_division(LargeNumber("4997")))
+            self.assertTrue(is_prime_trial_division(LargeNumber("1000003")))
+            for p in generate_small_primes(3, 12):
+                self.assertTrue(table.is_small_prime(int(p)))
+        with mock.patch.dict(os.environ, {prime_table.PRIME_TABLE_ENV_VAR: path + ".missing"}):
+            self.assertIsNone(prime_table.get_prime_table())
+        prime_table._tables.pop(os.path.abspath(path)).close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import itertools
+from array import array
+import unittest
+from unittest import mock
+
+from src.core import sieve
+from src.core.long_arithmetic import LargeNumber
+from src.core.primality import is_miller_rabin_prime, is_prime_trial_division, generate_small_primes
+
+
+def _naive_primes(a, b):
+    return [n for n in range(max(a, 2), b + 1) if all(n % d for d in range(2, int(n ** 0.5) + 1))]
+
+
+def _is_prime(n):
+    """Детерминированный тест Миллера-Рабина для n < 3.18·10^23 на встроенных int."""
+    if n < 2:
+        return False
+    for q in (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37):
+        if n % q == 0:
+            return n == q
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d, s = d // 2, s + 1
+    for a in (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37):
+        x = pow(a, d, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+class TestSieve(unittest.TestCase):
+    def test_small_ranges(self):
+        self.assertEqual(sieve.primes_up_to(1000), _naive_primes(0, 1000))
+        for a, b in [(0, 1), (2, 2), (3, 3), (4, 4), (0, 2), (90, 97), (97, 90), (24, 28)]:
+            self.assertEqual(sieve.primes_in_range(a, b), _naive_primes(a, b))
+        self.assertEqual(sieve.first_primes(10), [2, 3, 5, 7, 11, 13, 17, 19, 23, 29])
+        self.assertEqual(len(sieve.first_primes(100000)), 100000)
+        self.assertEqual(sieve.first_primes(100000)[-1], 1299709)
+
+    def test_segmented_ranges(self):
+        """Отрезки выше таблицы просеиваются сегментами, в том числе через их границы."""
+        low = 10 ** 12
+        primes = sieve.primes_in_range(low, low + 5 * sieve.SEGMENT_SIZE)
+        self.assertEqual(primes, [n for n in range(low, low + 5 * sieve.SEGMENT_SIZE + 1) if _is_prime(n)])
+        # Сегменты на границе должны давать тот же результат, что и один длинный отрезок
+        middle = low + 2 * sieve.SEGMENT_SIZE + 1
+        self.assertEqual(sieve.primes_in_range(low, middle) + sieve.primes_in_range(middle + 1, low + 5 * sieve.SEGMENT_SIZE),
+                         primes)
+
+    def test_iter_primes(self):
+        self.assertEqual(list(itertools.islice(sieve.iter_primes(100), 3)), [101, 103, 107])
+        self.assertEqual(list(sieve.iter_primes(7, 23)), [7, 11, 13, 17, 19, 23])
+        # За пределом таблицы простые вырабатываются сегментами
+        with mock.patch.object(sieve, "TABLE_MAX_LIMIT", 1000):
+            self.assertEqual(list(sieve.iter_primes(990, 1100)), _naive_primes(990, 1100))
+            self.assertEqual(list(itertools.islice(sieve.iter_primes(10 ** 9), 2)), [1000000007, 1000000009])
+
+    def test_table_stops_at_limit(self):
+        """Таблица не растёт дальше TABLE_MAX_LIMIT; базовые простые выше него вырабатываются заново."""
+        limit = 1 << 17
+        with mock.patch.object(sieve, "TABLE_MAX_LIMIT", limit), \
+             mock.patch.object(sieve, "_table", array('I')), \
+             mock.patch.object(sieve, "_table_limit", 0):
+            low = 10 ** 12  # базовые простые до 10^6
+            self.assertEqual(sieve.primes_in_range(low, low + 2 * sieve.SEGMENT_SIZE),
+                             [n for n in range(low, low + 2 * sieve.SEGMENT_SIZE + 1) if _is_prime(n)])
+            self.assertEqual(len(sieve.primes_up_to(10 ** 6)), 78498)
+            primes = sieve.first_primes(20000)
+            self.assertEqual(sieve._table_limit, limit)
+            self.assertEqual(sieve._table.tolist(), _naive_primes(0, limit))
+            self.assertEqual(len(primes), 20000)
+            self.assertEqual(primes[-2:], [224729, 224737])
+            self.assertEqual(primes[-100:], list(sieve.iter_primes(primes[-100], primes[-1])))
+
+    def test_primality_helpers(self):
+        for n in [0, 1, 2, 3, 4, 25, 97, 7919, 1000003, 999999999989, 999999999991]:
+            expected = n in (2, 3, 97, 7919, 1000003, 999999999989)
+            self.assertEqual(is_prime_trial_division(LargeNumber.from_int(n)), expected, n)
+        for bits in (2, 12, 30, 40):
+            primes = generate_small_primes(5, bits)
+            self.assertEqual(len(primes), 5)
+            for p in primes:
+                self.assertEqual(p.bit_length(), bits)
+                self.assertTrue(is_miller_rabin_prime(p, 1))
+        with self.assertRaises(ValueError):
+            generate_small_primes(1, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
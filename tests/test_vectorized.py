@@ -0,0 +1,78 @@
+import random
+import unittest
+
+from src.core import vectorized, long_arithmetic
+from src.core.long_arithmetic import LargeNumber, add, subtract, multiply, divide
+
+MAX_LIMB = (1 << 30) - 1
+
+
+def _to_int(limbs):
+    return sum(limb << (30 * i) for i, limb in enumerate(limbs))
+
+
+def _to_limbs(value):
+    limbs = []
+    while value:
+        limbs.append(value & MAX_LIMB)
+        value >>= 30
+    return limbs or [0]
+
+
+@unittest.skipUnless(vectorized.has_numpy(), "NumPy не установлен")
+class TestVectorized(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(14)
+        self.pairs = [([MAX_LIMB] * 1000 + [1], [1]),        # перенос через всё число
+                      ([0] * 999 + [1], [1]),                # заём через всё число
+                      ([MAX_LIMB] * 300, [MAX_LIMB] * 300),
+                      ([5], [0])]
+        for _ in range(20):
+            a = [rng.getrandbits(30) for _ in range(rng.randint(1, 500))]
+            b = [rng.getrandbits(30) for _ in range(rng.randint(1, len(a)))]
+            a[-1] |= 1
+            self.pairs.append((a, b))
+
+    def test_add_and_subtract(self):
+        for a, b in self.pairs:
+            x, y = _to_int(a), _to_int(b)
+            self.assertEqual(vectorized.to_list(vectorized.add_limbs(a, b)), _to_limbs(x + y))
+            self.assertEqual(vectorized.to_list(vectorized.add_limbs(b, a)), _to_limbs(x + y))
+            self.assertEqual(vectorized.to_list(vectorized.sub_limbs(a, b)), _to_limbs(x - y))
+
+    def test_multiply(self):
+        for a, b in self.pairs:
+            x, y = _to_int(a), _to_int(b)
+            self.assertEqual(vectorized.to_list(vectorized.mul_short(a, b[:40])), _to_limbs(x * _to_int(b[:40])))
+            self.assertEqual(vectorized.to_list(vectorized.mul_small(a, MAX_LIMB, MAX_LIMB)),
+                             _to_limbs(x * MAX_LIMB + MAX_LIMB))
+        # Длинный второй множитель: промежуточные суммы периодически нормализуются
+        a = [MAX_LIMB] * 2100
+        self.assertEqual(vectorized.to_list(vectorized.mul_short(a, a)), _to_limbs(_to_int(a) ** 2))
+
+    def test_long_arithmetic_dispatches_to_kernels(self):
+        """С пониженными порогами публичные функции дают те же результаты."""
+        rng = random.Random(41)
+        values = [rng.getrandbits(rng.randint(1, 3000)) * rng.choice((1, -1)) for _ in range(12)]
+        values += [(1 << 3000) - 1, -(1 << 3000), 12345]
+        numbers = [LargeNumber.from_int(v) for v in values]
+
+        names = ("VECTORIZE_THRESHOLD", "VECTORIZE_ARRAY_THRESHOLD")
+        saved = [getattr(long_arithmetic, name) for name in names]
+        try:
+            for name in names:
+                setattr(long_arithmetic, name, 1)
+            for x, num_x in zip(values, numbers):
+                for y, num_y in zip(values, numbers):
+                    self.assertEqual(int(add(num_x, num_y)), x + y)
+                    self.assertEqual(int(subtract(num_x, num_y)), x - y)
+                    self.assertEqual(int(multiply(num_x, num_y)), x * y)
+                    quotient, remainder = divide(num_x, num_y)
+                    self.assertEqual(int(quotient) * y + int(remainder), x)
+            self.assertFalse(subtract(numbers[0], numbers[0]).is_negative)
+        finally:
+            for name, value in zip(names, saved):
+                setattr(long_arithmetic, name, value)
+
+if __name__ == '__main__':
+    unittest.main()